@@ -1,20 +1,56 @@
+import { promises as fs } from 'fs';
+import path from 'path';
+import { gunzipSync } from 'zlib';
 import { NextRequest, NextResponse } from 'next/server';
-import { getMetroAreaFlights } from '@/app/data/flights';
+import { searchFlights } from '@/app/data/partitions';
+
+// Gzipped responses for every reachable from/to pair, written by
+// scrapers/search_payloads.py after each flight update.
+const SEARCH_DIR = path.join(process.cwd(), 'app', 'data', 'search');
+const CODE = /^[A-Z]{2,4}$/;
+
+const readPrecomputed = async (from: string, to: string): Promise<Buffer | null> => {
+  if (!CODE.test(from) || !CODE.test(to)) return null;
+  try {
+    return await fs.readFile(path.join(SEARCH_DIR, `${from}-${to}.json.gz`));
+  } catch {
+    return null;
+  }
+};
 
 export async function GET(request: NextRequest) {
   const { searchParams } = new URL(request.url);
   const from = searchParams.get('from');
   const to = searchParams.get('to');
+  const date = searchParams.get('date') || undefined;
 
   if (!from || !to) {
     return NextResponse.json({ error: 'Missing from or to parameters' }, { status: 400 });
   }
+  if (date && !/^\d{4}-\d{2}-\d{2}$/.test(date)) {
+    return NextResponse.json({ error: 'date must be YYYY-MM-DD' }, { status: 400 });
+  }
+
+  if (!date) {
+    const gz = await readPrecomputed(from, to);
+    if (gz) {
+      const gzipOk = /\bgzip\b/.test(request.headers.get('accept-encoding') ?? '');
+      return new NextResponse(new Uint8Array(gzipOk ? gz : gunzipSync(gz)), {
+        headers: {
+          'Content-Type': 'application/json',
+          ...(gzipOk ? { 'Content-Encoding': 'gzip' } : {}),
+          'Vary': 'Accept-Encoding',
+        },
+      });
+    }
+  }
 
-  const flights = getMetroAreaFlights(from, to);
+  const flights = await searchFlights(from, to, date);
 
   return NextResponse.json({
     from,
     to,
+    ...(date ? { date } : {}),
     flights,
     count: flights.length,
   });
@@ -1,34 +1,18 @@
 import { LOCATIONS, expandCode } from './locations';
-import { FLIGHTS } from './flights';
+import { REACHABLE_FROM, REACHABLE_TO } from './routeIndex';
 import type { Location } from './types';
 
-// Only include routes that have at least one flight entry.
-// This filters out any empty arrays that might sneak in from scrapers.
-const KNOWN_ROUTES = new Set(
-  Object.keys(FLIGHTS).filter(key => (FLIGHTS as any)[key].length > 0)
-);
+// Reachability is precomputed by scrapers/route_index.py (airport and metro
+// codes, routes with at least one flight), so each lookup is one object access.
+// Codes come from query strings, so don't let 'constructor' etc. hit the prototype.
+const lookup = (table: Record<string, string[]>, code: string): string[] =>
+  Object.prototype.hasOwnProperty.call(table, code) ? table[code] : [];
 
-export const getReachableFrom = (fromCode: string): Set<string> => {
-  const fromCodes = expandCode(fromCode);
-  const dests = new Set<string>();
-  fromCodes.forEach(fc => {
-    KNOWN_ROUTES.forEach(key => {
-      if (key.startsWith(fc + '-')) dests.add(key.split('-')[1]);
-    });
-  });
-  return dests;
-};
+export const getReachableFrom = (fromCode: string): Set<string> =>
+  new Set(lookup(REACHABLE_FROM, fromCode));
 
-export const getReachableTo = (toCode: string): Set<string> => {
-  const toCodes = expandCode(toCode);
-  const origins = new Set<string>();
-  toCodes.forEach(tc => {
-    KNOWN_ROUTES.forEach(key => {
-      if (key.endsWith('-' + tc)) origins.add(key.split('-')[0]);
-    });
-  });
-  return origins;
-};
+export const getReachableTo = (toCode: string): Set<string> =>
+  new Set(lookup(REACHABLE_TO, toCode));
 
 export const getValidOrigins = (toCode: string): Location[] => {
   if (!toCode) return LOCATIONS;
@@ -0,0 +1,82 @@
+import { promises as fs } from 'fs';
+import path from 'path';
+import { expandCode } from './locations';
+import type { Flight } from './types';
+
+// Server-only. Reads the per-route, per-month partitions written by
+// scrapers/flight_partitions.py, so a search loads just the routes (and month)
+// it asks for instead of importing all of flights.ts. Until the first update
+// writes them (no manifest.json), searches fall back to FLIGHTS itself.
+
+const PARTITIONS_DIR = path.join(process.cwd(), 'app', 'data', 'partitions');
+const UNDATED = 'undated';
+const MAX_CACHED_PARTITIONS = 256;
+
+interface PartitionInfo { count: number; hash: string }
+interface Manifest { version: number; routes: Record<string, Record<string, PartitionInfo>> }
+
+let manifest: Promise<Manifest> | null = null;
+const loadManifest = (): Promise<Manifest> => {
+  if (!manifest) {
+    manifest = fs.readFile(path.join(PARTITIONS_DIR, 'manifest.json'), 'utf8').then(JSON.parse);
+    manifest.catch(() => { manifest = null; });
+  }
+  return manifest;
+};
+
+// Small LRU (Map keeps insertion order) so memory stays bounded on warm instances
+const partitions = new Map<string, Promise<Flight[]>>();
+const loadPartition = (route: string, part: string): Promise<Flight[]> => {
+  const key = `${route}/${part}`;
+  let flights = partitions.get(key);
+  if (flights) {
+    partitions.delete(key);
+  } else {
+    flights = fs.readFile(path.join(PARTITIONS_DIR, route, `${part}.json`), 'utf8').then(JSON.parse);
+    flights.catch(() => partitions.delete(key));
+    if (partitions.size >= MAX_CACHED_PARTITIONS) {
+      partitions.delete(partitions.keys().next().value!);
+    }
+  }
+  partitions.set(key, flights);
+  return flights;
+};
+
+const byDate = (flights: Flight[], date?: string): Flight[] =>
+  date ? flights.filter(f => !f.date || f.date === date) : flights;
+
+// The same search over the FLIGHTS object (imported only when needed)
+const searchAllFlights = async (from: string, to: string, date?: string): Promise<Flight[]> => {
+  const { FLIGHTS } = await import('./flights');
+  const flights: Flight[] = [];
+  expandCode(from).forEach(fc => {
+    expandCode(to).forEach(tc => {
+      const route = `${fc}-${tc}`;
+      if (Object.prototype.hasOwnProperty.call(FLIGHTS, route)) flights.push(...FLIGHTS[route]);
+    });
+  });
+  return byDate(flights, date);
+};
+
+// Flights between two airport or metro codes. With a date, only that month's
+// partition (plus undated flights) is read, and flights on other dates are dropped.
+export const searchFlights = async (from: string, to: string, date?: string): Promise<Flight[]> => {
+  let routes: Manifest['routes'];
+  try {
+    ({ routes } = await loadManifest());
+  } catch {
+    return searchAllFlights(from, to, date);
+  }
+  const month = date ? date.slice(0, 7) : null;
+  const loads: Promise<Flight[]>[] = [];
+  expandCode(from).forEach(fc => {
+    expandCode(to).forEach(tc => {
+      const route = `${fc}-${tc}`;
+      if (!Object.prototype.hasOwnProperty.call(routes, route)) return;
+      Object.keys(routes[route]).sort().forEach(part => {
+        if (!month || part === month || part === UNDATED) loads.push(loadPartition(route, part));
+      });
+    });
+  });
+  return byDate((await Promise.all(loads)).flat(), date);
+};
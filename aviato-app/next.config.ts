@@ -1,7 +1,11 @@
 import type { NextConfig } from "next";
 
 const nextConfig: NextConfig = {
-  /* config options here */
+  // Flight partitions and precomputed search responses are read from disk
+  // at request time (app/data/partitions.ts, app/api/search/route.ts)
+  outputFileTracingIncludes: {
+    "/api/search": ["./app/data/partitions/**/*", "./app/data/search/**/*"],
+  },
 };
 
 export default nextConfig;
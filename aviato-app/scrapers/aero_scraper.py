@@ -9,11 +9,12 @@ Usage:
     pip install requests
     python aero_scraper.py
 """
-import requests
-import json
-import csv
 import io
-from datetime import datetime
+import time
+
+import dateparse
+from http_client import HttpClient, RequestPool
+from scrape_output import FlightWriter
 
 GRAPHQL_URL = "https://membrane.aero.com/api/v2"
 BASE_URL = "https://aero.com"
@@ -43,6 +44,15 @@ ROUTES = [
     {"origin": "TEB", "destination": "ASE", "origin_city": "New York", "dest_city": "Aspen"},
 ]
 
+HTTP = HttpClient("Aero", headers={"Content-Type": "application/json"})
+
+# Column order of aero_flights.csv (the record fields below)
+CSV_FIELDS = [
+    "airline", "origin_code", "destination_code", "date", "departure_time",
+    "arrival_time", "duration_minutes", "price", "available_seats",
+    "flight_number", "fare_brand",
+]
+
 FLIGHT_SEARCH_QUERY = """
 {
   flightSearch(
@@ -77,13 +87,8 @@ FLIGHT_SEARCH_QUERY = """
 
 def format_time(dt_str: str) -> str:
     """Convert '2026-03-06 16:00:00' -> '4:00 PM'"""
-    try:
-        dt = datetime.strptime(dt_str, "%Y-%m-%d %H:%M:%S")
-        h = dt.hour % 12 or 12
-        ampm = "AM" if dt.hour < 12 else "PM"
-        return f"{h}:{dt.minute:02d} {ampm}"
-    except Exception:
-        return dt_str
+    dt = dateparse.AERO_TIMES.parse(dt_str)
+    return dateparse.twelve_hour(dt) if dt else dt_str
 
 
 def format_date(dt_str: str) -> str:
@@ -91,10 +96,9 @@ def format_date(dt_str: str) -> str:
 
 
 def fetch_flights(origin: str, destination: str) -> list[dict]:
-    response = requests.post(
+    response = HTTP.post(
         GRAPHQL_URL,
         json={"query": FLIGHT_SEARCH_QUERY % (origin, destination)},
-        headers={"Content-Type": "application/json"},
         timeout=30,
     )
     response.raise_for_status()
@@ -104,60 +108,68 @@ def fetch_flights(origin: str, destination: str) -> list[dict]:
     return data.get("data", {}).get("flightSearch", {}).get("departureFlights", [])
 
 
-def scrape_all_routes() -> list[dict]:
-    all_flights = []
-    for route in ROUTES:
-        origin = route["origin"]
-        dest = route["destination"]
-        print(f"  Fetching {origin} -> {dest} ...", end=" ", flush=True)
-        try:
-            raw = fetch_flights(origin, dest)
-        except Exception as e:
-            print(f"ERROR: {e}")
-            continue
-        print(f"{len(raw)} flights found")
-
-        for f in raw:
-            if f.get("isSoldOut"):
+def _fetch_route(route: dict, deadline: float | None) -> tuple[list[dict] | None, str]:
+    """Fetch one route. Returns (raw flights or None, status text for the log)."""
+    if deadline is not None and time.time() > deadline:
+        return None, "SKIPPED (deadline reached)"
+    try:
+        raw = fetch_flights(route["origin"], route["destination"])
+    except Exception as e:
+        return None, f"ERROR: {e}"
+    return raw, f"{len(raw)} flights found"
+
+
+def scrape_all_routes(out: FlightWriter, deadline: float | None = None, concurrency: int = 1):
+    """Scrape every route, appending each route's flights to out as it arrives."""
+    with RequestPool(max_workers=max(1, concurrency)) as pool:
+        results = pool.map(lambda r: _fetch_route(r, deadline), ROUTES)
+
+        for route, (raw, status) in zip(ROUTES, results):
+            origin = route["origin"]
+            dest = route["destination"]
+            print(f"  Fetching {origin} -> {dest} ... {status}")
+            if raw is None:
                 continue
-            price = f.get("price")
-            record = {
-                "airline": "Aero",
-                "origin_code": origin,
-                "destination_code": dest,
-                "date": format_date(f.get("departureAt", "")),
-                "departure_time": format_time(f.get("departureAt", "")),
-                "arrival_time": format_time(f.get("arrivalAt", "")),
-                "duration_minutes": f.get("duration"),
-                "price": round(float(price), 2) if price else 0,
-                "available_seats": f.get("availableAdultSeats", 0),
-                "flight_number": f"5E{f.get('flightNumber', '')}",
-                "fare_brand": f.get("fareBrandName", ""),
-            }
-            all_flights.append(record)
-
-    return all_flights
-
-
-if __name__ == "__main__":
+            flights = []
+            for f in raw:
+                if f.get("isSoldOut"):
+                    continue
+                price = f.get("price")
+                record = {
+                    "airline": "Aero",
+                    "origin_code": origin,
+                    "destination_code": dest,
+                    "date": format_date(f.get("departureAt", "")),
+                    "departure_time": format_time(f.get("departureAt", "")),
+                    "arrival_time": format_time(f.get("arrivalAt", "")),
+                    "duration_minutes": f.get("duration"),
+                    "price": round(float(price), 2) if price else 0,
+                    "available_seats": f.get("availableAdultSeats", 0),
+                    "flight_number": f"5E{f.get('flightNumber', '')}",
+                    "fare_brand": f.get("fareBrandName", ""),
+                }
+                flights.append(record)
+            out.extend(flights)
+
+
+def main(deadline=None, concurrency=1):
     print("=" * 60)
     print("Aero Flight Scraper")
     print(f"Routes: {len(ROUTES)}")
     print("=" * 60 + "\n")
 
-    flights = scrape_all_routes()
+    HTTP.set_deadline(deadline)
+    HTTP.set_pool_size(concurrency)
+    out = FlightWriter("aero_flights", csv_fields=CSV_FIELDS)
+    with out:
+        scrape_all_routes(out, deadline=deadline, concurrency=concurrency)
+    print(f"\nSaved JSON -> {out.path}")
+    if out.count:
+        print(f"Saved CSV  -> {out.csv_path}")
 
-    # Save JSON
-    with open("aero_flights.json", "w") as f:
-        json.dump(flights, f, indent=2)
-    print(f"\nSaved JSON -> aero_flights.json")
+    print(f"\nDone! {out.count} flights across {len(ROUTES)} routes")
+    HTTP.report()
 
-    # Save CSV
-    if flights:
-        with open("aero_flights.csv", "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=list(flights[0].keys()))
-            writer.writeheader()
-            writer.writerows(flights)
-        print(f"Saved CSV  -> aero_flights.csv")
 
-    print(f"\nDone! {len(flights)} flights across {len(ROUTES)} routes")
+if __name__ == "__main__":
+    main()
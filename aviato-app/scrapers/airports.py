@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+airports.py — Every airport the scrapers and the price checker know about,
+in one table: IATA code, city, display label, IANA time zone and the city
+names scrapers report it under.
+
+    city      short name written into scraper output ("Burbank")
+    label     name used in price alert emails ("Burbank, LA")
+    tz        IANA zone, for arrival times across time zones
+    aliases   city names airline sites use for it ("Le Bourget", "Paris")
+
+Time zone offsets come from zoneinfo, so they follow each zone's DST rules
+instead of a fixed offset from ET. offset_minutes() is memoized per
+(origin, dest, date), so a scrape of a few thousand flights computes each
+pair's offset once per day. zoneinfo uses the OS zone database; where there
+is none (Windows), pip install tzdata.
+
+Usage:
+    import airports
+    airports.city("PBI")                       # "West Palm Beach"
+    airports.label("PBI")                      # "Palm Beach, FL"
+    airports.city_code("Le Bourget")           # "LBG"
+    airports.city_code("New York", "BARK Air") # "HPN"
+    airports.offset_minutes("HPN", "LTN", "2026-07-01")   # 300
+"""
+
+import functools
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+
+@dataclass(frozen=True, slots=True)
+class Airport:
+    code: str
+    city: str
+    label: str
+    tz: str
+    aliases: tuple[str, ...] = ()
+
+
+ET, CT, MT, PT = "America/New_York", "America/Chicago", "America/Denver", "America/Los_Angeles"
+HAWAII, CABO = "Pacific/Honolulu", "America/Mazatlan"
+
+# Airports not in the table are assumed to be on ET (as the old fixed offsets did)
+DEFAULT_TZ = ET
+
+_AIRPORTS = [
+    # Northeast
+    Airport("HPN", "White Plains", "White Plains, NY", ET),
+    Airport("TEB", "Teterboro", "Teterboro, NJ", ET, ("New Jersey", "Teterboro")),
+    Airport("MMU", "Morristown", "Morristown, NJ", ET),
+    Airport("FRG", "Farmingdale", "Farmingdale, NY", ET),
+    Airport("ACK", "Nantucket", "Nantucket, MA", ET),
+    Airport("MVY", "Martha's Vineyard", "Martha's Vineyard, MA", ET),
+    Airport("BOS", "Boston", "Boston", ET),
+    Airport("IAD", "Washington", "Washington, DC", ET),
+    Airport("PIT", "Pittsburgh", "Pittsburgh", ET),
+    # Florida
+    Airport("PBI", "West Palm Beach", "Palm Beach, FL", ET),
+    Airport("APF", "Naples", "Naples, FL", ET),
+    Airport("BCT", "Boca Raton", "Boca Raton, FL", ET),
+    Airport("FLL", "Fort Lauderdale", "Fort Lauderdale", ET),
+    Airport("FXE", "Fort Lauderdale", "Fort Lauderdale", ET, ("Florida", "Fort Lauderdale", "Miami")),
+    Airport("MIA", "Miami", "Miami", ET),
+    Airport("OPF", "Miami", "Miami", ET),
+    Airport("DSI", "Destin", "Destin, FL", CT),
+    # Texas / Central
+    Airport("DAL", "Dallas", "Dallas", CT),
+    Airport("DFW", "Dallas/Fort Worth", "Dallas/Fort Worth", CT),
+    Airport("HOU", "Houston", "Houston", CT),
+    Airport("EDC", "Austin", "Austin, TX", CT),
+    Airport("MEM", "Memphis", "Memphis", CT),
+    Airport("BNA", "Nashville", "Nashville", CT),
+    Airport("STL", "St. Louis", "St. Louis", CT),
+    # Mountain
+    Airport("APA", "Denver", "Denver, CO", MT),
+    Airport("ASE", "Aspen", "Aspen, CO", MT),
+    Airport("SLC", "Salt Lake City", "Salt Lake City", MT),
+    Airport("HCR", "Park City", "Park City, UT", MT),
+    Airport("TSM", "Taos", "Taos, NM", MT),
+    Airport("SAF", "Santa Fe", "Santa Fe, NM", MT),
+    Airport("HOB", "Hobbs", "Hobbs, NM", MT),
+    Airport("SUN", "Sun Valley", "Sun Valley, ID", "America/Boise"),
+    Airport("SCF", "Scottsdale", "Scottsdale, AZ", "America/Phoenix"),
+    # West
+    Airport("BUR", "Burbank", "Burbank, LA", PT),
+    Airport("VNY", "Van Nuys", "Van Nuys, LA", PT, ("Los Angeles", "Van Nuys", "LA", "California")),
+    Airport("SMO", "Santa Monica", "Santa Monica, LA", PT),
+    Airport("LAX", "Los Angeles", "Los Angeles", PT),
+    Airport("SNA", "Orange County", "Orange County, CA", PT),
+    Airport("CLD", "Carlsbad", "Carlsbad, CA", PT),
+    Airport("TRM", "Coachella Valley", "Palm Springs, CA", PT),
+    Airport("LAS", "Las Vegas", "Las Vegas", PT),
+    Airport("RNO", "Reno", "Reno, NV", PT),
+    Airport("OAK", "Oakland", "Oakland, CA", PT),
+    Airport("CCR", "Concord", "Concord, CA", PT),
+    Airport("SJC", "San Jose", "San Jose, CA", PT, ("San Francisco",)),
+    Airport("MRY", "Monterey", "Monterey, CA", PT),
+    Airport("APC", "Napa", "Napa, CA", PT),
+    Airport("SEA", "Seattle", "Seattle", PT, ("Seattle",)),
+    Airport("PDX", "Portland", "Portland, OR", PT),
+    # Hawaii / Mexico
+    Airport("HNL", "Honolulu", "Honolulu", HAWAII, ("Honolulu", "Hawaii")),
+    Airport("KOA", "Kona", "Kona, HI", HAWAII, ("Kailua-Kona",)),
+    Airport("OGG", "Maui", "Maui, HI", HAWAII),
+    Airport("CSW", "Cabo San Lucas", "Cabo San Lucas", CABO),
+    Airport("SJD", "San Jose del Cabo", "San Jose del Cabo", CABO),
+    # Canada
+    Airport("YYZ", "Toronto", "Toronto", "America/Toronto", ("Toronto",)),
+    Airport("YVR", "Vancouver", "Vancouver", "America/Vancouver", ("Vancouver",)),
+    Airport("YYR", "Goose Bay", "Goose Bay", "America/Goose_Bay"),
+    # Europe
+    Airport("LTN", "London", "London", "Europe/London", ("London", "Luton")),
+    Airport("STN", "London", "London", "Europe/London"),
+    Airport("BHX", "Birmingham", "Birmingham, UK", "Europe/London", ("Birmingham",)),
+    Airport("DUB", "Dublin", "Dublin", "Europe/Dublin", ("Dublin",)),
+    Airport("LBG", "Paris", "Paris", "Europe/Paris", ("Paris", "Le Bourget")),
+    Airport("NCE", "Nice", "Nice", "Europe/Paris", ("Nice",)),
+    Airport("MAD", "Madrid", "Madrid", "Europe/Madrid", ("Madrid",)),
+    Airport("AGP", "Malaga", "Malaga", "Europe/Madrid"),
+    Airport("LIS", "Lisbon", "Lisbon", "Europe/Lisbon", ("Lisbon",)),
+    Airport("BER", "Berlin", "Berlin", "Europe/Berlin", ("Berlin",)),
+    Airport("FRA", "Frankfurt", "Frankfurt", "Europe/Berlin", ("Frankfurt",)),
+    Airport("GVA", "Geneva", "Geneva", "Europe/Zurich", ("Geneva",)),
+    Airport("MXP", "Milan", "Milan", "Europe/Rome", ("Milan", "Malpensa")),
+    Airport("LIN", "Milan", "Milan", "Europe/Rome"),
+    Airport("ATH", "Athens", "Athens", "Europe/Athens", ("Athens",)),
+    Airport("ARN", "Stockholm", "Stockholm", "Europe/Stockholm", ("Stockholm",)),
+    # Middle East / Asia
+    Airport("DWC", "Dubai", "Dubai", "Asia/Dubai", ("Dubai", "Al Maktoum")),
+    Airport("NRT", "Tokyo", "Tokyo", "Asia/Tokyo", ("Ota City",)),
+]
+
+AIRPORTS: dict[str, Airport] = {a.code: a for a in _AIRPORTS}
+
+# City name -> code, from every airport's aliases
+_CITY_CODES: dict[str, str] = {alias: a.code for a in _AIRPORTS for alias in a.aliases}
+
+# Names that mean a different airport depending on the airline's site
+AIRLINE_CITY_CODES: dict[str, dict[str, str]] = {
+    "BARK Air": {"New York": "HPN"},
+    "K9 Jets": {"New York": "TEB"},
+}
+
+
+def city(code: str) -> str:
+    """Short city name for code (the code itself if unknown)."""
+    airport = AIRPORTS.get(code)
+    return airport.city if airport else code
+
+
+def label(code: str) -> str:
+    """Display label for code, e.g. "White Plains, NY" (the code if unknown)."""
+    airport = AIRPORTS.get(code)
+    return airport.label if airport else code
+
+
+def city_code(name: str, airline: str | None = None) -> str | None:
+    """IATA code for a city name as an airline's site reports it, or None."""
+    return AIRLINE_CITY_CODES.get(airline, {}).get(name) or _CITY_CODES.get(name)
+
+
+@functools.lru_cache(maxsize=None)
+def _zone(code: str) -> ZoneInfo:
+    airport = AIRPORTS.get(code)
+    return ZoneInfo(airport.tz if airport else DEFAULT_TZ)
+
+
+@functools.lru_cache(maxsize=None)
+def offset_minutes(origin: str, dest: str, date: str = "") -> int:
+    """
+    Minutes dest's clock is ahead of origin's on date (ISO YYYY-MM-DD,
+    taken at 12:00 UTC, after any 2 AM DST switch on either side). Without
+    a parseable date, today's offsets are used.
+    """
+    try:
+        day = datetime.fromisoformat(date[:10])
+    except ValueError:
+        day = datetime.now(timezone.utc)
+    when = day.replace(hour=12, minute=0, second=0, microsecond=0, tzinfo=timezone.utc)
+    delta = when.astimezone(_zone(dest)).utcoffset() - when.astimezone(_zone(origin)).utcoffset()
+    return int(delta.total_seconds() // 60)
@@ -19,15 +19,19 @@ Usage:
   python bark_air_scraper.py
 """
 import requests
-import json
-import csv
 import time
 import re
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
 from bs4 import BeautifulSoup
 from typing import Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
+
+import airports
+import dateparse
+from http_cache import CACHE
+from http_client import HttpClient, RequestPool
+from scrape_output import FlightWriter
 
 # ─── Configuration ───────────────────────────────────────────────────────────
 
@@ -69,28 +73,13 @@ TARGET_ROUTES = [
     "Ota City To Los Angeles",
 ]
 
-AIRPORT_CODES = {
-    "New York": "HPN",
-    "Los Angeles": "VNY",
-    "San Francisco": "SJC",
-    "Kailua-Kona": "KOA",
-    "Seattle": "SEA",
-    "London": "LTN",
-    "Paris": "LBG",
-    "Madrid": "MAD",
-    "Lisbon": "LIS",
-    "Berlin": "BER",
-    "Dublin": "DUB",
-    "Athens": "ATH",
-    "Stockholm": "ARN",
-    "Ota City": "NRT",
-}
-
 HEADERS = {
     "User-Agent": "BarkAirFlightScraper/1.0",
     "Accept": "application/json",
 }
 
+HTTP = HttpClient("BARK Air", headers=HEADERS, pool_size=2)
+
 # ─── Data Model ──────────────────────────────────────────────────────────────
 
 @dataclass
@@ -130,7 +119,7 @@ def fetch_all_products() -> list:
         print(f"  Fetching page {page}... ", end="", flush=True)
 
         try:
-            resp = requests.get(url, headers=HEADERS, timeout=30)
+            resp = CACHE.get(url, source="BARK Air", session=HTTP, timeout=30)
             resp.raise_for_status()
             data = resp.json()
         except requests.RequestException as e:
@@ -143,7 +132,8 @@ def fetch_all_products() -> list:
             break
 
         all_products.extend(products)
-        print(f"got {len(products)} products (total: {len(all_products)})")
+        cached = " (cached)" if resp.from_cache else ""
+        print(f"got {len(products)} products (total: {len(all_products)}){cached}")
 
         page += 1
         time.sleep(REQUEST_DELAY)
@@ -188,8 +178,8 @@ def filter_target_flights(products: list) -> list:
             route=route,
             origin=origin,
             destination=destination,
-            origin_code=AIRPORT_CODES.get(origin, "???"),
-            destination_code=AIRPORT_CODES.get(destination, "???"),
+            origin_code=airports.city_code(origin, "BARK Air") or "???",
+            destination_code=airports.city_code(destination, "BARK Air") or "???",
             month=month_values[0] if month_values else "Unknown",
             price=variant.get("price", "0.00"),
             available=variant.get("available", False),
@@ -213,7 +203,7 @@ def scrape_flight_details(flight: Flight) -> Flight:
     url = f"{BASE_URL}/products/{flight.handle}"
 
     try:
-        resp = requests.get(url, headers={**HEADERS, "Accept": "text/html"}, timeout=30)
+        resp = HTTP.get(url, headers={"Accept": "text/html"}, timeout=30)
         resp.raise_for_status()
     except requests.RequestException as e:
         print(f"    WARNING: Could not fetch {flight.handle}: {e}")
@@ -252,49 +242,23 @@ def scrape_flight_details(flight: Flight) -> Flight:
             if match:
                 flight.tickets_remaining = int(match.group(1))
 
-    flight.scraped_at = datetime.utcnow().isoformat() + "Z"
+    flight.scraped_at = datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
     return flight
 
 
 # ─── Output ──────────────────────────────────────────────────────────────────
 
-def save_json(flights: list, filename: str = "bark_air_flights.json"):
-    """Save flights to JSON file."""
-    data = {
-        "scraped_at": datetime.utcnow().isoformat() + "Z",
-        "total_flights": len(flights),
-        "routes": list(set(f.route for f in flights)),
-        "flights": [asdict(f) for f in flights],
-    }
-    with open(filename, "w") as fp:
-        json.dump(data, fp, indent=2)
-    print(f"\n  Saved JSON → {filename}")
-
-
-def save_csv(flights: list, filename: str = "bark_air_flights.csv"):
-    """Save flights to CSV file."""
-    if not flights:
-        return
-    fieldnames = list(asdict(flights[0]).keys())
-    with open(filename, "w", newline="") as fp:
-        writer = csv.DictWriter(fp, fieldnames=fieldnames)
-        writer.writeheader()
-        for f in flights:
-            writer.writerow(asdict(f))
-    print(f"  Saved CSV  → {filename}")
+def open_output(name: str = "bark_air_flights") -> FlightWriter:
+    """Writer for <name>.jsonl (see scrape_output.py) and <name>.csv."""
+    return FlightWriter(name, csv_fields=[f.name for f in fields(Flight)])
 
 
 def parse_date_to_iso(date_str: str) -> Optional[str]:
     """Convert BARK Air date format to YYYY-MM-DD."""
     if not date_str:
         return None
-    # Try common formats: "Saturday, March 8, 2026", "Mar 8, 2026", etc.
-    for fmt in ["%A, %B %d, %Y", "%B %d, %Y", "%b %d, %Y", "%m/%d/%Y"]:
-        try:
-            return datetime.strptime(date_str.strip(), fmt).strftime("%Y-%m-%d")
-        except ValueError:
-            continue
-    return None
+    # "Saturday, March 8, 2026", "Mar 8, 2026", etc.
+    return dateparse.BARK_DATES.iso(date_str)
 
 
 def estimate_duration(origin_code: str, dest_code: str) -> str:
@@ -327,13 +291,9 @@ def estimate_arrival(takeoff: str, origin_code: str, dest_code: str) -> str:
     mins = int(dur.split("h ")[1].replace("m", ""))
 
     # Parse takeoff time
-    try:
-        t = datetime.strptime(takeoff.strip(), "%I:%M %p")
-    except ValueError:
-        try:
-            t = datetime.strptime(takeoff.strip(), "%I:%M%p")
-        except ValueError:
-            return "TBD"
+    t = dateparse.BARK_TAKEOFF.parse(takeoff)
+    if t is None:
+        return "TBD"
 
     from datetime import timedelta
     arr = t + timedelta(hours=hours, minutes=mins)
@@ -356,7 +316,7 @@ def save_typescript(flights: list, filename: str = "bark_air_flights_ts.txt"):
 
     lines = []
     lines.append("// ═══ BARK Air flights — scraped from air.bark.co ═══")
-    lines.append(f"// Scraped at: {datetime.utcnow().isoformat()}Z")
+    lines.append(f"// Scraped at: {datetime.now(timezone.utc).replace(tzinfo=None).isoformat()}Z")
     lines.append(f"// Total available flights: {sum(len(v) for v in routes.values())}")
     lines.append("")
 
@@ -432,17 +392,30 @@ def print_summary(flights: list):
     print(f"\n{'=' * 90}")
     total_available = sum(1 for f in flights if f.available)
     print(f"Total flights: {len(flights)} ({total_available} available, {len(flights) - total_available} sold out)")
-    print(f"Scraped at: {datetime.utcnow().isoformat()}Z")
+    print(f"Scraped at: {datetime.now(timezone.utc).replace(tzinfo=None).isoformat()}Z")
     print("=" * 90)
 
 
 # ─── Main ────────────────────────────────────────────────────────────────────
 
-def main():
+def _scrape_details_politely(flight: Flight, deadline: Optional[float]) -> bool:
+    """Scrape one product page, then wait REQUEST_DELAY. False if skipped for the deadline."""
+    if deadline is not None and time.time() > deadline:
+        return False
+    scrape_flight_details(flight)
+    time.sleep(REQUEST_DELAY)
+    return True
+
+
+def main(deadline=None, concurrency=1):
     print("=" * 60)
     print("  BARK Air Flight Scraper")
     print("  Target: air.bark.co (Shopify Store)")
     print("=" * 60)
+    HTTP.set_deadline(deadline)
+    HTTP.set_pool_size(concurrency)
+    # Opened now so the output's scraped_at is when this run started
+    out = open_output()
 
     # Step 1: Fetch all products
     print("\n[1/3] Fetching all flight products from collection API...")
@@ -465,21 +438,27 @@ def main():
         return
 
     # Step 3: Scrape detailed flight info from each product page
+    # Each flight is written out as soon as its page is done (or skipped)
     print(f"\n[3/3] Scraping detailed flight info from {len(flights)} product pages...")
-    for i, flight in enumerate(flights, 1):
-        print(f"  [{i}/{len(flights)}] {flight.title}...", end=" ", flush=True)
-        scrape_flight_details(flight)
-        status = "✓" if flight.available else "✗ SOLD OUT"
-        print(f"{status} {flight.date or 'no date'} | ${flight.price}")
-        time.sleep(REQUEST_DELAY)
+    with out, RequestPool(max_workers=max(1, concurrency)) as pool:
+        results = pool.map(lambda fl: _scrape_details_politely(fl, deadline), flights)
+        for i, (flight, scraped) in enumerate(zip(flights, results), 1):
+            out.write(asdict(flight))
+            if not scraped:
+                print(f"  [{i}/{len(flights)}] {flight.title}... skipped (deadline reached)")
+                continue
+            status = "✓" if flight.available else "✗ SOLD OUT"
+            print(f"  [{i}/{len(flights)}] {flight.title}... {status} {flight.date or 'no date'} | ${flight.price}")
 
     # Output results
     print("\n" + "─" * 60)
     print("Saving results...")
-    save_json(flights)
-    save_csv(flights)
+    print(f"\n  Saved JSONL → {out.path}")
+    print(f"  Saved CSV   → {out.csv_path}")
     save_typescript(flights)
     print_summary(flights)
+    CACHE.report()
+    HTTP.report()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+bench_dateparse.py — Micro-benchmark of date/time parsing, old per-flight
+strptime loops vs dateparse.py.
+
+The corpus is one list of raw strings per parser, in the order a run meets
+them: by default a synthetic recording of a full run (each airline's format,
+one string per flight over the scrape window, so most strings repeat). Save
+it with --save, or replay a corpus recorded elsewhere with --corpus (same
+JSON shape: {"parser": ["string", ...]}).
+
+Each parser is timed cold (caches cleared) and warm (a second pass), and
+every result is checked against the old implementation, kept below
+verbatim.
+
+Run from the scrapers/ directory:
+    python bench_dateparse.py
+    python bench_dateparse.py --scale 10 --save /tmp/dates.json
+    python bench_dateparse.py --corpus /tmp/dates.json
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+from datetime import datetime, timedelta
+
+import dateparse
+
+
+# ── Old implementations (verbatim) ────────────────────────────────────
+
+def legacy_parse_date_to_iso(date_str: str) -> str:
+    """flight_record._parse_date_to_iso"""
+    if not date_str:
+        return ""
+    if re.match(r"^\d{4}-\d{2}-\d{2}$", date_str.strip()):
+        return date_str.strip()
+    for fmt in ["%B %d, %Y", "%b %d, %Y", "%d %B %Y", "%d %b %Y", "%m/%d/%Y"]:
+        try:
+            return datetime.strptime(date_str.strip(), fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return date_str.strip()
+
+
+def legacy_bark_date(date_str: str):
+    """bark_air_scraper.parse_date_to_iso"""
+    if not date_str:
+        return None
+    for fmt in ["%A, %B %d, %Y", "%B %d, %Y", "%b %d, %Y", "%m/%d/%Y"]:
+        try:
+            return datetime.strptime(date_str.strip(), fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return None
+
+
+def legacy_k9jets_date(flight_date: str):
+    """k9jets_scraper.parse_product's date loop"""
+    iso_date = None
+    for fmt in ["%m/%d/%Y", "%d/%m/%Y", "%Y-%m-%d", "%B %d, %Y", "%B %d %Y"]:
+        try:
+            iso_date = datetime.strptime(flight_date.strip(), fmt).strftime("%Y-%m-%d")
+            break
+        except ValueError:
+            continue
+    return iso_date
+
+
+def legacy_clean_time(t):
+    """tradewind_scraper.clean_time"""
+    m = re.match(r"(\d{1,2}:\d{2})\s*(AM|PM|am|pm)", t.replace(" ", ""), re.I)
+    return f"{m.group(1)} {m.group(2).upper()}" if m else t
+
+
+def legacy_format_time(dt_str: str) -> str:
+    """aero_scraper.format_time"""
+    try:
+        dt = datetime.strptime(dt_str, "%Y-%m-%d %H:%M:%S")
+        h = dt.hour % 12 or 12
+        ampm = "AM" if dt.hour < 12 else "PM"
+        return f"{h}:{dt.minute:02d} {ampm}"
+    except Exception:
+        return dt_str
+
+
+def _aero_time(s: str) -> str:
+    dt = dateparse.AERO_TIMES.parse(s)
+    return dateparse.twelve_hour(dt) if dt else s
+
+
+# name -> (old, new, flights per day at scale 1)
+PARSERS = {
+    "record_dates": (legacy_parse_date_to_iso, dateparse.iso_date, 2),
+    "bark_dates": (legacy_bark_date, dateparse.BARK_DATES.iso, 1),
+    "k9jets_dates": (legacy_k9jets_date, dateparse.K9JETS_DATES.iso, 5),
+    "tradewind_times": (legacy_clean_time, dateparse.clock, 20),
+    "aero_times": (legacy_format_time, _aero_time, 15),
+}
+
+
+# ── Corpus ────────────────────────────────────────────────────────────
+
+def synthetic_corpus(scale: int, days: int = 90, seed: int = 0) -> dict[str, list[str]]:
+    rng = random.Random(seed)
+    start = datetime(2026, 10, 19)
+    corpus: dict[str, list[str]] = {name: [] for name in PARSERS}
+    for n in range(days):
+        day = start + timedelta(days=n)
+        for name, (_, _, per_day) in PARSERS.items():
+            for _ in range(per_day * scale):
+                at = day + timedelta(hours=rng.randint(6, 21), minutes=rng.choice([0, 15, 30, 45]))
+                corpus[name].append({
+                    "record_dates": lambda: at.strftime(rng.choice(["%B %d, %Y", "%Y-%m-%d"])),
+                    "bark_dates": lambda: at.strftime("%A, %B %-d, %Y"),
+                    "k9jets_dates": lambda: at.strftime(rng.choice(["%m/%d/%Y", "%d/%m/%Y", "%B %d, %Y"])),
+                    "tradewind_times": lambda: at.strftime(rng.choice(["%I:%M %p", "%-I:%M%p"])),
+                    "aero_times": lambda: at.strftime("%Y-%m-%d %H:%M:%S"),
+                }[name]())
+    return corpus
+
+
+def _clear_caches():
+    for parser in (dateparse.RECORD_DATES, dateparse.BARK_DATES, dateparse.BARK_TAKEOFF,
+                   dateparse.K9JETS_DATES, dateparse.AERO_TIMES):
+        parser.parse.cache_clear()
+    dateparse.iso_date.cache_clear()
+    dateparse.clock.cache_clear()
+
+
+def _time(fn, strings):
+    started = time.perf_counter()
+    out = [fn(s) for s in strings]
+    return time.perf_counter() - started, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark date/time parsing")
+    parser.add_argument("--scale", type=int, default=1, help="flights per day multiplier")
+    parser.add_argument("--corpus", help="replay a recorded corpus (JSON)")
+    parser.add_argument("--save", help="write the corpus used to this path")
+    args = parser.parse_args()
+
+    if args.corpus:
+        with open(args.corpus) as f:
+            corpus = json.load(f)
+    else:
+        corpus = synthetic_corpus(args.scale)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(corpus, f)
+
+    _clear_caches()
+    print(f"{'parser':<16} {'strings':>8} {'distinct':>9} {'old':>9} {'cold':>9} {'warm':>9}  same")
+    for name, strings in corpus.items():
+        old, new, _ = PARSERS[name]
+        old_t, expected = _time(old, strings)
+        cold_t, got = _time(new, strings)
+        warm_t, again = _time(new, strings)
+        same = got == expected and again == expected
+        print(f"{name:<16} {len(strings):>8} {len(set(strings)):>9} {old_t * 1000:>7.1f}ms "
+              f"{cold_t * 1000:>7.1f}ms {warm_t * 1000:>7.1f}ms  {'yes' if same else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+bench_jsonio.py — Benchmark JSON encode/decode time and size per backend and
+on-disk format.
+
+Payloads (synthetic, nothing is read from or written to disk):
+  scraper   JSX-style flight dicts, as a scraper writes them
+  prices    previous_prices.json (one entry per route)
+  store     a flight store bootstrapped from bench_update_flights' flights.ts
+
+Formats:
+  pretty    indent=2 — what the scrapers and price checker used to write
+  compact   no whitespace (jsonio.dumps default)
+  jsonl     compact, one record per line (scraper output only)
+
+Every backend in jsonio.BACKENDS that is installed is timed (install orjson
+to compare), and the compact output of each backend is checked to be
+byte-identical to the stdlib's.
+
+Run from the scrapers/ directory:
+    python bench_jsonio.py
+    python bench_jsonio.py --flights 250000 --repeat 5
+"""
+
+import argparse
+import random
+import time
+
+import bench_update_flights
+import jsonio
+from flight_store import bootstrap
+
+
+def scraper_payload(n: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    routes = bench_update_flights.AIRLINES["JSX"]
+    flights = []
+    for _ in range(n):
+        origin, dest = rng.choice(routes).split("-")
+        h = rng.randint(5, 21)
+        date = f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        flights.append({
+            "airline": "JSX", "origin_code": origin, "destination_code": dest,
+            "origin_city": "Burbank", "destination_city": "Las Vegas", "date": date,
+            "price": round(rng.uniform(149, 899), 2), "fare_class": rng.choice(["Hop-On", "All-In"]),
+            "flight_number": f"XE{rng.randint(100, 999)}",
+            "departure_time": f"{h % 12 or 12}:{rng.choice(['00', '30'])} {'AM' if h < 12 else 'PM'}",
+            "arrival_time": f"{(h + 1) % 12 or 12}:15 PM", "seats_available": rng.randint(1, 16),
+            "departure_iso": f"{date}T{h:02d}:00:00", "arrival_iso": f"{date}T{h + 1:02d}:15:00",
+            "equipment": "ERJ-135",
+        })
+    return flights
+
+
+def prices_payload(store: dict) -> dict:
+    return {block["route"]: {"airline": "JSX", "date": "2026-10-19", "price": 100 + i}
+            for i, block in enumerate(b for b in store["flights"] if "route" in b)}
+
+
+def _best_of(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def _codec(backend: jsonio.Backend, fmt: str):
+    """(encode(obj) -> str, decode(str) -> obj) for one backend/format."""
+    if fmt == "jsonl":
+        return (lambda obj: "".join(backend.dumps(r, False, False) + "\n" for r in obj),
+                lambda text: [backend.loads(line) for line in text.splitlines()])
+    pretty = fmt == "pretty"
+    return (lambda obj: backend.dumps(obj, pretty, False)), backend.loads
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark jsonio backends and formats")
+    parser.add_argument("--flights", type=int, default=25000, help="scraper payload size")
+    parser.add_argument("--store-scale", type=int, default=10,
+                        help="bench_update_flights scale for the store payload")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    content, _ = bench_update_flights.build_input(args.store_scale)
+    store = bootstrap(content)
+    payloads = {
+        "scraper": (scraper_payload(args.flights), ["pretty", "compact", "jsonl"]),
+        "prices": (prices_payload(store), ["pretty", "compact"]),
+        "store": (store, ["pretty", "compact"]),
+    }
+    backends = list(jsonio.BACKENDS.values())
+    if len(backends) == 1:
+        print("orjson not installed — timing the stdlib backend only")
+    print(f"default backend: {jsonio.BACKEND.name}\n")
+
+    print(f"{'payload':<8} {'format':<8} {'backend':<7} {'size':>10} {'encode':>10} {'decode':>10}  same")
+    for name, (obj, formats) in payloads.items():
+        for fmt in formats:
+            reference = None
+            for backend in backends:
+                encode, decode = _codec(backend, fmt)
+                enc_t, text = _best_of(lambda: encode(obj), args.repeat)
+                dec_t, back = _best_of(lambda: decode(text), args.repeat)
+                assert back == obj, f"{backend.name} {fmt} round trip changed {name}"
+                if reference is None:
+                    reference = text
+                same = "-" if fmt == "pretty" else ("yes" if text == reference else "NO")
+                size = len(text.encode())
+                print(f"{name:<8} {fmt:<8} {backend.name:<7} {size / 1024:>8.0f}KB "
+                      f"{enc_t * 1000:>8.1f}ms {dec_t * 1000:>8.1f}ms  {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+bench_prepare_airlines.py — Benchmark loading all airlines serially vs in a
+process pool.
+
+Writes synthetic scraper output for every SOURCES airline (JSX about half of
+it, as in a real run) to a temp directory, then times
+update_flights.prepare_airline for each airline on its own, prepare_all with
+one worker (the airlines one after another) and prepare_all with a worker per
+airline. The pooled result is checked against the serial one. With enough
+cores the pooled time should track the slowest single airline rather than
+the sum; on a single core it shows the pool's overhead instead.
+
+Nothing is read from or written to app/data or the scrapers directory.
+
+Run from the scrapers/ directory:
+    python bench_prepare_airlines.py                 # 1x, 10x
+    python bench_prepare_airlines.py --scales 1 10 100 --repeat 1
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+import update_flights
+from scrape_output import FlightWriter
+
+# Roughly the scraped flight count of a full run across all airlines
+BASE_FLIGHTS = 25000
+
+# Share of the flights each airline scrapes
+SHARES = {"JSX": 0.5, "Aero": 0.15, "Slate": 0.15,
+          "Tradewind": 0.1, "BARK Air": 0.05, "K9 Jets": 0.05}
+
+
+def _flight(airline: str, route_key: str, n: int, rng: random.Random) -> dict:
+    """One raw scraper row; carries every field any adapter reads."""
+    origin, dest = route_key.split("-")
+    h, m = divmod(rng.randrange(5 * 60, 22 * 60, 5), 60)
+    day = f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+    dep = f"{h % 12 or 12}:{m:02d} {'AM' if h < 12 else 'PM'}"
+    price = rng.randint(99, 4999)
+    return {
+        "airline": airline, "origin_code": origin, "destination_code": dest,
+        "date": time.strftime("%B %d, %Y", time.strptime(day, "%Y-%m-%d"))
+        if airline == "BARK Air" else day,
+        "date_iso": day, "departure_time": dep, "takeoff": dep,
+        "arrival_time": f"{(h + 2) % 12 or 12}:{m:02d} {'AM' if h + 2 < 12 else 'PM'}",
+        "departure_iso": f"{day}T{h:02d}:{m:02d}:00", "arrival_iso": f"{day}T{h + 2:02d}:{m:02d}:00",
+        "duration_minutes": 120, "duration": "2h 00m",
+        "price": f"${price:,}" if airline == "BARK Air" else price, "price_numeric": price,
+        "seats_available": 8, "available_seats": 8, "tickets_remaining": 5, "seats": 10,
+        "flight_number": f"{n:05d}", "available": True,
+    }
+
+
+def write_outputs(out_dir: str, scale: int, base: int = BASE_FLIGHTS, seed: int = 0):
+    rng = random.Random(seed)
+    for airline, name, routes in update_flights.SOURCES:
+        routes = routes if routes is not None else update_flights.SLATE_ROUTES
+        with FlightWriter(os.path.join(out_dir, name)) as out:
+            for n in range(int(base * scale * SHARES[airline])):
+                out.write(_flight(airline, rng.choice(routes), n, rng))
+
+
+def _best_of(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark serial vs pooled airline loading")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--base", type=int, default=BASE_FLIGHTS, help="flights at scale 1")
+    parser.add_argument("--workers", type=int, default=len(update_flights.SOURCES))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPU(s), pool of {args.workers} workers\n")
+    print(f"{'scale':>6} {'flights':>9} {'slowest airline':>22} {'sum':>9} "
+          f"{'serial':>9} {'pool':>9}  identical")
+    for scale in args.scales:
+        out_dir = tempfile.mkdtemp(prefix="aviato-prepare-")
+        try:
+            write_outputs(out_dir, scale, args.base)
+            singles = {}
+            for airline, name, route_keys in update_flights.SOURCES:
+                singles[airline], _ = _best_of(lambda: update_flights.prepare_airline(
+                    airline, os.path.join(out_dir, name), route_keys), args.repeat)
+            serial_t, expected = _best_of(lambda: update_flights.prepare_all(out_dir, 1), args.repeat)
+            pool_t, got = _best_of(lambda: update_flights.prepare_all(out_dir, args.workers), args.repeat)
+        finally:
+            shutil.rmtree(out_dir)
+        slowest = max(singles, key=singles.get)
+        flights = sum(sum(u.counts.values()) for u in expected)
+        print(f"{scale:>5}x {flights:>9} {slowest:>10} {singles[slowest] * 1000:>9.0f}ms "
+              f"{sum(singles.values()) * 1000:>7.0f}ms {serial_t * 1000:>7.0f}ms "
+              f"{pool_t * 1000:>7.0f}ms  {'yes' if got == expected else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
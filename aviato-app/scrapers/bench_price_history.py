@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+bench_price_history.py — Benchmark the price history: recording a day's
+flights and the queries the price checker and CLI run, as the history grows.
+
+Simulates --days of daily records of a store-sized listing: every calendar
+date has its share of --flights, each listed --horizon days ahead, and each
+day a --change-rate share of listed fares move. The last day's record and
+each query are timed, and every query is checked against a brute-force
+answer from the daily listings (find_drops against the old dict comparison
+of two cheapest-per-route snapshots, find_flight_drops against a dict join
+of every flight).
+
+merge_drops alone is then timed on two sorted synthetic listings of
+--merge-flights flights each (hundreds of thousands by default), against
+the same dict join.
+
+Nothing is read from or written to app/data or scrapers/price_history.db.
+
+Run from the scrapers/ directory:
+    python bench_price_history.py
+    python bench_price_history.py --days 730 --flights 50000 --change-rate 0.2
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import bench_update_flights
+import price_history
+from ts_reader import FlightPrice
+
+
+def synthetic_days(days: int, flights: int, horizon: int, change_rate: float, seed: int = 0):
+    """(observed, [FlightPrice]) for each day: the flights listed that day."""
+    rng = random.Random(seed)
+    routes = sorted({rk for routes in bench_update_flights.AIRLINES.values() for rk in routes})
+    airlines = list(bench_update_flights.AIRLINES)
+    per_date = max(1, flights // horizon)
+    start = date(2026, 10, 19) - timedelta(days=days - 1)
+    deps = [f"{h % 12 or 12}:{m:02d} {'AM' if h < 12 else 'PM'}" for h in range(6, 22) for m in (0, 30)]
+    schedule: dict[str, list[tuple[str, str, str]]] = {}
+    prices: dict[tuple[str, int], int] = {}
+    for n in range(days):
+        observed = start + timedelta(days=n)
+        listed = []
+        for ahead in range(horizon):
+            flight_date = (observed + timedelta(days=ahead)).isoformat()
+            if flight_date not in schedule:
+                schedule[flight_date] = [(rng.choice(routes), rng.choice(airlines), rng.choice(deps))
+                                         for _ in range(per_date)]
+            for i, (route, airline, dep) in enumerate(schedule[flight_date]):
+                key = (flight_date, i)
+                if key not in prices:
+                    prices[key] = rng.randint(99, 4999)
+                elif rng.random() < change_rate:
+                    prices[key] = max(49, prices[key] + rng.randint(-300, 300))
+                listed.append(FlightPrice(route, airline, prices[key], flight_date, dep))
+        schedule.pop((observed - timedelta(days=1)).isoformat(), None)
+        yield observed.isoformat(), listed
+
+
+def _cheapest(rows) -> dict[str, dict]:
+    """Cheapest per route, ties to the first airline alphabetically (as the history)."""
+    route_prices: dict[str, dict] = {}
+    for row in rows:
+        best = route_prices.get(row.route)
+        if best is None or (row.price, row.airline) < (best["price"], best["airline"]):
+            route_prices[row.route] = {"price": row.price, "airline": row.airline}
+    return route_prices
+
+
+def legacy_find_drops(current: dict[str, dict], previous: dict[str, dict]) -> list[dict]:
+    """check_price_drops.find_drops before the history"""
+    drops = []
+    for route, curr_info in current.items():
+        if route not in previous:
+            continue
+        old_price = previous[route]["price"]
+        new_price = curr_info["price"]
+        if new_price < old_price:
+            drops.append({"route": route, "airline": curr_info["airline"], "old_price": old_price,
+                          "new_price": new_price, "savings": old_price - new_price})
+    drops.sort(key=lambda d: d["savings"], reverse=True)
+    return drops
+
+
+def _by_flight(rows) -> dict[tuple, int]:
+    """Lowest price per (route, date, dep, airline), as recorded."""
+    lowest: dict[tuple, int] = {}
+    for row in rows:
+        key = (row.route, row.date, row.dep, row.airline)
+        if key not in lowest or row.price < lowest[key]:
+            lowest[key] = row.price
+    return lowest
+
+
+def dict_flight_drops(current: dict[tuple, int], previous: dict[tuple, int],
+                      min_savings: int, min_percent: float) -> list[tuple]:
+    """(key, old, new) of every flight drop, by hashing instead of merging"""
+    return sorted((key, previous[key], price) for key, price in current.items()
+                  if key in previous and previous[key] - price >= max(min_savings, 1)
+                  and (previous[key] - price) * 100 >= min_percent * previous[key])
+
+
+def _as_found(drops: list[dict]) -> list[tuple]:
+    return sorted(((d["route"], d["date"], d["dep"], d["airline"]), d["old_price"], d["new_price"])
+                  for d in drops)
+
+
+def synthetic_listings(flights: int, change_rate: float, seed: int = 1):
+    """Two days' sorted listings of the same flights, some repriced or gone."""
+    rng = random.Random(seed)
+    previous = {(f"R{rng.randrange(500):03d}", f"2026-{rng.randint(10, 12)}-{rng.randint(10, 28)}",
+                 f"{rng.randint(6, 21)}:{rng.choice(('00', '30'))}", f"A{rng.randrange(12)}"): rng.randint(99, 4999)
+                for _ in range(flights)}
+    current = {}
+    for key, price in previous.items():
+        r = rng.random()
+        if r >= 0.02 + change_rate:
+            current[key] = price
+        elif r >= 0.02:
+            current[key] = max(49, price + rng.randint(-600, 300))
+    return sorted(current.items()), sorted(previous.items())
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the price history")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--flights", type=int, default=bench_update_flights.BASE_FLIGHTS,
+                        help="flights listed on any day")
+    parser.add_argument("--horizon", type=int, default=90, help="days ahead flights are listed")
+    parser.add_argument("--change-rate", type=float, default=0.05,
+                        help="share of listed fares that change each day")
+    parser.add_argument("--window", type=int, default=30, help="days for lowest_since")
+    parser.add_argument("--min-savings", type=int, default=50, help="for the flight drops")
+    parser.add_argument("--min-percent", type=float, default=10, help="for the flight drops")
+    parser.add_argument("--merge-flights", type=int, default=300_000)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="aviato-history-")
+    path = Path(tmp) / "price_history.db"
+    recent: list[tuple[str, list[FlightPrice]]] = []     # the last window + 1 days
+    record_t, changes = 0.0, 0
+    try:
+        with price_history.connect(path) as conn:
+            for observed, rows in synthetic_days(args.days, args.flights, args.horizon, args.change_rate):
+                elapsed, changed = _timed(lambda: price_history.record(conn, rows, observed))
+                record_t += elapsed
+                changes += changed
+                recent = (recent + [(observed, rows)])[-(args.window + 1):]
+                conn.commit()
+            last_day, last_rows = recent[-1]
+            again_t, _ = _timed(lambda: price_history.record(conn, last_rows, last_day))
+            rows_total = conn.execute("SELECT COUNT(*) FROM prices").fetchone()[0]
+
+            prev_rows, since = recent[-2][1], recent[0][0]
+            route, flight = last_rows[0].route, last_rows[-1].date
+            queries = {
+                "find_drops": lambda: price_history.find_drops(conn, last_day),
+                "find_flight_drops": lambda: price_history.find_flight_drops(
+                    conn, last_day, args.min_savings, args.min_percent),
+                "snapshot (last day)": lambda: price_history.snapshot(conn, last_day),
+                f"snapshot ({args.window}d ago)": lambda: price_history.snapshot(conn, since),
+                f"lowest_since ({args.window}d)": lambda: price_history.lowest_since(conn, route, since),
+                "history": lambda: price_history.history(conn, route, flight),
+            }
+            results = {name: _timed(fn) for name, fn in queries.items()}
+        size = os.path.getsize(path)
+    finally:
+        shutil.rmtree(tmp)
+
+    legacy_t, legacy_drops = _timed(lambda: legacy_find_drops(_cheapest(last_rows), _cheapest(prev_rows)))
+    window_min = min(row.price for _, rows in recent for row in rows if row.route == route)
+    expected = {
+        "find_drops": sorted(map(sorted, (d.items() for d in legacy_drops))),
+        "find_flight_drops": dict_flight_drops(_by_flight(last_rows), _by_flight(prev_rows),
+                                               args.min_savings, args.min_percent),
+        "snapshot (last day)": _cheapest(last_rows),
+        f"snapshot ({args.window}d ago)": _cheapest(recent[0][1]),
+        f"lowest_since ({args.window}d)": window_min,
+    }
+    got = {
+        "find_drops": sorted(map(sorted, (d.items() for d in results["find_drops"][1]))),
+        "find_flight_drops": _as_found(results["find_flight_drops"][1]),
+        f"lowest_since ({args.window}d)": results[f"lowest_since ({args.window}d)"][1]["price"],
+    }
+
+    print(f"{args.days} days, {args.flights} flights listed, {args.change_rate:.0%} fares changing daily: "
+          f"{rows_total} rows, {size / 1e6:.1f}MB")
+    print(f"  record, average day       {record_t / args.days * 1000:>8.1f}ms  "
+          f"({changes / args.days:.0f} changes)")
+    print(f"  record, same day again    {again_t * 1000:>8.1f}ms")
+    for name, (elapsed, result) in results.items():
+        check = ""
+        if name in expected:
+            check = "ok" if got.get(name, result) == expected[name] else "WRONG"
+        print(f"  {name:<25} {elapsed * 1000:>8.1f}ms  {check}")
+    print(f"  dict comparison (old)     {legacy_t * 1000:>8.1f}ms  ({len(legacy_drops)} drops)")
+
+    current, previous = synthetic_listings(args.merge_flights, args.change_rate)
+    merge_t, merged = _timed(lambda: price_history.merge_drops(
+        current, previous, args.min_savings, args.min_percent))
+    hashed_t, hashed = _timed(lambda: dict_flight_drops(
+        dict(current), dict(previous), args.min_savings, args.min_percent))
+    check = "ok" if _as_found(merged) == hashed else "WRONG"
+    print(f"merge_drops, {len(current)} vs {len(previous)} flights "
+          f"(>= ${args.min_savings} and {args.min_percent:g}%): {len(merged)} drops")
+    print(f"  merge                     {merge_t * 1000:>8.1f}ms  {check}")
+    print(f"  dict join                 {hashed_t * 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
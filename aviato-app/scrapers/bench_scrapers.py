@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+bench_scrapers.py — Offline throughput benchmark for every scraper.
+
+Replays a recorded fixture store (see http_replay.py) through a local replay
+server and runs each scraper against it, one at a time, exactly as
+run_scrapers.py would (same entry points, concurrency and deadlines). Since
+no request leaves the machine, results are repeatable and comparable between
+changes; --latency-ms / --error-rate add synthetic network latency and 503s
+to see how the retry and concurrency settings behave.
+
+Politeness delays (time.sleep between requests) are zeroed by default so the
+numbers show the scraper's own cost; --keep-delays leaves them in.
+
+Scraper output files are written to a temporary directory, never over the
+real ones.
+
+Run from the scrapers/ directory:
+    AVIATO_HTTP_RECORD=.http_fixtures python run_scrapers.py   # record once
+    python bench_scrapers.py                                   # all airlines
+    python bench_scrapers.py jsx aero --latency-ms 80 --error-rate 0.02
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
+
+from http_replay import (  # noqa: E402
+    DATE_ENV, DEFAULT_STORE, RECORD_ENV, REPLAY_ENV, FixtureStore, ReplayServer,
+)
+from run_scrapers import ADAPTERS  # noqa: E402
+
+# Module-level sleep constants, zeroed unless --keep-delays
+POLITENESS_DELAYS = {
+    "bark_air_scraper": "REQUEST_DELAY",
+    "slate_scraper": "DELAY",
+    "tradewind_scraper": "BETWEEN_REQUESTS_S",
+}
+
+
+def bench_adapter(adapter, server: ReplayServer, out_dir: str,
+                  keep_delays: bool, verbose: bool) -> dict:
+    mod = importlib.import_module(adapter.module)
+    if not keep_delays and adapter.module in POLITENESS_DELAYS:
+        setattr(mod, POLITENESS_DELAYS[adapter.module], 0)
+    if hasattr(mod, "OUTPUT_NAME"):
+        mod.OUTPUT_NAME = os.path.join(out_dir, os.path.basename(mod.OUTPUT_NAME))
+
+    kwargs = {"deadline": time.time() + adapter.deadline_s}
+    if adapter.concurrency is not None:
+        kwargs["concurrency"] = adapter.concurrency
+
+    missing_before = server.stats["missing"]
+    log = io.StringIO()
+    error = None
+    started = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(sys.stdout if verbose else log):
+            getattr(mod, adapter.entry)(**kwargs)
+    except BaseException as e:  # SystemExit from a scraper is a failure too
+        error = e
+    elapsed = time.perf_counter() - started
+
+    metrics = mod.HTTP.metrics.values()
+    requests_sent = sum(m.requests for m in metrics)
+    return {
+        "name": adapter.name,
+        "ok": error is None,
+        "error": error,
+        "elapsed": elapsed,
+        "requests": requests_sent,
+        "retries": sum(m.retries for m in metrics),
+        "errors": sum(m.errors for m in metrics),
+        "missing": server.stats["missing"] - missing_before,
+        "rps": requests_sent / elapsed if elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scrapers against recorded fixtures")
+    parser.add_argument("airlines", nargs="*", metavar="AIRLINE",
+                        help=f"subset to run: {', '.join(a.key for a in ADAPTERS)} (default: all)")
+    parser.add_argument("--store", default=str(DEFAULT_STORE))
+    parser.add_argument("--latency-ms", default="0",
+                        help='injected delay per response in ms, or "recorded"')
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="fraction of requests answered with 503")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--keep-delays", action="store_true",
+                        help="keep the scrapers' politeness delays")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="show scraper output")
+    args = parser.parse_args()
+
+    by_key = {a.key: a for a in ADAPTERS}
+    unknown = [k for k in args.airlines if k not in by_key]
+    if unknown:
+        parser.error(f"unknown airline(s): {', '.join(unknown)}")
+    adapters = [by_key[k] for k in args.airlines] if args.airlines else ADAPTERS
+
+    store = FixtureStore(args.store)
+    if not len(store):
+        sys.exit(f"No fixtures in {args.store} — record some first "
+                 f"({RECORD_ENV}={args.store} python run_scrapers.py)")
+
+    latency = args.latency_ms if args.latency_ms == "recorded" else float(args.latency_ms)
+    server = ReplayServer(store, latency_ms=latency, jitter_ms=args.jitter_ms,
+                          error_rate=args.error_rate, seed=args.seed).start()
+    out_dir = tempfile.mkdtemp(prefix="aviato-bench-")
+
+    # Must be set before the scraper modules (and their HttpClients) are imported
+    os.environ[REPLAY_ENV] = server.url
+    os.environ.pop(RECORD_ENV, None)
+    os.environ["AVIATO_HTTP_CACHE"] = os.path.join(out_dir, ".http_cache")
+    if store.meta.get("recorded_on"):
+        os.environ.setdefault(DATE_ENV, store.meta["recorded_on"])
+    os.chdir(out_dir)
+
+    print("=" * 60)
+    print("Aviato Scraper Benchmark (replay)")
+    print(f"Fixtures: {len(store)} responses from {args.store}"
+          f" (recorded {store.meta.get('recorded_on', '?')})")
+    print(f"Latency: {args.latency_ms} ms (+{args.jitter_ms:g} jitter), "
+          f"error rate: {args.error_rate:.0%}, "
+          f"delays: {'kept' if args.keep_delays else 'zeroed'}")
+    print("=" * 60, flush=True)
+
+    results = []
+    try:
+        for adapter in adapters:
+            r = bench_adapter(adapter, server, out_dir, args.keep_delays, args.verbose)
+            results.append(r)
+            print(f"  {r['name']:<10} {r['elapsed']:7.2f}s  {r['requests']:5d} req  "
+                  f"{r['rps']:7.1f} req/s  {r['retries']:3d} retries  "
+                  f"{r['errors']:3d} errors  {r['missing']:3d} unmatched"
+                  + ("" if r["ok"] else f"  FAILED: {r['error']!r}"), flush=True)
+    finally:
+        server.stop()
+
+    total_elapsed = sum(r["elapsed"] for r in results)
+    total_requests = sum(r["requests"] for r in results)
+    print("-" * 60)
+    print(f"  {'Total':<10} {total_elapsed:7.2f}s  {total_requests:5d} req  "
+          f"{total_requests / total_elapsed if total_elapsed else 0:7.1f} req/s")
+    if any(r["missing"] for r in results):
+        print(f"\n  Unmatched requests got 404 — re-record, or check {DATE_ENV} "
+              f"matches the recording day.")
+    print(f"  Output files in {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
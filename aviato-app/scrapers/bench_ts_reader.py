@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+bench_ts_reader.py — Benchmark reading cheapest prices out of flights.ts,
+the old re.DOTALL pattern vs ts_reader.
+
+Uses bench_update_flights' synthetic flights.ts (about today's entry count
+at scale 1), written to a temp file, and times check_price_drops'
+flights.ts fallback both ways: the old pattern over the whole file (kept
+below verbatim) and ts_reader streaming it line by line. Each scale is also
+run on a copy with the fields of some entries reordered (same data, price
+written before dc/ac) to show which reader still gets every route right.
+
+Nothing is read from or written to app/data.
+
+Run from the scrapers/ directory:
+    python bench_ts_reader.py                   # 1x and 100x
+    python bench_ts_reader.py --scales 1 10 --reordered 0.2 --repeat 5
+"""
+
+import argparse
+import os
+import random
+import re
+import tempfile
+import time
+from pathlib import Path
+
+import bench_update_flights
+import ts_reader
+
+
+# ── Old implementation (verbatim) ─────────────────────────────────────
+
+ENTRY_PATTERN = re.compile(
+    r"\{\s*id:'[^']*',\s*airline:'([^']*)'.*?"
+    r"dc:'([A-Z]+)',\s*ac:'([A-Z]+)'.*?"
+    r"price:(\d+)",
+    re.DOTALL,
+)
+
+
+def legacy_parse_flights_ts(path: Path) -> dict[str, dict]:
+    content = path.read_text()
+
+    route_prices: dict[str, dict] = {}
+
+    for match in ENTRY_PATTERN.finditer(content):
+        airline = match.group(1)
+        dc = match.group(2)
+        ac = match.group(3)
+        price = int(match.group(4))
+        route = f"{dc}-{ac}"
+
+        if route not in route_prices or price < route_prices[route]["price"]:
+            route_prices[route] = {"price": price, "airline": airline}
+
+    return route_prices
+
+
+def reader_parse_flights_ts(path: Path) -> dict[str, dict]:
+    route_prices: dict[str, dict] = {}
+    with open(path, encoding="utf-8") as f:
+        for row in ts_reader.iter_prices(f):
+            if row.route not in route_prices or row.price < route_prices[row.route]["price"]:
+                route_prices[row.route] = {"price": row.price, "airline": row.airline}
+    return route_prices
+
+
+# ── Input ─────────────────────────────────────────────────────────────
+
+_PRICE_FIELD_RE = re.compile(r" price:\d+,")
+
+
+def reorder_fields(content: str, share: float, seed: int = 0) -> str:
+    """Move price: to the front of a share of the entries."""
+    rng = random.Random(seed)
+    lines = content.split("\n")
+    for i, line in enumerate(lines):
+        m = _PRICE_FIELD_RE.search(line)
+        if m and line.lstrip().startswith("{ id:") and rng.random() < share:
+            line = line[:m.start()] + line[m.end():]
+            lines[i] = line.replace("{ id:", "{" + m.group(0) + " id:", 1)
+    return "\n".join(lines)
+
+
+def _best_of(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def _wrong_routes(got: dict, expected: dict) -> int:
+    return sum(1 for route in expected.keys() | got.keys() if got.get(route) != expected.get(route))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark flights.ts price parsing")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 100])
+    parser.add_argument("--base", type=int, default=bench_update_flights.BASE_FLIGHTS,
+                        help="entries at scale 1")
+    parser.add_argument("--reordered", type=float, default=0.05,
+                        help="share of entries with reordered fields in the second run")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'scale':>6} {'entries':>9} {'size':>8} {'input':>10} {'legacy':>10} {'ts_reader':>10}"
+          f"  legacy wrong  reader wrong")
+    for scale in args.scales:
+        content, _ = bench_update_flights.build_input(scale, args.base)
+        fd, name = tempfile.mkstemp(prefix="aviato-flights-", suffix=".ts")
+        os.close(fd)
+        path = Path(name)
+        try:
+            path.write_text(content)
+            expected = reader_parse_flights_ts(path)
+            for label, text in (("as rendered", content),
+                                ("reordered", reorder_fields(content, args.reordered))):
+                path.write_text(text)
+                old_t, old = _best_of(lambda: legacy_parse_flights_ts(path), args.repeat)
+                new_t, new = _best_of(lambda: reader_parse_flights_ts(path), args.repeat)
+                print(f"{scale:>5}x {content.count('airline:'):>9} {len(text) / 1e6:>6.1f}MB "
+                      f"{label:>11} {old_t * 1000:>8.0f}ms {new_t * 1000:>8.0f}ms"
+                      f"  {_wrong_routes(old, expected):>12}  {_wrong_routes(new, expected):>12}")
+        finally:
+            path.unlink()
+
+
+if __name__ == "__main__":
+    main()
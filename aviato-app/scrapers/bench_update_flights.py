@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+bench_update_flights.py — Benchmark the flights.ts update at scale.
+
+Generates a synthetic flights.ts (route arrays shared between airlines, a
+duplicate array, a SEASONAL_DATES block reusing route keys) plus one
+replacement set per airline, then times the flight store path
+(flight_store.apply_replacements + sort_routes + render_text on an
+already-bootstrapped store) against the original line-by-line text rewrite
+(kept below verbatim as legacy_rewrite) and checks that both produce the
+same output once the legacy result's arrays are date-sorted too.
+
+The single-pass text rewrite that briefly replaced legacy_rewrite was
+superseded by the store and removed, so it isn't timed. At 1x the store
+path is still about 2x slower than legacy_rewrite: rendering formats every
+entry, where the text rewrite only copies lines. That's accepted, since a
+real update renders only the routes that changed (render_flights_ts copies
+the rest from flights.ts) and the store is faster from 10x up.
+
+Nothing is read from or written to app/data.
+
+Run from the scrapers/ directory:
+    python bench_update_flights.py                  # 1x, 10x and 100x
+    python bench_update_flights.py --scales 10 --base 5000 --repeat 5
+"""
+
+import argparse
+import random
+import re
+import time
+
+import flight_store
+import update_flights
+from flight_store import apply_replacements, bootstrap, parse_entry, render_text, sort_routes
+
+# Roughly today's FLIGHTS entry count across all airlines
+BASE_FLIGHTS = 5000
+
+AIRLINES = {
+    "JSX": update_flights.JSX_ROUTES,
+    "Aero": update_flights.AERO_ROUTES,
+    "Tradewind": update_flights.TRADEWIND_ROUTES,
+    "BARK Air": update_flights.BARK_ROUTES,
+    "Slate": update_flights.SLATE_ROUTES,
+    "K9 Jets": update_flights.K9JETS_ROUTES,
+}
+
+# Airline entries the updater never replaces (hand-maintained in flights.ts)
+STATIC_AIRLINES = ["Blade", "Surf Air"]
+
+
+# ── Synthetic input ───────────────────────────────────────────────────
+
+def _entry(airline: str, route_key: str, n: int, rng: random.Random) -> str:
+    dc, ac = route_key.split("-")
+    slug = re.sub(r"[^a-z0-9]", "", airline.lower())
+    dep_h = rng.randint(6, 20)
+    return (
+        f"    {{ id:'{slug}-{dc.lower()}-{ac.lower()}-{n}', airline:'{airline}', "
+        f"dep:'{dep_h % 12 or 12}:00 {'AM' if dep_h < 12 else 'PM'}', arr:'{(dep_h + 1) % 12 or 12}:15 PM', "
+        f"dc:'{dc}', ac:'{ac}', dur:'1h 15m', price:{rng.randint(99, 4999)}, craft:'ERJ-135', "
+        f"seats:{rng.randint(1, 16)}, amen:['WiFi','Snacks'], link:'example.com', "
+        f"date:'2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}' }},"
+    )
+
+
+def _synthetic_route(n: int) -> str:
+    a = chr(ord("A") + n // 676 % 26) + chr(ord("A") + n // 26 % 26) + chr(ord("A") + n % 26)
+    return f"Q{a}-Z{a}"
+
+
+def build_input(scale: int, base: int = BASE_FLIGHTS, seed: int = 0):
+    """
+    Returns (flights_ts_content, replacements). Each airline's route list is
+    extended with synthetic routes in proportion to scale, and entries are
+    spread so that the file holds about base * scale entries.
+    """
+    rng = random.Random(seed)
+    total_flights = base * scale
+
+    routes_by_airline: dict[str, list[str]] = {}
+    synthetic = 0
+    for airline, routes in AIRLINES.items():
+        extra = []
+        for _ in range(len(routes) * (scale - 1)):
+            extra.append(_synthetic_route(synthetic))
+            synthetic += 1
+        routes_by_airline[airline] = list(routes) + extra
+
+    all_routes = sorted({rk for routes in routes_by_airline.values() for rk in routes})
+    per_entry_airlines = {rk: [a for a, routes in routes_by_airline.items() if rk in routes]
+                          for rk in all_routes}
+    per_route = max(1, total_flights // len(all_routes))
+
+    lines = [
+        "import { Flight } from './types';",
+        "",
+        "export const FLIGHTS: Record<string, Flight[]> = {",
+    ]
+    # Leave ~5% of the routes without an array, so the updater has to create them
+    missing = set(rng.sample(all_routes, max(1, len(all_routes) // 20)))
+    for rk in all_routes:
+        if rk in missing:
+            continue
+        lines.append(f"  '{rk}': [")
+        airlines = per_entry_airlines[rk] + [rng.choice(STATIC_AIRLINES)]
+        for n in range(per_route):
+            lines.append(_entry(airlines[n % len(airlines)], rk, n, rng))
+        lines.append("  ],")
+    # A stale duplicate array, as left behind by an old manual merge
+    dup = next(rk for rk in all_routes if rk not in missing)
+    lines += [f"  '{dup}': [", _entry("JSX", dup, 0, rng), "  ],"]
+    lines += ["};", "", "export const SEASONAL_DATES: Record<string, string[]> = {"]
+    lines += [f"  '{rk}': ['2026-06-01', '2026-09-01']," for rk in all_routes[:50]]
+    lines += ["};", ""]
+
+    replacements = []
+    for airline, routes in routes_by_airline.items():
+        for rk in routes:
+            ts_lines = [_entry(airline, rk, n, rng) for n in range(max(1, per_route // 2))]
+            replacements.append((rk, airline, ts_lines))
+
+    return "\n".join(lines), replacements
+
+
+# ── Previous implementation (reference) ───────────────────────────────
+
+def _legacy_build_new_route_arrays(replacements, placed_routes):
+    unplaced: dict[str, list[str]] = {}
+    for route_key, airline, ts_lines in replacements:
+        if route_key not in placed_routes:
+            unplaced.setdefault(route_key, []).extend(ts_lines)
+
+    if not unplaced:
+        return []
+
+    lines = []
+    for route_key in sorted(unplaced.keys()):
+        entries = unplaced[route_key]
+        lines.append(f"  '{route_key}': [")
+        for entry in entries:
+            lines.append(entry)
+        lines.append("  ],")
+
+    return lines
+
+
+def legacy_rewrite(content, replacements):
+    placed_routes: set[str] = set()
+    lines = content.split("\n")
+    new_lines = []
+    i = 0
+    inside_flights = False
+
+    while i < len(lines):
+        line = lines[i]
+
+        if "export const FLIGHTS" in line:
+            inside_flights = True
+        elif inside_flights and re.match(r"^\};", line):
+            new_route_lines = _legacy_build_new_route_arrays(replacements, placed_routes)
+            if new_route_lines:
+                for nrl in new_route_lines:
+                    new_lines.append(nrl)
+            inside_flights = False
+
+        route_match = re.match(r"^\s+'([A-Z]+-[A-Z]+)':\s*\[", line) if inside_flights else None
+        if route_match:
+            route_key = route_match.group(1)
+
+            if route_key in placed_routes:
+                i += 1
+                bracket_depth = 1
+                while i < len(lines) and bracket_depth > 0:
+                    bracket_depth += lines[i].count("[") - lines[i].count("]")
+                    i += 1
+                continue
+
+            route_replacements = [
+                (airline, ts_lines)
+                for rk, airline, ts_lines in replacements
+                if rk == route_key
+            ]
+
+            if not route_replacements:
+                new_lines.append(line)
+                i += 1
+                continue
+
+            for rk, airline, ts_lines in replacements:
+                if rk == route_key:
+                    placed_routes.add(rk)
+
+            array_lines = [line]
+            i += 1
+            bracket_depth = 1
+
+            while i < len(lines) and bracket_depth > 0:
+                l = lines[i]
+                bracket_depth += l.count("[") - l.count("]")
+                array_lines.append(l)
+                i += 1
+
+            airlines_to_replace = {a for a, _ in route_replacements}
+            opening = array_lines[0]
+            closing = array_lines[-1]
+            existing_entries = array_lines[1:-1]
+
+            kept_entries = []
+            for entry in existing_entries:
+                skip = False
+                for airline in airlines_to_replace:
+                    if f"airline:'{airline}'" in entry:
+                        skip = True
+                        break
+                if not skip:
+                    kept_entries.append(entry)
+
+            new_lines.append(opening)
+            for entry in kept_entries:
+                new_lines.append(entry)
+            for airline, ts_lines in route_replacements:
+                for ts_line in ts_lines:
+                    new_lines.append(ts_line)
+            new_lines.append(closing)
+            continue
+
+        new_lines.append(line)
+        i += 1
+
+    return "\n".join(new_lines)
+
+
+# ── Benchmark ─────────────────────────────────────────────────────────
+
+def _best_of(fn, repeat: int) -> tuple[float, str]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the flights.ts update")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--base", type=int, default=BASE_FLIGHTS,
+                        help="entries at scale 1")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-legacy-above", type=int, default=100,
+                        help="don't time the legacy rewrite above this scale")
+    args = parser.parse_args()
+
+    # The store prints one line per newly created route array
+    flight_store.print = lambda *a, **k: None
+
+    print(f"{'scale':>6} {'entries':>9} {'routes':>7} {'legacy':>10} {'store':>10} {'speedup':>8}  identical")
+    for scale in args.scales:
+        content, replacements = build_input(scale, args.base)
+        routes = len({rk for rk, _, _ in replacements})
+        entries = content.count("airline:'")
+
+        # The store is bootstrapped once per deployment, so it isn't timed
+        store = bootstrap(content)
+        store_replacements = [(rk, airline, [parse_entry(l) for l in ts_lines])
+                              for rk, airline, ts_lines in replacements]
+
+        new_t, new_out = _best_of(
+            lambda: render_text(sort_routes(apply_replacements(store, store_replacements)), content),
+            args.repeat)
+        if scale <= args.skip_legacy_above:
+            old_t, old_out = _best_of(lambda: legacy_rewrite(content, replacements), args.repeat)
+            # The legacy rewrite doesn't date-sort arrays; compare after sorting it
+            old_sorted = render_text(sort_routes(bootstrap(old_out)), old_out)
+            same = "yes" if old_sorted == new_out else "NO"
+            print(f"{scale:>5}x {entries:>9} {routes:>7} {old_t * 1000:>8.1f}ms "
+                  f"{new_t * 1000:>8.1f}ms {old_t / new_t:>7.1f}x  {same}")
+        else:
+            print(f"{scale:>5}x {entries:>9} {routes:>7} {'-':>10} {new_t * 1000:>8.1f}ms {'-':>8}  -")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+bench_watchlists.py — Benchmark matching a day's price drops to subscriber
+watchlists, and sending the digests.
+
+Builds --subscribers synthetic subscribers with up to --watches watches
+each (airport or metro routes from locations.ts, some with a date range or
+a maximum price) and a day of route and flight drops on the same routes.
+Digests are built both ways: watchlists.digests() over the inverted route
+index, and every drop checked against every watch, and must be the same.
+
+Sending is timed through mailer's OutboxBackend with --latency seconds per
+batch standing in for a mail server: one message per round trip against
+batches of --batch-size on --concurrency threads.
+
+Nothing is read from or written to watchlists.json.
+
+Run from the scrapers/ directory:
+    python bench_watchlists.py
+    python bench_watchlists.py --subscribers 50000 --drops 20000 --latency 0.05
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+import airports
+import mailer
+import route_index
+import watchlists
+
+
+def synthetic_watches(subscribers: int, per_subscriber: int, codes: list[str],
+                      seed: int = 0) -> list[watchlists.Watch]:
+    rng = random.Random(seed)
+    start = date(2026, 10, 19)
+    watches = []
+    for n in range(subscribers):
+        for _ in range(rng.randint(1, per_subscriber)):
+            origin, dest = rng.sample(codes, 2)
+            first = last = ""
+            if rng.random() < 0.4:
+                begin = start + timedelta(days=rng.randrange(90))
+                first, last = begin.isoformat(), (begin + timedelta(days=rng.randint(3, 30))).isoformat()
+            max_price = rng.choice([None, None, 500, 1000, 2500])
+            watches.append(watchlists.Watch(f"subscriber{n}@example.com", f"{origin}-{dest}",
+                                            first, last, max_price))
+    return watches
+
+
+def synthetic_drops(count: int, codes: list[str], seed: int = 1) -> tuple[list[dict], list[dict]]:
+    """(route drops, flight drops), biggest savings first."""
+    rng = random.Random(seed)
+    start = date(2026, 10, 19)
+    flight_drops = []
+    for _ in range(count):
+        dc, ac = rng.sample(codes, 2)
+        old = rng.randint(199, 4999)
+        new = rng.randint(99, old - 1)
+        flight_drops.append({"route": f"{dc}-{ac}", "date": (start + timedelta(days=rng.randrange(120))).isoformat(),
+                             "dep": "9:00 AM", "airline": "JSX", "old_price": old, "new_price": new,
+                             "savings": old - new, "percent": round((old - new) * 100 / old, 1)})
+    flight_drops.sort(key=lambda d: -d["savings"])
+    routes = {}
+    for d in flight_drops:
+        routes.setdefault(d["route"], {k: d[k] for k in ("route", "airline", "old_price", "new_price", "savings")})
+    return list(routes.values()), flight_drops
+
+
+def naive_digests(watches, metros, drops, flight_drops) -> dict[str, watchlists.Digest]:
+    """Every drop against every watch, expanding metros each time."""
+    found: dict[str, watchlists.Digest] = {}
+    for kind, rows in (("drops", drops), ("flight_drops", flight_drops)):
+        for d in rows:
+            dc, ac = d["route"].split("-")
+            emails = []
+            for w in watches:
+                origin, dest = w.route.split("-")
+                if (dc in metros.get(origin, [origin]) and ac in metros.get(dest, [dest])
+                        and w.matches(d.get("date", ""), d["new_price"]) and w.email not in emails):
+                    emails.append(w.email)
+            for email in emails:
+                getattr(found.setdefault(email, watchlists.Digest(email)), kind).append(d)
+    return found
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def _canonical(found: dict[str, watchlists.Digest]) -> dict:
+    return {email: ([id(d) for d in g.drops], [id(d) for d in g.flight_drops]) for email, g in found.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark watchlist matching and alert sending")
+    parser.add_argument("--subscribers", type=int, default=2000)
+    parser.add_argument("--watches", type=int, default=5, help="most watches per subscriber")
+    parser.add_argument("--drops", type=int, default=2000, help="flight drops in the day")
+    parser.add_argument("--naive-limit", type=int, default=5000,
+                        help="skip the every-drop-against-every-watch check above this many subscribers")
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per batch sent")
+    parser.add_argument("--batch-size", type=int, default=mailer.DEFAULT_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=mailer.DEFAULT_CONCURRENCY)
+    parser.add_argument("--sample", type=int, default=100, help="messages sent one at a time")
+    args = parser.parse_args()
+
+    metros = route_index.load_metros()
+    codes = sorted({a.code for a in airports._AIRPORTS} | {a for codes in metros.values() for a in codes})
+    watches = synthetic_watches(args.subscribers, args.watches, sorted(metros) + codes)
+    drops, flight_drops = synthetic_drops(args.drops, codes)
+
+    index_t, index = _timed(lambda: watchlists.build_index(watches, metros))
+    match_t, found = _timed(lambda: watchlists.digests(index, drops, flight_drops))
+    print(f"{args.subscribers} subscribers, {len(watches)} watches over {len(index)} airport routes; "
+          f"{len(drops)} route and {len(flight_drops)} flight drops")
+    print(f"  build index               {index_t * 1000:>8.1f}ms")
+    print(f"  digests (index)           {match_t * 1000:>8.1f}ms  ({len(found)} subscribers matched)")
+    if args.subscribers <= args.naive_limit:
+        naive_t, naive = _timed(lambda: naive_digests(watches, metros, drops, flight_drops))
+        check = "ok" if _canonical(naive) == _canonical(found) else "WRONG"
+        print(f"  digests (every watch)     {naive_t * 1000:>8.1f}ms  {check}")
+
+    # One at a time is timed on the first --sample messages and scaled up
+    messages = [mailer.Message(f"{len(g.flight_drops)} drops", "", g.email) for g in found.values()]
+    for label, batch_size, concurrency, sample in (
+            ("one at a time (est.)", 1, 1, messages[:args.sample]),
+            (f"batches of {args.batch_size}", args.batch_size, 1, messages),
+            (f"batches, {args.concurrency} threads", args.batch_size, args.concurrency, messages)):
+        outbox = mailer.OutboxBackend(echo=False, latency=args.latency, batch_size=batch_size,
+                                      concurrency=concurrency)
+        send_t, sent = _timed(lambda: outbox.send_all(sample))
+        send_t *= len(messages) / max(1, len(sample))
+        print(f"  send {label:<20} {send_t * 1000:>8.1f}ms  ({sent} sent, {args.latency * 1000:g}ms per batch)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,203 +1,101 @@
 #!/usr/bin/env python3
 """
-check_price_drops.py — Compares current flight prices in flights.ts against
-previous_prices.json. If any route's cheapest price has dropped, sends an
-email alert to Buttondown subscribers.
+check_price_drops.py — Records current flight prices from the flight store
+(app/data/flights_store.json, falling back to flights.ts) in the price
+history (price_history.py) and compares each route's cheapest price with the
+previous day in it. If any route's cheapest price has dropped, sends an
+email alert to Buttondown subscribers. The alert also lists the biggest
+drops on individual flights (by date and departure) that clear both
+thresholds below, which a route's cheapest price hides whenever another
+date on it is cheaper.
+
+With subscriber watchlists (watchlists.py) and a backend that can address
+one subscriber (SMTP, or the local outbox for testing; see mailer.py), each
+subscriber instead gets a digest of the drops on the routes they watch.
+Otherwise one alert goes to the whole Buttondown list, as before.
+
+A previous_prices.json left from before the history existed is imported
+into it on the first run.
 
 Run from the scrapers/ directory:
     BUTTONDOWN_API_KEY=xxx python check_price_drops.py
+    AVIATO_OUTBOX=/tmp/outbox python check_price_drops.py     # write emails there instead
 """
 
-import json
-import os
-import re
 import sys
-from datetime import datetime, timezone
 from pathlib import Path
 
-import requests
+import airports
+import flight_store
+import jsonio
+import mailer
+import price_history
+import route_index
+import ts_reader
+import watchlists
+from ts_reader import FlightPrice
 
 FLIGHTS_TS = Path(__file__).parent.parent / "app" / "data" / "flights.ts"
 PREV_PRICES = Path(__file__).parent / "previous_prices.json"
 
-# Friendly route names for email
-AIRPORT_NAMES = {
-    "HPN": "White Plains, NY",
-    "TEB": "Teterboro, NJ",
-    "MMU": "Morristown, NJ",
-    "FRG": "Farmingdale, NY",
-    "ACK": "Nantucket, MA",
-    "MVY": "Martha's Vineyard, MA",
-    "BUR": "Burbank, LA",
-    "SMO": "Santa Monica, LA",
-    "SNA": "Orange County, CA",
-    "LAX": "Los Angeles",
-    "LAS": "Las Vegas",
-    "OAK": "Oakland, CA",
-    "CCR": "Concord, CA",
-    "SCF": "Scottsdale, AZ",
-    "RNO": "Reno, NV",
-    "SLC": "Salt Lake City",
-    "MRY": "Monterey, CA",
-    "APC": "Napa, CA",
-    "TSM": "Taos, NM",
-    "APA": "Denver, CO",
-    "CLD": "Carlsbad, CA",
-    "CSW": "Cabo San Lucas",
-    "TRM": "Palm Springs, CA",
-    "DAL": "Dallas",
-    "DSI": "Destin, FL",
-    "HOU": "Houston",
-    "OPF": "Miami",
-    "SAF": "Santa Fe, NM",
-    "HOB": "Hobbs, NM",
-    "EDC": "Austin, TX",
-    "PBI": "Palm Beach, FL",
-    "APF": "Naples, FL",
-    "BCT": "Boca Raton, FL",
-    "FLL": "Fort Lauderdale",
-    "MIA": "Miami",
-    "VNY": "Van Nuys, LA",
-    "ASE": "Aspen, CO",
-    "SUN": "Sun Valley, ID",
-    "SJD": "San Jose del Cabo",
-    "OGG": "Maui, HI",
-    "KOA": "Kona, HI",
-    "SEA": "Seattle",
-    "SJC": "San Jose, CA",
-    "LTN": "London",
-    "LBG": "Paris",
-    "MAD": "Madrid",
-    "LIS": "Lisbon",
-    "BER": "Berlin",
-    "DUB": "Dublin",
-    "ATH": "Athens",
-    "ARN": "Stockholm",
-    "NRT": "Tokyo",
-    # K9 Jets airports
-    "DWC": "Dubai",
-    "FXE": "Fort Lauderdale",
-    "NCE": "Nice",
-    "AGP": "Malaga",
-    "FRA": "Frankfurt",
-    "GVA": "Geneva",
-    "MXP": "Milan",
-    "YYZ": "Toronto",
-    "BHX": "Birmingham, UK",
-    "HNL": "Honolulu",
-    "HCR": "Park City, UT",
-    # Boutique Air / misc
-    "PDX": "Portland, OR",
-    "BOS": "Boston",
-    "DFW": "Dallas/Fort Worth",
-    "IAD": "Washington, DC",
-    "PIT": "Pittsburgh",
-    "MEM": "Memphis",
-    "BNA": "Nashville",
-    "STL": "St. Louis",
-}
+# A flight's drop is only worth an alert if it saves this much, both ways
+MIN_FLIGHT_SAVINGS = 100            # dollars
+MIN_FLIGHT_DROP_PERCENT = 15
+MAX_FLIGHT_DROPS = 10               # listed in the email
 
 
 def route_display(origin: str, dest: str) -> str:
     """Convert airport codes to friendly route name."""
-    orig_name = AIRPORT_NAMES.get(origin, origin)
-    dest_name = AIRPORT_NAMES.get(dest, dest)
+    orig_name = airports.label(origin)
+    dest_name = airports.label(dest)
     return f"{orig_name} → {dest_name}"
 
 
-def parse_flights_ts() -> dict[str, dict]:
-    """
-    Parse flights.ts to extract cheapest price per route.
-    Returns: { "HPN-ACK": {"price": 795, "airline": "Tradewind"}, ... }
-    """
-    content = FLIGHTS_TS.read_text()
-
-    # Match flight entries: { id:'...', airline:'...', ... price:123, ... dc:'ABC', ac:'XYZ', ... }
-    pattern = re.compile(
-        r"\{\s*id:'[^']*',\s*airline:'([^']*)'.*?"
-        r"dc:'([A-Z]+)',\s*ac:'([A-Z]+)'.*?"
-        r"price:(\d+)",
-        re.DOTALL,
-    )
-
-    route_prices: dict[str, dict] = {}
-
-    for match in pattern.finditer(content):
-        airline = match.group(1)
-        dc = match.group(2)
-        ac = match.group(3)
-        price = int(match.group(4))
-        route = f"{dc}-{ac}"
+def load_current_prices() -> list[FlightPrice]:
+    """Every priced flight in the flight store (or flights.ts without one)."""
+    store = flight_store.load_store()
+    if store is None:
+        print("  Flight store not found — parsing flights.ts")
+        return parse_flights_ts()
+    return list(price_history.store_prices(store))
 
-        if route not in route_prices or price < route_prices[route]["price"]:
-            route_prices[route] = {"price": price, "airline": airline}
 
-    return route_prices
+def parse_flights_ts() -> list[FlightPrice]:
+    """
+    Every priced flight in flights.ts (fallback for a checkout without the
+    flight store).
+    """
+    with open(FLIGHTS_TS, encoding="utf-8") as f:
+        return list(ts_reader.iter_prices(f))
 
 
 def load_previous_prices() -> dict:
-    """Load previous prices from JSON file."""
+    """Load the old single-snapshot previous_prices.json, if any."""
     if not PREV_PRICES.exists():
         return {}
     try:
-        return json.loads(PREV_PRICES.read_text())
-    except (json.JSONDecodeError, ValueError):
+        return jsonio.load(PREV_PRICES)
+    except ValueError:  # includes jsonio.JSONDecodeError
         return {}
 
 
-def save_current_prices(prices: dict[str, dict]):
-    """Save current prices to JSON file for tomorrow's comparison."""
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    data = {}
-    for route, info in prices.items():
-        data[route] = {
-            "price": info["price"],
-            "airline": info["airline"],
-            "date": today,
-        }
-    PREV_PRICES.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
-    print(f"Saved {len(data)} route prices to {PREV_PRICES}")
-
-
-def find_drops(
-    current: dict[str, dict], previous: dict[str, dict]
-) -> list[dict]:
+def build_email(drops: list[dict], flight_drops: list[dict] | None = None,
+                footer: str = mailer.ButtondownBackend.footer) -> tuple[str, str]:
     """
-    Compare current vs previous prices, return list of drops.
-    Each drop: {"route": "HPN-ACK", "airline": "Tradewind",
-                "old_price": 795, "new_price": 695, "savings": 100}
+    Build email subject and Markdown body from route and flight price drops,
+    closing with footer (the sending backend's).
     """
-    drops = []
-    for route, curr_info in current.items():
-        if route not in previous:
-            continue  # New route, no comparison possible
-        old_price = previous[route]["price"]
-        new_price = curr_info["price"]
-        if new_price < old_price:
-            drops.append({
-                "route": route,
-                "airline": curr_info["airline"],
-                "old_price": old_price,
-                "new_price": new_price,
-                "savings": old_price - new_price,
-            })
-
-    # Sort by savings descending (biggest deals first)
-    drops.sort(key=lambda d: d["savings"], reverse=True)
-    return drops
-
-
-def build_email(drops: list[dict]) -> tuple[str, str]:
-    """Build email subject and Markdown body from price drops."""
+    flight_drops = flight_drops or []
     # Subject: list the top routes
+    routes = list(dict.fromkeys(d["route"] for d in [*drops, *flight_drops]))
     route_names = []
-    for d in drops[:3]:
-        origin, dest = d["route"].split("-")
-        short = f"{AIRPORT_NAMES.get(origin, origin).split(',')[0]} → {AIRPORT_NAMES.get(dest, dest).split(',')[0]}"
+    for route in routes[:3]:
+        origin, dest = route.split("-")
+        short = f"{airports.label(origin).split(',')[0]} → {airports.label(dest).split(',')[0]}"
         route_names.append(short)
     subject_routes = ", ".join(route_names)
-    if len(drops) > 3:
-        subject_routes += f" + {len(drops) - 3} more"
+    if len(routes) > 3:
+        subject_routes += f" + {len(routes) - 3} more"
     subject = f"Price Drop Alert: {subject_routes}"
 
     # Body
@@ -215,82 +113,92 @@ def build_email(drops: list[dict]) -> tuple[str, str]:
             f"**${d['new_price']:,}** (save ${d['savings']:,})\n"
         )
 
+    if flight_drops:
+        lines.append("## Price drops on specific flights\n")
+        for d in flight_drops[:MAX_FLIGHT_DROPS]:
+            origin, dest = d["route"].split("-")
+            when = "".join(f", {part}" for part in (d["date"], d["dep"]) if part)
+            lines.append(
+                f"- {route_display(origin, dest)}{when}: **{d['airline']}** "
+                f"${d['old_price']:,} → **${d['new_price']:,}** ({d['percent']:g}% off)"
+            )
+        lines.append("")
+
     lines.append("---\n")
     lines.append("[Search flights on Aviato](https://aviatoair.com)\n")
-    lines.append(
-        "*You're receiving this because you signed up for route alerts on Aviato. "
-        "[Unsubscribe](https://buttondown.com/aviatoair/unsubscribe)*"
-    )
+    lines.append(footer)
 
     body = "\n".join(lines)
     return subject, body
 
 
-def send_email(subject: str, body: str):
-    """Send email via Buttondown API."""
-    api_key = os.environ.get("BUTTONDOWN_API_KEY", "")
-    if not api_key:
-        print("WARNING: BUTTONDOWN_API_KEY not set. Skipping email send.")
-        print(f"Would have sent:\nSubject: {subject}\n\n{body}")
-        return False
-
-    resp = requests.post(
-        "https://api.buttondown.com/v1/emails",
-        headers={"Authorization": f"Token {api_key}"},
-        json={
-            "subject": subject,
-            "body": body,
-            "status": "about_to_send",
-        },
-        timeout=30,
-    )
-
-    if resp.status_code in (200, 201):
-        print(f"Email sent successfully! Subject: {subject}")
-        return True
-    else:
-        print(f"ERROR sending email: {resp.status_code} {resp.text}")
-        return False
-
-
 def main():
     print("=" * 60)
     print("Aviato Price Drop Checker")
     print("=" * 60)
 
-    # 1. Parse current prices from flights.ts
-    print(f"\nParsing {FLIGHTS_TS}...")
-    current_prices = parse_flights_ts()
-    print(f"Found cheapest prices for {len(current_prices)} routes")
-
-    # 2. Load previous prices
-    print(f"\nLoading previous prices from {PREV_PRICES}...")
-    previous_prices = load_previous_prices()
-    if not previous_prices:
-        print("No previous prices found (first run). Saving current prices.")
-        save_current_prices(current_prices)
-        print("Done! Price drops will be detected starting tomorrow.")
-        return
+    # 1. Load current prices from the flight store
+    print(f"\nReading {flight_store.STORE_PATH}...")
+    current_prices = load_current_prices()
+    print(f"Found {len(current_prices)} priced flights on "
+          f"{len({row.route for row in current_prices})} routes")
 
-    print(f"Loaded previous prices for {len(previous_prices)} routes")
-
-    # 3. Find drops
-    drops = find_drops(current_prices, previous_prices)
-
-    if not drops:
+    # Mail settings are checked first, so a bad config fails before anything is recorded
+    try:
+        sender = mailer.backend()
+    except ValueError as e:
+        sys.exit(f"ERROR: {e}")
+
+    # 2. Record them in the price history
+    observed = price_history.today()
+    print(f"\nRecording prices in {price_history.HISTORY_PATH}...")
+    with price_history.connect() as conn:
+        if price_history.previous_day(conn, observed) is None:
+            previous_prices = load_previous_prices()
+            if previous_prices:
+                price_history.import_snapshot(conn, previous_prices)
+                print(f"Imported {len(previous_prices)} routes from {PREV_PRICES}")
+        print(f"Recorded {price_history.record(conn, current_prices, observed)} price changes")
+
+        previous = price_history.previous_day(conn, observed)
+        if previous is None:
+            print("No earlier prices in the history (first run).")
+            print("Done! Price drops will be detected starting tomorrow.")
+            return
+        print(f"Comparing with {previous}")
+
+        # 3. Find drops, per route and per flight
+        drops = price_history.find_drops(conn, observed)
+        flight_drops = price_history.find_flight_drops(conn, observed, MIN_FLIGHT_SAVINGS,
+                                                       MIN_FLIGHT_DROP_PERCENT)
+
+    if not drops and not flight_drops:
         print("\nNo price drops detected today.")
     else:
-        print(f"\n Found {len(drops)} price drop(s)!")
+        print(f"\n Found {len(drops)} route price drop(s) and {len(flight_drops)} flight price drop(s)!")
         for d in drops:
             print(f"  {d['route']} ({d['airline']}): ${d['old_price']} → ${d['new_price']} (save ${d['savings']})")
+        for d in flight_drops[:MAX_FLIGHT_DROPS]:
+            print(f"  {d['route']} {d['date']} {d['dep']} ({d['airline']}): "
+                  f"${d['old_price']} → ${d['new_price']} ({d['percent']:g}% off)")
+
+        # 4. Build and send emails: a digest per subscriber, or one to the list
+        watches = watchlists.load()
+        if watches and isinstance(sender, mailer.ButtondownBackend):
+            print(f"\nWARNING: {mailer.SMTP_URL_ENV} not set, so watchlists are ignored "
+                  f"(Buttondown only sends to the whole list)")
+            watches = []
+        if watches:
+            index = watchlists.build_index(watches, route_index.load_metros())
+            found = watchlists.digests(index, drops, flight_drops)
+            print(f"\n{len(found)} of {len({w.email for w in watches})} subscriber(s) watch a route that dropped")
+            messages = [mailer.Message(*build_email(d.drops, d.flight_drops, sender.footer), to=d.email)
+                        for d in found.values()]
+        else:
+            messages = [mailer.Message(*build_email(drops, flight_drops, sender.footer))]
+            print(f"\nSending email: {messages[0].subject}")
+        sender.send_all(messages)
 
-        # 4. Build and send email
-        subject, body = build_email(drops)
-        print(f"\nSending email: {subject}")
-        send_email(subject, body)
-
-    # 5. Save current prices for tomorrow
-    save_current_prices(current_prices)
     print("\nDone!")
 
 
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+dateparse.py — Cached date/time parsing for the scrapers and adapters.
+
+Airline sites report dates and times in a handful of formats ("October 22,
+2026", "03/08/2026", "2026-03-06 16:00:00", "07:30AM"), and a run only sees
+a few hundred distinct strings among tens of thousands of flights. The old
+parsers tried each strptime format in turn for every flight, paying for a
+ValueError on every miss. A Formats parser instead:
+
+  - precompiles each format into a regex, so a format that can't match is
+    rejected without calling strptime (or raising)
+  - remembers which format matched last and tries it first; it is accepted
+    only if no earlier format's regex also matches, so the result is always
+    the one the formats' order gives
+  - memoizes results per string (LRU)
+
+The Formats instances below are the ones the scrapers use, one per source,
+so each remembers its own last format. bench_dateparse.py times them
+against the old per-flight loops.
+"""
+
+import functools
+import re
+from datetime import datetime
+
+# Regex for each strptime directive used here. A superset of what strptime
+# accepts (strptime still does the parsing), so a regex miss is a sure miss.
+_DIRECTIVES = {
+    "Y": r"\d{4}", "m": r"\s?\d{1,2}", "d": r"\s?\d{1,2}",
+    "H": r"\s?\d{1,2}", "I": r"\s?\d{1,2}", "M": r"\d{1,2}", "S": r"\d{1,2}",
+    "B": r"[^\W\d_]+", "b": r"[^\W\d_]+", "A": r"[^\W\d_]+", "a": r"[^\W\d_]+",
+    "p": r"[ap]m",
+}
+_ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_CLOCK_RE = re.compile(r"(\d{1,2}:\d{2})\s*(AM|PM)", re.I)
+
+
+def _format_regex(fmt: str) -> re.Pattern:
+    parts = []
+    for i, piece in enumerate(re.split(r"%(.)", fmt)):
+        if i % 2:
+            parts.append(_DIRECTIVES[piece])
+        else:   # literal text; strptime lets whitespace match any run of it
+            parts.append(r"\s+".join(map(re.escape, re.split(r"\s+", piece))))
+    return re.compile("".join(parts) + r"$", re.I)
+
+
+class Formats:
+    """strptime with a list of formats, tried in order (first match wins)."""
+
+    def __init__(self, formats: list[str], cache_size: int = 4096):
+        self.formats = list(formats)
+        self._regexes = [_format_regex(fmt) for fmt in self.formats]
+        self._last = 0
+        self.parse = functools.lru_cache(maxsize=cache_size)(self._parse)
+
+    def _parse(self, text: str) -> datetime | None:
+        if not isinstance(text, str):
+            return None
+        text = text.strip()
+        last, tried = self._last, -1
+        # The last format first, unless an earlier one could claim the string
+        if self._regexes[last].match(text) and not any(
+                rx.match(text) for rx in self._regexes[:last]):
+            try:
+                return datetime.strptime(text, self.formats[last])
+            except ValueError:
+                tried = last
+        for i, (fmt, rx) in enumerate(zip(self.formats, self._regexes)):
+            if i == tried or not rx.match(text):
+                continue
+            try:
+                parsed = datetime.strptime(text, fmt)
+            except ValueError:
+                continue
+            self._last = i
+            return parsed
+        return None
+
+    def iso(self, text: str) -> str | None:
+        """text as YYYY-MM-DD, or None if no format matches."""
+        parsed = self.parse(text)
+        return parsed.strftime("%Y-%m-%d") if parsed else None
+
+
+def twelve_hour(dt: datetime) -> str:
+    """datetime -> "4:00 PM"."""
+    return f"{dt.hour % 12 or 12}:{dt.minute:02d} {'AM' if dt.hour < 12 else 'PM'}"
+
+
+@functools.lru_cache(maxsize=4096)
+def iso_date(text: str) -> str:
+    """
+    Any date format the adapters see -> YYYY-MM-DD; ISO strings pass
+    through, and text no format matches is returned stripped.
+    """
+    if not text:
+        return ""
+    text = text.strip()
+    if _ISO_DATE_RE.match(text):
+        return text
+    return RECORD_DATES.iso(text) or text
+
+
+@functools.lru_cache(maxsize=4096)
+def clock(text: str) -> str:
+    """A clock time as "7:30 AM" ("07:30am", "7:30 pm" ...); other text unchanged."""
+    m = _CLOCK_RE.match(text.replace(" ", ""))
+    return f"{m.group(1)} {m.group(2).upper()}" if m else text
+
+
+# ── Per-source formats ────────────────────────────────────────────────
+
+# Dates in scraper output, normalized by flight_record's adapters
+RECORD_DATES = Formats(["%B %d, %Y", "%b %d, %Y", "%d %B %Y", "%d %b %Y", "%m/%d/%Y"])
+# BARK Air product pages: "Saturday, March 8, 2026", "Mar 8, 2026"
+BARK_DATES = Formats(["%A, %B %d, %Y", "%B %d, %Y", "%b %d, %Y", "%m/%d/%Y"])
+BARK_TAKEOFF = Formats(["%I:%M %p", "%I:%M%p"])
+# K9 Jets product attributes
+K9JETS_DATES = Formats(["%m/%d/%Y", "%d/%m/%Y", "%Y-%m-%d", "%B %d, %Y", "%B %d %Y"])
+# Aero API timestamps: "2026-03-06 16:00:00"
+AERO_TIMES = Formats(["%Y-%m-%d %H:%M:%S"])
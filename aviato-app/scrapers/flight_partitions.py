@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+flight_partitions.py — Writes the flight store as per-route, per-month JSON
+partitions for lazy loading.
+
+flights.ts bundles every airline, route and date into one module, so anything
+that imports it (/api/search) pays for all of it. The partitions split the
+same flights by route and calendar month:
+
+    app/data/partitions/manifest.json
+    app/data/partitions/BUR-LAS/2026-10.json
+    app/data/partitions/BUR-LAS/undated.json     # flights without a date
+
+manifest.json lists, per route, its partitions with a flight count and a
+content hash:
+    {"version": 1, "routes": {"BUR-LAS": {"2026-10": {"count": 34, "hash": "..."}}}}
+
+A search reads the manifest, then only the partitions of the routes (and, if
+it has a date, the month) it needs — see app/data/partitions.ts. Within a
+partition flights keep their flights.ts order. As in the FLIGHTS object
+literal, a route key that appears twice is taken from its last array.
+
+Only partitions whose hash changed are rewritten, and partitions that no
+longer exist are removed, so a run touches (and git sees) just the changes.
+
+Run from the scrapers/ directory:
+    python flight_partitions.py      # regenerate from app/data/flights_store.json
+"""
+
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+import flight_store
+import ts_reader
+
+PARTITIONS_DIR = flight_store.DATA_DIR / "partitions"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+UNDATED = "undated"
+
+
+def _month(entry: dict) -> str:
+    date = entry.get("date") or ""
+    return date[:7] if len(date) >= 7 else UNDATED
+
+
+def partition_store(store: dict) -> dict[str, dict[str, list[dict]]]:
+    """
+    {route_key: {month: [entry, ...]}}. Raw (hand-formatted) entries are
+    parsed (ts_reader.stored_entries), so the partitions hold every flight
+    flights.ts does.
+    """
+    last: dict[str, list[dict]] = {}
+    for block in store["flights"]:
+        if "route" in block:
+            last[block["route"]] = block["entries"]
+
+    routes: dict[str, dict[str, list[dict]]] = {}
+    for route_key, entries in last.items():
+        for e in ts_reader.stored_entries(entries):
+            routes.setdefault(route_key, {}).setdefault(_month(e), []).append(e)
+    return routes
+
+
+def _dump(entries: list[dict]) -> str:
+    return json.dumps(entries, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+
+def load_manifest(out_dir: Path = PARTITIONS_DIR) -> dict:
+    try:
+        with open(Path(out_dir) / MANIFEST_NAME) as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"version": MANIFEST_VERSION, "routes": {}}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {"version": MANIFEST_VERSION, "routes": {}}
+    return manifest
+
+
+def _write(path: Path, text: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(f"{path}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def write_partitions(store: dict, out_dir: Path = PARTITIONS_DIR) -> tuple[int, int]:
+    """
+    Bring out_dir in line with the store. Returns (written, removed)
+    partition counts; (0, 0) means nothing on disk changed.
+    """
+    out_dir = Path(out_dir)
+    old = load_manifest(out_dir)["routes"]
+    routes = partition_store(store)
+
+    new: dict[str, dict[str, dict]] = {}
+    written = removed = 0
+    for route_key in sorted(routes):
+        new[route_key] = {}
+        for month in sorted(routes[route_key]):
+            entries = routes[route_key][month]
+            text = _dump(entries)
+            info = {"count": len(entries), "hash": _hash(text)}
+            new[route_key][month] = info
+            path = out_dir / route_key / f"{month}.json"
+            if old.get(route_key, {}).get(month) != info or not path.exists():
+                _write(path, text)
+                written += 1
+
+    for route_key, months in old.items():
+        for month in months:
+            if month not in new.get(route_key, {}):
+                (out_dir / route_key / f"{month}.json").unlink(missing_ok=True)
+                removed += 1
+        route_dir = out_dir / route_key
+        if route_key not in new and route_dir.is_dir() and not any(route_dir.iterdir()):
+            route_dir.rmdir()
+
+    if written or removed or old != new:
+        lines = [f'{{"version": {MANIFEST_VERSION}, "routes": {{']
+        for i, route_key in enumerate(sorted(new)):
+            sep = "," if i < len(new) - 1 else ""
+            lines.append(f"  {json.dumps(route_key)}: {json.dumps(new[route_key])}{sep}")
+        lines.append("}}")
+        _write(out_dir / MANIFEST_NAME, "\n".join(lines) + "\n")
+    return written, removed
+
+
+def main():
+    store = flight_store.load_store()
+    if store is None:
+        sys.exit(f"{flight_store.STORE_PATH} not found — run update_flights.py first")
+    written, removed = write_partitions(store)
+    print(f"{PARTITIONS_DIR}: {written} partitions written, {removed} removed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+flight_record.py — The one flight type every airline's scraped data is
+normalized into.
+
+Each scraper writes its own flight schema (Tradewind price_numeric/date_iso,
+BARK takeoff/string price/tickets_remaining, Aero and Slate
+duration_minutes/available_seats, K9 Jets seats/booking_url, ...). The
+per-airline adapters below turn one scraper's flight list into FlightRecords
+once, as the scraper output is read, so update_flights.py works on a single
+compact type with a single converter (to_entry). Airline presentation
+config — aircraft, amenities, booking link, default seats, fixed durations —
+lives here next to the adapters that apply it.
+
+FlightRecord uses __slots__: no per-instance __dict__, which roughly halves
+per-record memory against the raw JSON dicts at 100k+ flights. Amenity lists
+are shared per airline, not copied.
+
+Adding an airline: write an adapter (raw flight dicts -> records) and
+register it in ADAPTERS with its id prefix.
+"""
+
+import functools
+import hashlib
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterable
+
+import airports
+import dateparse
+
+
+@dataclass(slots=True)
+class FlightRecord:
+    airline: str
+    origin: str
+    dest: str
+    date: str            # ISO YYYY-MM-DD, "" if unknown
+    dep: str             # "7:00 AM"
+    arr: str
+    dur: str             # "1h 30m"
+    price: int | float
+    seats: int
+    craft: str
+    link: str
+    amen: list[str]
+    flight_no: str = ""
+
+    @property
+    def route_key(self) -> str:
+        return f"{self.origin}-{self.dest}"
+
+
+# ── Airline config ────────────────────────────────────────────────────
+JSX_CRAFT = "ERJ-135"
+JSX_SEATS_DEFAULT = 2
+JSX_AMEN = ["WiFi", "Snacks"]
+JSX_LINK = "jsx.com"
+
+TRADEWIND_CRAFT = "Pilatus PC-12"
+TRADEWIND_SEATS = 6
+TRADEWIND_AMEN = ["WiFi", "Snacks"]
+TRADEWIND_LINK = "flytradewind.com"
+
+AERO_CRAFT = "ERJ-135"
+AERO_AMEN = ["WiFi", "Gourmet Catering", "Champagne"]
+AERO_LINK = "aero.com"
+
+SLATE_CRAFT = "CRJ-200"
+SLATE_AMEN = ["WiFi", "Catering", "Champagne"]
+SLATE_LINK = "flyslate.com"
+
+BARK_CRAFT = "Bombardier Challenger 601"
+BARK_AMEN = ["WiFi", "Gourmet Catering", "Champagne", "Calming Treats", "Vet Tech On Board"]
+BARK_LINK = "air.bark.co"
+
+K9JETS_CRAFT = "Gulfstream G-IV"
+K9JETS_AMEN = ["WiFi", "Gourmet Catering", "Champagne", "Pet Amenities", "Vet Tech On Board"]
+K9JETS_LINK = "k9jets.com"
+
+K9JETS_DURATIONS = {
+    # US Domestic
+    "TEB-VNY": "5h 30m", "VNY-TEB": "5h 00m",
+    "TEB-FXE": "2h 45m", "FXE-TEB": "2h 50m",
+    # US to UK
+    "TEB-LTN": "7h 00m", "LTN-TEB": "8h 00m",
+    "VNY-LTN": "10h 00m", "LTN-VNY": "11h 00m",
+    # US to France
+    "TEB-LBG": "7h 15m", "LBG-TEB": "8h 15m",
+    "TEB-NCE": "8h 00m", "NCE-TEB": "9h 00m",
+    # US to Iberia
+    "TEB-LIS": "7h 00m", "LIS-TEB": "8h 00m",
+    "TEB-MAD": "7h 30m", "MAD-TEB": "8h 30m",
+    "TEB-AGP": "7h 45m", "AGP-TEB": "8h 45m",
+    # US to Ireland/Germany
+    "TEB-DUB": "6h 30m", "DUB-TEB": "7h 30m",
+    "TEB-FRA": "7h 30m", "FRA-TEB": "8h 30m",
+    # US to Switzerland/Italy
+    "TEB-GVA": "7h 45m", "GVA-TEB": "8h 45m",
+    "TEB-MXP": "8h 00m", "MXP-TEB": "9h 00m",
+    # US to Dubai
+    "TEB-DWC": "12h 30m", "DWC-TEB": "14h 00m",
+    # Dubai to Europe
+    "DWC-GVA": "6h 30m", "GVA-DWC": "5h 45m",
+    "DWC-MXP": "6h 00m", "MXP-DWC": "5h 30m",
+    "DWC-LTN": "7h 00m", "LTN-DWC": "6h 00m",
+    # UK/Canada
+    "LTN-YYZ": "7h 30m", "YYZ-LTN": "6h 30m",
+    "TEB-YYZ": "1h 30m", "YYZ-TEB": "1h 30m",
+    # UK to Florida
+    "LTN-FXE": "9h 00m", "FXE-LTN": "8h 00m",
+    # US to Hawaii
+    "VNY-HNL": "5h 30m", "HNL-VNY": "5h 00m",
+    # US to Mexico (Los Cabos)
+    "VNY-SJD": "2h 30m", "SJD-VNY": "2h 45m",
+    "TEB-SJD": "5h 00m", "SJD-TEB": "5h 15m",
+    # UK to Birmingham
+    "TEB-BHX": "7h 15m", "BHX-TEB": "8h 15m",
+    # Florida to Europe
+    "FXE-LBG": "8h 45m", "LBG-FXE": "9h 45m",
+    "FXE-LIS": "7h 30m", "LIS-FXE": "8h 30m",
+    "FXE-DUB": "7h 45m", "DUB-FXE": "8h 45m",
+    "FXE-MAD": "8h 00m", "MAD-FXE": "9h 00m",
+    # London intra-Europe
+    "LTN-DUB": "1h 15m", "DUB-LTN": "1h 20m",
+    "LTN-LBG": "1h 00m", "LBG-LTN": "1h 05m",
+    # Frankfurt to Dubai
+    "FRA-DWC": "6h 30m", "DWC-FRA": "7h 00m",
+    # Via routes (LA to Europe)
+    "VNY-LBG": "12h 00m", "LBG-VNY": "13h 00m",
+    "VNY-LIS": "12h 00m", "LIS-VNY": "13h 00m",
+    "VNY-FRA": "12h 00m", "FRA-VNY": "13h 00m",
+    "VNY-GVA": "12h 00m", "GVA-VNY": "13h 00m",
+    "VNY-LIN": "12h 00m", "LIN-VNY": "13h 00m",
+    "VNY-MAD": "12h 00m", "MAD-VNY": "13h 00m",
+    # Toronto to Florida / Dubai / Paris
+    "YYZ-FXE": "3h 00m", "FXE-YYZ": "3h 10m",
+    "YYZ-DWC": "12h 00m", "DWC-YYZ": "14h 00m",
+    "YYZ-LBG": "7h 30m", "LBG-YYZ": "8h 00m",
+    # Milan Linate (LIN) routes
+    "TEB-LIN": "8h 00m", "LIN-TEB": "9h 00m",
+    "DWC-LIN": "6h 00m", "LIN-DWC": "5h 30m",
+    # Madrid routes
+    "TEB-MAD": "7h 30m", "MAD-TEB": "8h 30m",
+    "DWC-MAD": "7h 30m", "MAD-DWC": "7h 00m",
+    # London Stansted (STN) routes
+    "STN-DWC": "7h 00m", "DWC-STN": "6h 00m",
+    "STN-AGP": "2h 30m", "AGP-STN": "2h 30m",
+    "STN-NCE": "2h 00m", "NCE-STN": "2h 00m",
+    # London to Vancouver
+    "LTN-YVR": "9h 30m", "YVR-LTN": "9h 00m",
+    # London to Miami Opa-locka
+    "LTN-OPF": "9h 00m", "OPF-LTN": "8h 00m",
+    # Goose Bay
+    "YYR-LTN": "5h 30m", "LTN-YYR": "6h 00m",
+}
+
+BARK_DURATIONS = {
+    "HPN-VNY": "5h 30m", "VNY-HPN": "5h 30m",
+    "HPN-SJC": "5h 45m", "SJC-HPN": "5h 45m",
+    "VNY-KOA": "5h 30m", "KOA-VNY": "5h 30m",
+    "SEA-HPN": "5h 15m", "HPN-SEA": "5h 45m",
+    "HPN-LTN": "7h 30m", "LTN-HPN": "8h 00m",
+    "HPN-LBG": "7h 45m", "LBG-HPN": "8h 15m",
+    "HPN-MAD": "8h 00m", "MAD-HPN": "8h 30m",
+    "HPN-LIS": "7h 30m", "LIS-HPN": "8h 00m",
+    "HPN-BER": "8h 30m", "BER-HPN": "9h 00m",
+    "HPN-DUB": "7h 00m", "DUB-HPN": "7h 30m",
+    "HPN-ATH": "10h 00m", "ATH-HPN": "10h 30m",
+    "HPN-ARN": "8h 30m", "ARN-HPN": "9h 00m",
+    "VNY-NRT": "11h 30m", "NRT-VNY": "10h 00m",
+}
+
+
+# ── Shared helpers ────────────────────────────────────────────────────
+
+def _calc_duration(dep_iso: str, arr_iso: str) -> str:
+    """Calculate duration string from ISO departure and arrival times."""
+    if not dep_iso or not arr_iso:
+        return "1h 30m"
+    try:
+        dep_dt = datetime.fromisoformat(dep_iso)
+        arr_dt = datetime.fromisoformat(arr_iso)
+        diff = arr_dt - dep_dt
+        total_min = int(diff.total_seconds() / 60)
+        if total_min <= 0:
+            return "1h 30m"
+        hours = total_min // 60
+        mins = total_min % 60
+        return f"{hours}h {mins:02d}m"
+    except (ValueError, TypeError):
+        return "1h 30m"
+
+
+def _minutes_to_dur(dur_min, default: str) -> str:
+    if dur_min and dur_min > 0:
+        return f"{dur_min // 60}h {dur_min % 60:02d}m"
+    return default
+
+
+_CLOCK_RE = re.compile(r'(\d{1,2}):(\d{2})\s*(AM|PM)', re.IGNORECASE)
+_DUR_RE = re.compile(r'(\d+)h\s*(\d+)m')
+
+
+@functools.lru_cache(maxsize=None)
+def _calc_arrival(takeoff: str, dur: str, origin: str, dest: str, date: str = "") -> str:
+    """
+    Arrival clock time from takeoff + duration, shifted by the difference
+    between the two airports' time zones on date (see airports.py).
+    """
+    m = _CLOCK_RE.match(takeoff)
+    if not m:
+        return takeoff
+    h, mn, ampm = int(m.group(1)), int(m.group(2)), m.group(3).upper()
+    if ampm == 'PM' and h != 12:
+        h += 12
+    if ampm == 'AM' and h == 12:
+        h = 0
+
+    dm = _DUR_RE.match(dur)
+    if not dm:
+        return takeoff
+    dh, dmn = int(dm.group(1)), int(dm.group(2))
+
+    total_min = h * 60 + mn + dh * 60 + dmn + airports.offset_minutes(origin, dest, date)
+    arr_h = (total_min // 60) % 24
+    arr_m = total_min % 60
+    arr_ampm = 'AM' if arr_h < 12 else 'PM'
+    arr_h12 = arr_h % 12 or 12
+    return f"{arr_h12}:{arr_m:02d} {arr_ampm}"
+
+
+def _dollars(price) -> int:
+    """'$6,725' / '6725.0' / 6725 -> 6725."""
+    return int(float(str(price).replace("$", "").replace(",", "")))
+
+
+# ── Adapters: scraper JSON flights -> FlightRecord ────────────────────
+
+def from_jsx(flights: Iterable[dict]) -> list[FlightRecord]:
+    """
+    JSX lists one row per fare; keep the cheapest fare per flight (route,
+    date, departure). Only the winning records are kept, not the raw rows.
+    """
+    best: dict[tuple, tuple] = {}   # combo -> (raw price, record)
+    for fl in flights:
+        combo = (fl.get("origin_code", ""), fl.get("destination_code", ""),
+                 fl.get("date", ""), fl.get("departure_time", ""))
+        price = fl.get("price", 9999)
+        if combo in best and not price < best[combo][0]:
+            continue
+        best[combo] = (price, FlightRecord(
+            airline="JSX", origin=fl.get("origin_code", ""), dest=fl.get("destination_code", ""),
+            date=fl.get("date") or "", dep=fl.get("departure_time", ""),
+            arr=fl.get("arrival_time", ""),
+            dur=_calc_duration(fl.get("departure_iso", ""), fl.get("arrival_iso", "")),
+            price=round(fl.get("price", 0)),
+            seats=fl.get("seats_available", JSX_SEATS_DEFAULT) or JSX_SEATS_DEFAULT,
+            craft=JSX_CRAFT, link=JSX_LINK, amen=JSX_AMEN,
+            flight_no=fl.get("flight_number", ""),
+        ))
+    return [rec for _, rec in best.values()]
+
+
+def from_aero(flights: Iterable[dict]) -> list[FlightRecord]:
+    return [
+        FlightRecord(
+            airline="Aero", origin=fl.get("origin_code", ""), dest=fl.get("destination_code", ""),
+            date=fl.get("date") or "", dep=fl.get("departure_time", ""),
+            arr=fl.get("arrival_time", ""),
+            dur=_minutes_to_dur(fl.get("duration_minutes", 0), "1h 30m"),
+            price=round(fl.get("price", 0)), seats=fl.get("available_seats", 4) or 4,
+            craft=AERO_CRAFT, link=AERO_LINK, amen=AERO_AMEN,
+            flight_no=fl.get("flight_number", ""),
+        )
+        for fl in flights
+    ]
+
+
+def from_tradewind(flights: Iterable[dict]) -> list[FlightRecord]:
+    records = []
+    for fl in flights:
+        price = fl.get("price_numeric", 0)
+        records.append(FlightRecord(
+            airline="Tradewind", origin=fl.get("origin_code", ""), dest=fl.get("destination_code", ""),
+            date=fl.get("date_iso") or "", dep=fl.get("departure_time", ""),
+            arr=fl.get("arrival_time", ""), dur=fl.get("duration", "1h 05m"),
+            price=int(price) if price == int(price) else price, seats=TRADEWIND_SEATS,
+            craft=TRADEWIND_CRAFT, link=TRADEWIND_LINK, amen=TRADEWIND_AMEN,
+            flight_no=fl.get("flight_number", ""),
+        ))
+    return records
+
+
+def from_bark(flights: Iterable[dict]) -> list[FlightRecord]:
+    records = []
+    for fl in flights:
+        if not fl.get("available", True):
+            continue
+        fr, to = fl.get("origin_code", ""), fl.get("destination_code", "")
+        dur = BARK_DURATIONS.get(f"{fr}-{to}", "5h 00m")
+        takeoff = fl.get("takeoff", "9:00 AM")
+        date = dateparse.iso_date(fl.get("date", ""))
+        records.append(FlightRecord(
+            airline="BARK Air", origin=fr, dest=to, date=date, dep=takeoff,
+            arr=_calc_arrival(takeoff, dur, fr, to, date), dur=dur,
+            price=_dollars(fl.get("price", "$6725")), seats=fl.get("tickets_remaining", 5) or 5,
+            craft=BARK_CRAFT, link=BARK_LINK, amen=BARK_AMEN,
+        ))
+    return records
+
+
+def from_slate(flights: Iterable[dict]) -> list[FlightRecord]:
+    return [
+        FlightRecord(
+            airline="Slate", origin=fl.get("origin_code", ""), dest=fl.get("destination_code", ""),
+            date=fl.get("date") or "", dep=fl.get("departure_time", ""),
+            arr=fl.get("arrival_time", ""),
+            dur=_minutes_to_dur(fl.get("duration_minutes", 0), "3h 00m"),
+            price=round(fl.get("price", 0)), seats=fl.get("available_seats", 10) or 10,
+            craft=SLATE_CRAFT, link=SLATE_LINK, amen=SLATE_AMEN,
+            flight_no=fl.get("flight_number", ""),
+        )
+        for fl in flights
+    ]
+
+
+def from_k9jets(flights: Iterable[dict]) -> list[FlightRecord]:
+    records = []
+    for fl in flights:
+        if not fl.get("available", True):
+            continue
+        fr, to = fl.get("origin_code", ""), fl.get("destination_code", "")
+        dur = K9JETS_DURATIONS.get(f"{fr}-{to}", "7h 00m")
+        dep = fl.get("departure_time", "9:00 PM")
+        price = fl.get("price", 8950)
+        date = fl.get("date") or ""
+        if date:
+            date = dateparse.iso_date(date)
+        # Actual aircraft / per-flight booking URL from the API when present.
+        # Quotes in craft/link are escaped when flights.ts is rendered.
+        booking_url = fl.get("booking_url", "").strip()
+        records.append(FlightRecord(
+            airline="K9 Jets", origin=fr, dest=to, date=date, dep=dep,
+            arr=fl.get("arrival_time", "") or _calc_arrival(dep, dur, fr, to, date), dur=dur,
+            price=_dollars(price) if isinstance(price, str) else price,
+            seats=fl.get("seats", 10) or 10,
+            craft=fl.get("aircraft", "").strip() or K9JETS_CRAFT,
+            link=booking_url or f"https://www.{K9JETS_LINK}/routes/", amen=K9JETS_AMEN,
+            flight_no=fl.get("flight_number", ""),
+        ))
+    return records
+
+
+@dataclass(frozen=True)
+class Adapter:
+    normalize: Callable[[Iterable[dict]], list[FlightRecord]]
+    id_prefix: str          # formatted with lowercase fr/to
+
+
+ADAPTERS: dict[str, Adapter] = {
+    "JSX": Adapter(from_jsx, "jsx-{fr}-{to}"),
+    "Aero": Adapter(from_aero, "aero-{fr}-{to}"),
+    "Tradewind": Adapter(from_tradewind, "tw-{fr}-{to}"),
+    "BARK Air": Adapter(from_bark, "bark-{fr}-{to}"),
+    "Slate": Adapter(from_slate, "slate-{fr}{to}"),
+    "K9 Jets": Adapter(from_k9jets, "k9jets-{fr}-{to}"),
+}
+
+
+# ── Flight store entries ──────────────────────────────────────────────
+
+def _flight_id(prefix: str, seen: dict[str, int], date: str, dep: str, flight_no: str = "") -> str:
+    """
+    Stable flight id: prefix (airline + route) plus a short hash of date,
+    departure time and flight number, so ids don't shift when another flight
+    on the route appears or disappears. Repeats of the same flight within a
+    route get -2, -3, ... in scrape order; seen tracks them per route.
+    """
+    digest = hashlib.sha1(f"{prefix}|{date}|{dep}|{flight_no}".encode()).hexdigest()[:8]
+    seen[digest] = seen.get(digest, 0) + 1
+    n = seen[digest]
+    return f"{prefix}-{digest}" if n == 1 else f"{prefix}-{digest}-{n}"
+
+
+def to_entries(route_key: str, records: list[FlightRecord]) -> list[dict]:
+    """One route's records (all one airline) -> flight store entries."""
+    if not records:
+        return []
+    fr, to = route_key.split("-")
+    prefix = ADAPTERS[records[0].airline].id_prefix.format(fr=fr.lower(), to=to.lower())
+    seen: dict[str, int] = {}
+    return [
+        {
+            "id": _flight_id(prefix, seen, r.date, r.dep, r.flight_no), "airline": r.airline,
+            "dep": r.dep, "arr": r.arr, "dc": fr, "ac": to, "dur": r.dur, "price": r.price,
+            "craft": r.craft, "seats": r.seats, "amen": r.amen, "link": r.link, "date": r.date,
+        }
+        for r in records
+    ]
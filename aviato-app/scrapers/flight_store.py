@@ -0,0 +1,576 @@
+#!/usr/bin/env python3
+"""
+flight_store.py — Canonical flight store behind app/data/flights.ts.
+
+app/data/flights_store.json holds the FLIGHTS object as data: the route
+arrays in file order, one dict per flight. update_flights.py edits the store
+and renders flights.ts from it; check_price_drops.py reads prices from it.
+Neither has to parse TypeScript.
+
+Only the body of `export const FLIGHTS ... = {` ... `};` is generated.
+Everything else in flights.ts (imports, SEASONAL_DATES, helper functions)
+stays hand-maintained and is copied through unchanged on every render.
+
+The store is bootstrapped once from the current flights.ts. Lines that don't
+round-trip exactly through the renderer (comments, hand-formatted entries)
+are kept verbatim as {"raw": line}, so the first render is byte-identical.
+
+Store layout:
+    {"version": 1, "body_sha": "3f0c...",
+     "hashes": {"BUR-LAS": {"JSX": "9a1e...", "Aero": "07bd..."}},
+     "flights": [
+        {"raw": "  // LA area to Las Vegas"},
+        {"route": "BUR-LAS", "entries": [
+            {"id": "jsx-bur-las-1", "airline": "JSX", "dep": "7:00 AM", ...},
+            {"raw": "    { id:'x', ... } // hand-edited"}
+        ]}
+    ]}
+A route block may also carry "open"/"close" when its bracket lines are not
+the standard `  'BUR-LAS': [` / `  ],`.
+
+"hashes" records, per route and airline, a hash of the entries last applied
+from the scrapers, so an update can skip routes whose data didn't change.
+"scraped_at" (when present) records, per airline, when the output last
+applied for it was scraped, so older output is never applied over it.
+"body_sha" is the hash of the FLIGHTS body as last rendered; while flights.ts
+still matches it, a render splices in only the route arrays that changed and
+copies every other line from the existing file.
+
+Run from the scrapers/ directory:
+    python flight_store.py bootstrap     # (re)build the store from flights.ts
+    python flight_store.py render        # write flights.ts from the store
+"""
+
+import functools
+import hashlib
+import json
+import operator
+import os
+import re
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+import jsonio
+
+try:
+    import fcntl
+except ImportError:     # Windows: no advisory locks, updates must not overlap
+    fcntl = None
+
+DATA_DIR = Path(__file__).parent.parent / "app" / "data"
+FLIGHTS_TS = DATA_DIR / "flights.ts"
+STORE_PATH = DATA_DIR / "flights_store.json"
+
+STORE_VERSION = 1
+
+# A rendered entry, field by field: "str" is a quoted string, "num" a bare
+# number, "list" an array of strings; "date" (last) is optional. render_entry,
+# parse_entry and ts_reader's fast path are all built from this.
+ENTRY_LAYOUT = (("id", "str"), ("airline", "str"), ("dep", "str"), ("arr", "str"),
+                ("dc", "str"), ("ac", "str"), ("dur", "str"), ("price", "num"),
+                ("craft", "str"), ("seats", "num"), ("amen", "list"), ("link", "str"),
+                ("date", "str"))
+ENTRY_FIELDS = tuple(f for f, _ in ENTRY_LAYOUT)
+_STR_FIELDS = tuple(f for f, kind in ENTRY_LAYOUT if kind == "str")
+_LIST_AT = ENTRY_FIELDS.index("amen")
+
+_FLIGHTS_START = "export const FLIGHTS"
+_FLIGHTS_END = "\n};"            # a line starting with };
+_ROUTE_OPEN_RE = re.compile(r"^\s+'([A-Z]+-[A-Z]+)':\s*\[")
+_AIRLINE_FIELD = "airline:'"
+
+_S = r"((?:[^'\\]|\\.)*)"  # single-quoted TS string body
+_BODY = r"[^'\\\n]*(?:\\.[^'\\\n]*)*"      # the same, without a group
+_AMEN_ITEM_RE = re.compile(rf"'{_S}'")
+_RAW_FIELD_RE = {f: re.compile(rf"\b{f}:'{_S}'") for f in ("date", "dep", "airline", "id")}
+_TIME_RE = re.compile(r"^\s*(\d{1,2}):(\d{2})\s*([AP]M)\s*$", re.I)
+
+
+# ── Entries ───────────────────────────────────────────────────────────
+
+def _ts_str(value: str) -> str:
+    return str(value).replace("'", "\\'")
+
+
+def _unescape(value: str) -> str:
+    return value.replace("\\'", "'")
+
+
+def _number(text: str) -> int | float:
+    return float(text) if "." in text else int(text)
+
+
+def _line_format(layout: tuple) -> str:
+    """%-format of an entry line with these fields (values in layout order)."""
+    fields = (f"{f}:'%s'" if kind == "str" else f"{f}:[%s]" if kind == "list" else f"{f}:%s"
+              for f, kind in layout)
+    return "    { " + ", ".join(fields) + " },"
+
+
+_LINE_FORMATS = {True: _line_format(ENTRY_LAYOUT), False: _line_format(ENTRY_LAYOUT[:-1])}
+_LINE_VALUES = {True: operator.itemgetter(*ENTRY_FIELDS), False: operator.itemgetter(*ENTRY_FIELDS[:-1])}
+
+
+def entry_pattern(capture: frozenset | tuple = ENTRY_FIELDS) -> str:
+    """
+    Regex source matching one entry line exactly as render_entry writes it,
+    with a named group for each field in capture (an array's group is its
+    items, still quoted).
+    """
+    parts = []
+    for f, kind in ENTRY_LAYOUT:
+        value = {"str": f"'{_BODY}'", "num": r"-?[0-9.]+",
+                 "list": rf"\[(?:'{_BODY}'(?:,'{_BODY}')*)?\]"}[kind]
+        if f in capture:
+            value = {"str": f"'(?P<{f}>{_BODY})'", "num": rf"(?P<{f}>-?[0-9.]+)",
+                     "list": rf"\[(?P<{f}>(?:'{_BODY}'(?:,'{_BODY}')*)?)\]"}[kind]
+        parts.append(f"{f}:{value}")
+    required, optional = ", ".join(parts[:-1]), parts[-1]
+    return rf"    \{{ {required}(?:, {optional})? \}},$"
+
+
+_ENTRY_RE = re.compile(entry_pattern())
+
+
+def render_entry(e: dict) -> str:
+    """One flight dict -> its flights.ts line."""
+    if "raw" in e:
+        return e["raw"]
+    # Values almost never hold a quote: render as is, and escape only if the
+    # line ends up with more quotes than its own
+    line = _entry_line(e)
+    if line.count("'") != 2 * (len(_STR_FIELDS) - ("date" not in e) + len(e["amen"])):
+        line = _entry_line({**e, **{f: _ts_str(e[f]) for f in _STR_FIELDS if f in e},
+                            "amen": [_ts_str(a) for a in e["amen"]]})
+    return line
+
+
+def _entry_line(e: dict) -> str:
+    dated = "date" in e
+    values = _LINE_VALUES[dated](e)
+    amen = ",".join([f"'{a}'" for a in values[_LIST_AT]])
+    return _LINE_FORMATS[dated] % (*values[:_LIST_AT], amen, *values[_LIST_AT + 1:])
+
+
+def parse_entry(line: str) -> dict:
+    """flights.ts line -> flight dict, or {"raw": line} if it doesn't round-trip."""
+    m = _ENTRY_RE.match(line)
+    if m:
+        e = {}
+        for f, kind in ENTRY_LAYOUT:
+            value = m.group(f)
+            if value is None:
+                continue    # no date
+            if kind == "str":
+                e[f] = _unescape(value)
+            elif kind == "num":
+                e[f] = _number(value)
+            else:
+                e[f] = [_unescape(a) for a in _AMEN_ITEM_RE.findall(value)]
+        if render_entry(e) == line:
+            return e
+    return {"raw": line}
+
+
+def entry_airlines(e: dict) -> list[str]:
+    """Airline(s) of a stored entry; raw lines are scanned for airline:'...'."""
+    if "raw" not in e:
+        return [e["airline"]]
+    raw = e["raw"]
+    airlines = []
+    start = raw.find(_AIRLINE_FIELD)
+    while start >= 0:
+        start += len(_AIRLINE_FIELD)
+        end = raw.find("'", start)
+        if end < 0:
+            break
+        airlines.append(raw[start:end])
+        start = raw.find(_AIRLINE_FIELD, start)
+    return airlines
+
+
+@functools.lru_cache(maxsize=4096)
+def dep_minutes(dep: str) -> int:
+    """'7:05 PM' -> 1145; unparseable times sort last."""
+    m = _TIME_RE.match(dep or "")
+    if not m:
+        return 24 * 60
+    hour = int(m.group(1)) % 12 + (12 if m.group(3).upper() == "PM" else 0)
+    return hour * 60 + int(m.group(2))
+
+
+def _field(e: dict, name: str) -> str:
+    if "raw" not in e:
+        value = e.get(name)
+        return value if isinstance(value, str) else str(value or "")
+    m = _RAW_FIELD_RE[name].search(e["raw"])
+    return _unescape(m.group(1)) if m else ""
+
+
+def entry_date(e: dict) -> str:
+    """ISO date of a stored entry ('' if it has none)."""
+    return _field(e, "date")
+
+
+def entry_sort_key(e: dict) -> tuple:
+    """(date, departure minute, airline, id); undated entries sort first."""
+    if "raw" not in e:
+        return (e.get("date", ""), dep_minutes(e["dep"]), e["airline"], e["id"])
+    return (_field(e, "date"), dep_minutes(_field(e, "dep")), _field(e, "airline"), _field(e, "id"))
+
+
+def iter_entries(store: dict) -> Iterator[dict]:
+    """Every entry of every route array, in file order."""
+    for block in store["flights"]:
+        yield from block.get("entries", ())
+
+
+# ── flights.ts template ───────────────────────────────────────────────
+
+def split_template(content: str) -> tuple[str, str, str]:
+    """
+    Split flights.ts into (head, body, tail): head ends with the
+    `export const FLIGHTS` line, tail starts at the `};` closing it.
+    """
+    start = content.find(_FLIGHTS_START)
+    if start < 0:
+        raise ValueError("flights.ts has no 'export const FLIGHTS'")
+    body_start = content.find("\n", start) + 1
+    if body_start == 0:
+        raise ValueError("flights.ts ends on the 'export const FLIGHTS' line")
+    end = content.find(_FLIGHTS_END, body_start - 1) + 1
+    if end == 0:
+        raise ValueError("FLIGHTS object in flights.ts is never closed with '};'")
+    return content[:body_start], content[body_start:end], content[end:]
+
+
+def _array_end(lines: list[str], i: int) -> int:
+    """Index just past the array whose opening line is lines[i - 1]."""
+    bracket_depth = 1
+    while i < len(lines) and bracket_depth > 0:
+        bracket_depth += lines[i].count("[") - lines[i].count("]")
+        i += 1
+    return i
+
+
+def bootstrap(content: str) -> dict:
+    """Build a store from flights.ts text (one-time migration)."""
+    _, body, _ = split_template(content)
+    lines = body.split("\n")[:-1] if body else []
+    blocks: list[dict] = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        m = _ROUTE_OPEN_RE.match(line)
+        if m is None:
+            blocks.append({"raw": line})
+            i += 1
+            continue
+        route_key = m.group(1)
+        end = _array_end(lines, i + 1)
+        block = {"route": route_key,
+                 "entries": [parse_entry(entry) for entry in lines[i + 1:end - 1]]}
+        close = lines[end - 1] if end - 1 > i else None
+        if line != _open_line(route_key):
+            block["open"] = line
+        if close != "  ],":
+            block["close"] = close
+        blocks.append(block)
+        i = end
+    return {"version": STORE_VERSION, "body_sha": body_sha(body), "hashes": {}, "flights": blocks}
+
+
+def _open_line(route_key: str) -> str:
+    return f"  '{route_key}': ["
+
+
+def render_body(store: dict) -> Iterator[str]:
+    """Lines of the FLIGHTS body, each ending in a newline."""
+    for block in store["flights"]:
+        if "route" not in block:
+            yield block["raw"] + "\n"
+            continue
+        yield block.get("open", _open_line(block["route"])) + "\n"
+        for e in block["entries"]:
+            yield render_entry(e) + "\n"
+        close = block.get("close", "  ],")
+        if close is not None:
+            yield close + "\n"
+
+
+def render_text(store: dict, template: str) -> str:
+    """flights.ts text for store, using template for everything outside FLIGHTS."""
+    head, _, tail = split_template(template)
+    return head + "".join(render_body(store)) + tail
+
+
+def body_sha(body: str) -> str:
+    return hashlib.sha1(body.encode()).hexdigest()[:16]
+
+
+def _block_lines(block: dict) -> int:
+    """Number of flights.ts lines a stored block renders to."""
+    if "route" not in block:
+        return 1
+    return 1 + len(block["entries"]) + (block.get("close", "") is not None)
+
+
+def _spliced_body(store: dict, previous: dict, old_lines: list[str]) -> Iterator[str]:
+    """
+    render_body(store), but blocks carried over unchanged from previous are
+    copied from old_lines (the body previous was rendered to) instead.
+    """
+    spans: dict[int, tuple[int, int]] = {}
+    pos = 0
+    for block in previous["flights"]:
+        n = _block_lines(block)
+        spans[id(block)] = (pos, pos + n)
+        pos += n
+    for block in store["flights"]:
+        span = spans.get(id(block))
+        if span is None:
+            yield from render_body({"flights": [block]})
+        else:
+            for line in old_lines[span[0]:span[1]]:
+                yield line + "\n"
+
+
+def render_flights_ts(store: dict, path: Path = FLIGHTS_TS, previous: dict | None = None) -> str:
+    """
+    Rewrite flights.ts from the store (streamed to a temp file, then swapped
+    in) and return the new body_sha. If previous is the store flights.ts was
+    last rendered from, and the file still matches it, unchanged route arrays
+    are copied from the file rather than re-rendered.
+    """
+    head, body, tail = split_template(Path(path).read_text())
+    if previous is not None and previous.get("body_sha") == body_sha(body):
+        lines = _spliced_body(store, previous, body.split("\n"))
+    else:
+        lines = render_body(store)
+
+    h = hashlib.sha1()
+    tmp = Path(f"{path}.tmp")
+    with open(tmp, "w") as f:
+        f.write(head)
+        for line in lines:
+            f.write(line)
+            h.update(line.encode())
+        f.write(tail)
+    os.replace(tmp, path)
+    return h.hexdigest()[:16]
+
+
+# ── Edits ─────────────────────────────────────────────────────────────
+
+def apply_replacements(store: dict, replacements: list[tuple[str, str, list[dict]]]) -> dict:
+    """
+    Return a new store where, for each (route_key, airline, entries), the
+    route's entries of that airline are replaced. Other airlines' entries are
+    kept first, then the new entries in replacement order. Duplicate arrays
+    of a replaced route are dropped; routes without an array get one at the
+    end, in sorted order.
+    """
+    index: dict[str, list[tuple[str, list[dict]]]] = {}
+    for route_key, airline, entries in replacements:
+        index.setdefault(route_key, []).append((airline, entries))
+
+    placed: set[str] = set()
+    blocks: list[dict] = []
+    for block in store["flights"]:
+        route_key = block.get("route")
+        if route_key in placed:
+            continue  # duplicate array of a route we already rewrote
+        route_replacements = index.get(route_key) if route_key else None
+        if not route_replacements:
+            blocks.append(block)
+            continue
+        placed.add(route_key)
+        replaced = {airline for airline, _ in route_replacements}
+        entries = [e for e in block["entries"] if replaced.isdisjoint(entry_airlines(e))]
+        for _, new_entries in route_replacements:
+            entries.extend(new_entries)
+        blocks.append({**block, "entries": entries})
+
+    for route_key in sorted(rk for rk in index if rk not in placed):
+        entries = [e for _, new_entries in index[route_key] for e in new_entries]
+        print(f"  [NEW] Creating route array '{route_key}' with {len(entries)} flights")
+        blocks.append({"route": route_key, "entries": entries})
+
+    return {**store, "flights": blocks}
+
+
+def unsorted_routes(store: dict) -> list[str]:
+    """Route arrays not in entry_sort_key order."""
+    unsorted = []
+    for block in store["flights"]:
+        if "route" in block:
+            keys = [entry_sort_key(e) for e in block["entries"]]
+            if any(a > b for a, b in zip(keys, keys[1:])):
+                unsorted.append(block["route"])
+    return unsorted
+
+
+def sort_routes(store: dict) -> dict:
+    """
+    Return a store whose route arrays are in date/time order across airlines.
+    Arrays that already are keep their block object, so render_flights_ts
+    can still copy them from the existing file.
+    """
+    blocks = []
+    for block in store["flights"]:
+        if "route" in block:
+            entries = sorted(block["entries"], key=entry_sort_key)
+            if entries != block["entries"]:
+                block = {**block, "entries": entries}
+        blocks.append(block)
+    return {**store, "flights": blocks}
+
+
+# ── Change detection ──────────────────────────────────────────────────
+
+def entries_hash(entries: list[dict]) -> str:
+    """Hash of entries as they render into flights.ts."""
+    h = hashlib.sha1()
+    for e in entries:
+        h.update(render_entry(e).encode())
+        h.update(b"\n")
+    return h.hexdigest()[:16]
+
+
+def replacement_hashes(replacements: list[tuple[str, str, list[dict]]]) -> dict[str, dict[str, str]]:
+    """{route_key: {airline: entries_hash}} for a replacement set."""
+    hashes: dict[str, dict[str, str]] = {}
+    for route_key, airline, entries in replacements:
+        hashes.setdefault(route_key, {})[airline] = entries_hash(entries)
+    return hashes
+
+
+def changed_routes(store: dict, new_hashes: dict[str, dict[str, str]]) -> dict[str, list[str]]:
+    """
+    {route_key: [airline, ...]} for every route whose new entries differ from
+    the ones last applied, or that has no array in the store yet.
+    """
+    old_hashes = store.get("hashes", {})
+    present = {block["route"] for block in store["flights"] if "route" in block}
+    changed: dict[str, list[str]] = {}
+    for route_key, airlines in new_hashes.items():
+        old = old_hashes.get(route_key, {})
+        if route_key not in present:
+            changed[route_key] = list(airlines)
+            continue
+        diff = [a for a, h in airlines.items() if old.get(a) != h]
+        if diff:
+            changed[route_key] = diff
+    return changed
+
+
+def stale_airlines(store: dict, scraped_at: dict[str, str | None]) -> list[str]:
+    """
+    Airlines whose scraper output (scraped_at: {airline: ISO timestamp}) is
+    older than the output last applied to the store for them. Airlines
+    without a timestamp on either side are never stale.
+    """
+    applied = store.get("scraped_at", {})
+    return [airline for airline, ts in scraped_at.items()
+            if ts and applied.get(airline)
+            and datetime.fromisoformat(ts) < datetime.fromisoformat(applied[airline])]
+
+
+# ── Load / save ───────────────────────────────────────────────────────
+
+def load_store(path: Path = STORE_PATH) -> dict | None:
+    """The store, or None if it hasn't been bootstrapped yet."""
+    try:
+        store = jsonio.load(path)
+    except FileNotFoundError:
+        return None
+    if store.get("version") != STORE_VERSION:
+        raise ValueError(f"{path}: unsupported store version {store.get('version')!r}")
+    return store
+
+
+@contextmanager
+def store_lock(path: Path = STORE_PATH):
+    """
+    Hold an exclusive lock on <store>.lock, so concurrent updaters on this
+    machine run their read-modify-write of the store (and the files rendered
+    from it) one at a time. Without fcntl (Windows) this doesn't lock.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(f"{path}.lock", "w") as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            print(f"  [store] waiting for another update to release {Path(path).name}.lock")
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def load_or_bootstrap(path: Path = STORE_PATH, flights_ts: Path = FLIGHTS_TS) -> dict:
+    store = load_store(path)
+    if store is None:
+        print(f"  [store] {path.name} not found — bootstrapping from {flights_ts.name}")
+        store = bootstrap(Path(flights_ts).read_text())
+    return store
+
+
+def _dump(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def save_store(store: dict, path: Path = STORE_PATH):
+    """Write the store with one entry per line (readable git diffs), atomically."""
+    tmp = Path(f"{path}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(f'{{"version": {store["version"]}, "body_sha": {_dump(store.get("body_sha"))},\n')
+        f.write(' "hashes": {')
+        hashes = sorted(store.get("hashes", {}).items())
+        for hi, (route_key, airlines) in enumerate(hashes):
+            f.write(f'\n  {_dump(route_key)}: {_dump(airlines)}{"," if hi < len(hashes) - 1 else ""}')
+        f.write("\n },\n" if hashes else "},\n")
+        if "scraped_at" in store:
+            f.write(f' "scraped_at": {_dump(dict(sorted(store["scraped_at"].items())))},\n')
+        f.write(' "flights": [\n')
+        for bi, block in enumerate(store["flights"]):
+            sep = "," if bi < len(store["flights"]) - 1 else ""
+            if "route" not in block:
+                f.write(f"  {_dump(block)}{sep}\n")
+                continue
+            extra = "".join(f", {_dump(k)}: {_dump(block[k])}"
+                            for k in ("open", "close") if k in block)
+            f.write(f'  {{"route": {_dump(block["route"])}{extra}, "entries": [\n')
+            entries = block["entries"]
+            for ei, e in enumerate(entries):
+                f.write(f"    {_dump(e)}{',' if ei < len(entries) - 1 else ''}\n")
+            f.write(f"  ]}}{sep}\n")
+        f.write("]}\n")
+    os.replace(tmp, path)
+
+
+def main():
+    cmd = sys.argv[1] if len(sys.argv) > 1 else ""
+    if cmd == "bootstrap":
+        store = bootstrap(FLIGHTS_TS.read_text())
+        save_store(store)
+        print(f"Wrote {STORE_PATH} ({sum(1 for _ in iter_entries(store))} entries)")
+    elif cmd == "render":
+        store = load_store()
+        if store is None:
+            sys.exit(f"{STORE_PATH} not found — run 'python flight_store.py bootstrap' first")
+        store["body_sha"] = render_flights_ts(store)
+        save_store(store)
+        print(f"Rendered {FLIGHTS_TS}")
+    else:
+        sys.exit("usage: python flight_store.py bootstrap|render")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+http_cache.py — On-disk conditional-request cache for catalog-style sources.
+
+The K9 Jets Store API, the BARK Air products.json collection and the Slate
+reference endpoints rarely change between runs, but used to be downloaded in
+full every time. This cache stores each response body together with its
+validators (ETag / Last-Modified) and revalidates on the next run with
+If-None-Match / If-Modified-Since.
+
+On a 304 the cached body is handed back as a normal 200 response, so callers
+keep using resp.json() / resp.headers unchanged. Servers that ignore the
+validators simply answer 200 and the entry is refreshed.
+
+Usage (from a scraper):
+    from http_cache import CACHE
+    resp = CACHE.get(url, source="K9 Jets", session=HTTP, timeout=30)
+    ...
+    CACHE.report()
+"""
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import requests
+
+from http_client import fmt_bytes, request_key
+from http_replay import RECORD_ENV
+
+CACHE_DIR = Path(os.environ.get(
+    "AVIATO_HTTP_CACHE", Path(__file__).parent / ".http_cache"
+))
+
+# Response headers that describe the transfer rather than the content —
+# never replayed from the cache.
+_HOP_HEADERS = {
+    "connection", "content-encoding", "content-length", "date",
+    "keep-alive", "transfer-encoding",
+}
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0          # 304 Not Modified, served from disk
+    misses: int = 0        # full 200 download
+    bytes_saved: int = 0   # body bytes we did not have to download
+    bytes_fetched: int = 0
+
+
+class HttpCache:
+    """Conditional-request cache keyed by method + final URL + request body."""
+
+    def __init__(self, cache_dir: Path = CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.stats: dict[str, CacheStats] = {}
+        self._lock = threading.Lock()
+
+    # ── Public API ────────────────────────────────────────────────────
+
+    def get(self, url: str, source: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, source, **kwargs)
+
+    def post(self, url: str, source: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, source, **kwargs)
+
+    def request(self, method: str, url: str, source: str,
+                session=None, **kwargs) -> requests.Response:
+        """
+        Send a request with validators from the cache (if any). `session` is
+        anything with a requests-style .request() — normally the scraper's
+        HttpClient; plain requests is used when omitted.
+        Returns a requests.Response; on 304 it is rewritten into a 200 carrying
+        the cached body and headers, with resp.from_cache = True.
+        """
+        sender = session or requests
+        key = self._key(method, url, kwargs)
+        meta, body = self._load(key)
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        # While recording fixtures, fetch in full so the recording has the body
+        if meta and body is not None and not os.environ.get(RECORD_ENV):
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        resp = sender.request(method, url, headers=headers, **kwargs)
+
+        if resp.status_code == 304:
+            if body is None:
+                # Server sent 304 but our copy is gone — ask again unconditionally
+                headers.pop("If-None-Match", None)
+                headers.pop("If-Modified-Since", None)
+                resp = sender.request(method, url, headers=headers, **kwargs)
+            else:
+                self._serve_cached(resp, meta, body)
+                self._count(source, hit=True, size=len(body))
+                return resp
+
+        resp.from_cache = False
+        if resp.status_code == 200:
+            self._count(source, hit=False, size=len(resp.content))
+            self._store(key, url, resp)
+        return resp
+
+    def report(self):
+        """Print hit/miss/bytes-saved per source for this run."""
+        if not self.stats:
+            return
+        print("\n  HTTP cache:")
+        for source, st in sorted(self.stats.items()):
+            total = st.hits + st.misses
+            print(f"    {source}: {st.hits}/{total} hits, {st.misses} misses, "
+                  f"{fmt_bytes(st.bytes_saved)} saved, "
+                  f"{fmt_bytes(st.bytes_fetched)} downloaded")
+
+    # ── Internals ─────────────────────────────────────────────────────
+
+    def _key(self, method: str, url: str, kwargs: dict) -> str:
+        prepared = requests.Request(
+            method, url,
+            params=kwargs.get("params"),
+            data=kwargs.get("data"),
+            json=kwargs.get("json"),
+        ).prepare()
+        return request_key(method, prepared.url, prepared.body)
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.cache_dir / f"{key}.meta", self.cache_dir / f"{key}.body"
+
+    def _load(self, key: str) -> tuple[dict | None, bytes | None]:
+        meta_path, body_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text())
+            body = body_path.read_bytes()
+        except (OSError, ValueError):
+            return None, None
+        return meta, body
+
+    def _store(self, key: str, url: str, resp: requests.Response):
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return  # nothing to revalidate with next time
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "headers": {k: v for k, v in resp.headers.items()
+                        if k.lower() not in _HOP_HEADERS},
+        }
+        meta_path, body_path = self._paths(key)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            _atomic_write(body_path, resp.content)
+            _atomic_write(meta_path, json.dumps(meta).encode())
+        except OSError as e:
+            print(f"  [cache] could not store {url}: {e}")
+
+    def _serve_cached(self, resp: requests.Response, meta: dict, body: bytes):
+        headers = requests.structures.CaseInsensitiveDict(meta.get("headers", {}))
+        # Fresh validators from the 304 win over the stored ones
+        for name in ("ETag", "Last-Modified", "Cache-Control", "Expires"):
+            if name in resp.headers:
+                headers[name] = resp.headers[name]
+        resp.status_code = 200
+        resp.reason = "OK"
+        resp.headers = headers
+        resp._content = body
+        resp.encoding = requests.utils.get_encoding_from_headers(headers)
+        resp.from_cache = True
+
+    def _count(self, source: str, hit: bool, size: int):
+        with self._lock:
+            st = self.stats.setdefault(source, CacheStats())
+            if hit:
+                st.hits += 1
+                st.bytes_saved += size
+            else:
+                st.misses += 1
+                st.bytes_fetched += size
+
+
+def _atomic_write(path: Path, data: bytes):
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+# Shared instance used by all scrapers in a process
+CACHE = HttpCache()
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+http_client.py — Shared HTTP client used by every scraper.
+
+Replaces the per-scraper HTTP handling (a fresh requests.Session per JSX call,
+bare requests.get/post in Aero/Tradewind/BARK/K9 Jets, Slate's own retry loop)
+with one client that provides:
+
+  - per-host connection pools (one requests.Session per host, sized for the
+    scraper's concurrency)
+  - unified retry with exponential backoff on timeouts, connection errors and
+    429/5xx responses (honours Retry-After)
+  - per-request timeouts and a per-run deadline: once the run deadline has
+    passed no new request is sent, and timeouts are clipped to what is left
+  - compression negotiation (gzip/deflate, plus br/zstd when urllib3 can
+    decode them)
+  - per-host metrics: request counts, retries, errors, a latency histogram
+    and bytes transferred; printed with report()
+  - record/replay of all traffic for offline benchmarks (AVIATO_HTTP_RECORD /
+    AVIATO_HTTP_REPLAY, see http_replay.py)
+
+RequestPool is the thread pool scrapers run parallel requests on. Each task
+runs in a copy of the submitting thread's contextvars, which plain threads
+don't inherit; run_scrapers.py relies on that to route a scraper's output.
+
+Usage (from a scraper):
+    from http_client import HttpClient
+    HTTP = HttpClient("Aero", headers={"Content-Type": "application/json"})
+    resp = HTTP.post(GRAPHQL_URL, json=payload)
+    with RequestPool(max_workers=4) as pool:
+        pages = pool.map(fetch_page, urls)
+    ...
+    HTTP.report()
+"""
+
+import contextvars
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import http_replay
+
+try:
+    from urllib3.util.request import ACCEPT_ENCODING
+except ImportError:
+    ACCEPT_ENCODING = "gzip,deflate"
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Upper bounds (ms) of the latency histogram buckets; last bucket is open-ended
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# How long past a scraper's soft deadline in-flight work may still finish
+DEFAULT_GRACE_S = 60
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """Raised instead of sending a request once the run deadline has passed."""
+
+
+@dataclass
+class HostMetrics:
+    requests: int = 0
+    retries: int = 0
+    errors: int = 0
+    bytes_wire: int = 0     # as transferred (compressed)
+    bytes_body: int = 0     # after decompression
+    statuses: dict[int, int] = field(default_factory=dict)
+    latency: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1))
+
+    def observe_latency(self, ms: float):
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if ms <= bound:
+                self.latency[i] += 1
+                return
+        self.latency[-1] += 1
+
+    def percentile(self, q: float) -> str:
+        """Bucket upper bound that contains the q-th percentile, e.g. '<=250ms'."""
+        total = sum(self.latency)
+        if not total:
+            return "-"
+        seen = 0
+        for i, count in enumerate(self.latency):
+            seen += count
+            if seen >= q * total:
+                if i < len(LATENCY_BUCKETS_MS):
+                    return f"<={LATENCY_BUCKETS_MS[i]}ms"
+                return f">{LATENCY_BUCKETS_MS[-1]}ms"
+        return "-"
+
+
+class HttpClient:
+    """One client per scraper; sessions are created lazily per host."""
+
+    def __init__(self, name: str, *, headers: dict | None = None,
+                 timeout: float = 30, retries: int = 2, backoff: float = 1.0,
+                 pool_size: int = 10, stateless: bool = False,
+                 deadline: float | None = None):
+        """
+        name:      label used in logs and the metrics report
+        headers:   default headers sent with every request
+        timeout:   per-request timeout in seconds
+        retries:   extra attempts after the first (0 = no retry)
+        backoff:   first retry waits backoff, then 2x, 4x, ...
+        pool_size: max keep-alive connections per host
+        stateless: drop cookies after every request (each request starts a
+                   fresh server-side session, as Tradewind's deeplinks expect)
+        deadline:  absolute time.time() after which no request is sent
+        """
+        self.name = name
+        self.headers = dict(headers or {})
+        self.headers.setdefault("Accept-Encoding", ACCEPT_ENCODING)
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.pool_size = pool_size
+        self.stateless = stateless
+        self.deadline = deadline
+        self.metrics: dict[str, HostMetrics] = {}
+        self._sessions: dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+        self.replay_url = os.environ.get(http_replay.REPLAY_ENV) or None
+        record_dir = os.environ.get(http_replay.RECORD_ENV)
+        self.recorder = http_replay.FixtureRecorder(record_dir) if record_dir else None
+
+    # ── Configuration ─────────────────────────────────────────────────
+
+    def set_deadline(self, deadline: float | None, grace: float = DEFAULT_GRACE_S):
+        """
+        Set the run deadline from a scraper's soft deadline. Requests already
+        underway when the soft deadline passes get `grace` seconds to finish.
+        """
+        self.deadline = None if deadline is None else deadline + grace
+
+    def set_pool_size(self, pool_size: int):
+        """Resize per-host pools (applies to hosts not contacted yet)."""
+        self.pool_size = max(1, pool_size)
+
+    # ── Requests ──────────────────────────────────────────────────────
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def request(self, method: str, url: str, *, retries: int | None = None,
+                timeout: float | None = None, **kwargs) -> requests.Response:
+        """
+        Send a request with retry/backoff. Returns the final response (which
+        may still be an error status — callers decide with raise_for_status);
+        raises the last Timeout/ConnectionError if every attempt failed.
+        """
+        parts = urlsplit(url)
+        host = parts.netloc
+        session = self._session_for(host)
+        if self.replay_url:
+            # Same path and query, sent to the replay server instead
+            upstream = f"{parts.scheme}://{parts.netloc}"
+            url = self.replay_url.rstrip("/") + url[len(upstream):]
+            kwargs["headers"] = {**(kwargs.get("headers") or {}),
+                                 http_replay.UPSTREAM_HEADER: upstream}
+        attempts = 1 + (self.retries if retries is None else retries)
+        timeout = self.timeout if timeout is None else timeout
+
+        for attempt in range(attempts):
+            req_timeout = self._clip_timeout(timeout)
+            started = time.perf_counter()
+            try:
+                resp = session.request(method, url, timeout=req_timeout, **kwargs)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                self._record(host, None, started)
+                if attempt == attempts - 1:
+                    raise
+                self._wait_before_retry(host, attempt, None, type(e).__name__)
+                continue
+            finally:
+                if self.stateless:
+                    session.cookies.clear()
+
+            self._record(host, resp, started)
+            if resp.status_code in RETRY_STATUSES and attempt < attempts - 1:
+                self._wait_before_retry(host, attempt, resp, f"HTTP {resp.status_code}")
+                continue
+            if self.recorder is not None:
+                self.recorder.record(self.name, resp)
+            return resp
+
+    def report(self):
+        """Print per-host request counts, latency and bytes for this run."""
+        if not self.metrics:
+            return
+        print(f"\n  HTTP ({self.name}):")
+        for host, m in sorted(self.metrics.items()):
+            statuses = " ".join(f"{s}x{n}" for s, n in sorted(m.statuses.items()))
+            print(f"    {host}: {m.requests} req, {m.retries} retries, {m.errors} errors"
+                  f" | p50 {m.percentile(0.5)} p95 {m.percentile(0.95)}"
+                  f" | {fmt_bytes(m.bytes_wire)} wire / {fmt_bytes(m.bytes_body)} body"
+                  + (f" | {statuses}" if statuses else ""))
+
+    # ── Internals ─────────────────────────────────────────────────────
+
+    def _session_for(self, host: str) -> requests.Session:
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                session.headers.update(self.headers)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._sessions[host] = session
+                self.metrics.setdefault(host, HostMetrics())
+            return session
+
+    def _clip_timeout(self, timeout: float) -> float:
+        if self.deadline is None:
+            return timeout
+        remaining = self.deadline - time.time()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"{self.name}: run deadline passed")
+        return min(timeout, remaining)
+
+    def _wait_before_retry(self, host: str, attempt: int,
+                           resp: requests.Response | None, reason: str):
+        wait = self.backoff * (2 ** attempt)
+        retry_after = _retry_after_seconds(resp) if resp is not None else None
+        if retry_after is not None:
+            wait = max(wait, retry_after)
+        if self.deadline is not None and time.time() + wait >= self.deadline:
+            raise DeadlineExceeded(f"{self.name}: no time left to retry {host}")
+        with self._lock:
+            self.metrics[host].retries += 1
+        print(f"    [{self.name}] {host} {reason}, retry {attempt + 1} in {wait:.1f}s")
+        time.sleep(wait)
+
+    def _record(self, host: str, resp: requests.Response | None, started: float):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            m = self.metrics[host]
+            m.requests += 1
+            m.observe_latency(elapsed_ms)
+            if resp is None:
+                m.errors += 1
+                return
+            m.statuses[resp.status_code] = m.statuses.get(resp.status_code, 0) + 1
+            if resp.status_code >= 400:
+                m.errors += 1
+            body = len(resp.content)
+            m.bytes_body += body
+            try:
+                m.bytes_wire += resp.raw.tell() or body
+            except (AttributeError, OSError):
+                m.bytes_wire += body
+
+
+class RequestPool(ThreadPoolExecutor):
+    """ThreadPoolExecutor whose tasks run in the submitter's context."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        # One copy per task: a Context can't be entered by two threads at once
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def request_key(method: str, url: str, body: bytes | str | None) -> str:
+    """Stable key for a prepared request: method + full URL + body."""
+    h = hashlib.sha256()
+    h.update(method.upper().encode())
+    h.update(b"\n")
+    h.update(url.encode())
+    h.update(b"\n")
+    body = body or b""
+    h.update(body if isinstance(body, bytes) else body.encode())
+    return h.hexdigest()
+
+
+def _retry_after_seconds(resp: requests.Response) -> float | None:
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def fmt_bytes(n: int) -> str:
+    if n >= 1024 * 1024:
+        return f"{n / (1024 * 1024):.1f} MB"
+    if n >= 1024:
+        return f"{n / 1024:.1f} KB"
+    return f"{n} B"
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+http_replay.py — Record/replay harness for scraper HTTP traffic.
+
+Recording: set AVIATO_HTTP_RECORD to a directory and run the scrapers as
+usual (e.g. python run_scrapers.py). Every final response seen by an
+HttpClient is appended to <dir>/<source>.jsonl together with the request it
+answers, and <dir>/meta.json remembers the day the recording was made.
+
+Replay: set AVIATO_HTTP_REPLAY to the URL of a replay server. HttpClient then
+sends every request there instead, naming the real host in the
+X-Aviato-Upstream header; the server looks the request up in the fixture
+store and answers with the recorded response, optionally with injected
+latency and error responses. AVIATO_SCRAPE_DATE pins the scrapers' notion
+of "today" to the recording day, because JSX/Tradewind/Slate put dates in
+their requests.
+
+Run from the scrapers/ directory:
+    AVIATO_HTTP_RECORD=.http_fixtures python run_scrapers.py
+    python http_replay.py serve --store .http_fixtures --latency-ms 40 --error-rate 0.02
+    python bench_scrapers.py --store .http_fixtures          # see bench_scrapers.py
+"""
+
+import argparse
+import base64
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+RECORD_ENV = "AVIATO_HTTP_RECORD"     # directory to record fixtures into
+REPLAY_ENV = "AVIATO_HTTP_REPLAY"     # replay server URL to send requests to
+DATE_ENV = "AVIATO_SCRAPE_DATE"       # YYYY-MM-DD pinned "today"
+UPSTREAM_HEADER = "X-Aviato-Upstream"
+
+DEFAULT_STORE = Path(__file__).parent / ".http_fixtures"
+
+# Not replayed: they describe the original transfer, not the content
+_HOP_HEADERS = {
+    "connection", "content-encoding", "content-length", "date",
+    "keep-alive", "transfer-encoding",
+}
+
+
+def scrape_today() -> datetime:
+    """
+    Midnight of the day the scrapers should treat as today. Normally the real
+    date; AVIATO_SCRAPE_DATE=YYYY-MM-DD pins it (used when replaying fixtures).
+    """
+    pinned = os.environ.get(DATE_ENV)
+    if pinned:
+        return datetime.strptime(pinned, "%Y-%m-%d")
+    return datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _slug(source: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", source.lower()).strip("_")
+
+
+# ── Recording ─────────────────────────────────────────────────────────
+
+class FixtureRecorder:
+    """Appends request/response pairs to <store>/<source>.jsonl (thread-safe)."""
+
+    def __init__(self, store_dir):
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        meta_path = self.store_dir / "meta.json"
+        if not meta_path.exists():
+            meta_path.write_text(json.dumps({
+                "recorded_on": scrape_today().strftime("%Y-%m-%d"),
+            }, indent=2) + "\n")
+
+    def record(self, source: str, resp):
+        """Record resp and every redirect hop that led to it."""
+        from http_client import request_key
+
+        lines = []
+        for r in (*resp.history, resp):
+            req = r.request
+            body = req.body or b""
+            if isinstance(body, str):
+                body = body.encode()
+            lines.append(json.dumps({
+                "key": request_key(req.method, req.url, body),
+                "method": req.method,
+                "url": req.url,
+                "status": r.status_code,
+                "headers": {k: v for k, v in r.headers.items()
+                            if k.lower() not in _HOP_HEADERS},
+                "body_b64": base64.b64encode(r.content).decode("ascii"),
+                "elapsed_ms": round(r.elapsed.total_seconds() * 1000, 1),
+            }) + "\n")
+        with self._lock:
+            with open(self.store_dir / f"{_slug(source)}.jsonl", "a") as f:
+                f.writelines(lines)
+
+
+# ── Fixture store ─────────────────────────────────────────────────────
+
+class FixtureStore:
+    """All recorded responses of a store directory, indexed by request key."""
+
+    def __init__(self, store_dir):
+        self.store_dir = Path(store_dir)
+        self.entries: dict[str, list[dict]] = {}
+        self._cursor: dict[str, int] = {}
+        self._lock = threading.Lock()
+        for path in sorted(self.store_dir.glob("*.jsonl")):
+            with open(path) as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries.setdefault(entry["key"], []).append(entry)
+        meta_path = self.store_dir / "meta.json"
+        self.meta = json.loads(meta_path.read_text()) if meta_path.exists() else {}
+
+    def __len__(self):
+        return sum(len(v) for v in self.entries.values())
+
+    def lookup(self, key: str) -> dict | None:
+        """Next recorded response for key (cycles if it was recorded more than once)."""
+        candidates = self.entries.get(key)
+        if not candidates:
+            return None
+        with self._lock:
+            i = self._cursor.get(key, 0)
+            self._cursor[key] = i + 1
+        return candidates[i % len(candidates)]
+
+
+# ── Replay server ─────────────────────────────────────────────────────
+
+class ReplayServer:
+    """
+    Local HTTP server answering from a FixtureStore.
+
+    latency_ms:  fixed delay per response, or "recorded" to replay the
+                 latency measured while recording
+    jitter_ms:   uniform random extra delay in [0, jitter_ms]
+    error_rate:  fraction of requests answered with 503 instead
+    """
+
+    def __init__(self, store: FixtureStore, host="127.0.0.1", port=0,
+                 latency_ms: float | str = 0, jitter_ms: float = 0,
+                 error_rate: float = 0.0, seed: int | None = None):
+        self.store = store
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.stats = {"served": 0, "missing": 0, "injected_errors": 0}
+        self._stats_lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "ReplayServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _delay_s(self, entry: dict | None) -> float:
+        if self.latency_ms == "recorded":
+            base = entry.get("elapsed_ms", 0) if entry else 0
+        else:
+            base = float(self.latency_ms)
+        jitter = self.rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0
+        return (base + jitter) / 1000
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self):
+                from http_client import request_key
+
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                upstream = self.headers.get(UPSTREAM_HEADER, "")
+                key = request_key(self.command, upstream + self.path, body)
+                entry = server.store.lookup(key)
+
+                delay = server._delay_s(entry)
+                if delay:
+                    time.sleep(delay)
+
+                if server.error_rate and server.rng.random() < server.error_rate:
+                    server._count("injected_errors")
+                    self._send(503, {"Retry-After": "0"}, b"injected error")
+                elif entry is None:
+                    server._count("missing")
+                    self._send(404, {"Content-Type": "application/json"},
+                               json.dumps({"error": "no fixture",
+                                           "url": upstream + self.path}).encode())
+                else:
+                    server._count("served")
+                    headers = dict(entry["headers"])
+                    # Keep same-host redirects on the replay server
+                    location = headers.get("Location", "")
+                    if upstream and location.startswith(upstream):
+                        headers["Location"] = location[len(upstream):] or "/"
+                    self._send(entry["status"], headers,
+                               base64.b64decode(entry["body_b64"]))
+
+            def _send(self, status: int, headers: dict, body: bytes):
+                self.send_response(status)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = _handle
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scraper HTTP replay server")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    serve = sub.add_parser("serve", help="serve a fixture store")
+    serve.add_argument("--store", default=str(DEFAULT_STORE))
+    serve.add_argument("--port", type=int, default=8799)
+    serve.add_argument("--latency-ms", default="0",
+                       help='fixed delay per response in ms, or "recorded"')
+    serve.add_argument("--jitter-ms", type=float, default=0)
+    serve.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    store = FixtureStore(args.store)
+    latency = args.latency_ms if args.latency_ms == "recorded" else float(args.latency_ms)
+    server = ReplayServer(store, port=args.port, latency_ms=latency,
+                          jitter_ms=args.jitter_ms, error_rate=args.error_rate)
+    print(f"Replaying {len(store)} responses from {args.store} on {server.url}")
+    if store.meta.get("recorded_on"):
+        print(f"  Recorded on {store.meta['recorded_on']} — run scrapers with "
+              f"AVIATO_SCRAPE_DATE={store.meta['recorded_on']}")
+    print(f"  AVIATO_HTTP_REPLAY={server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"\n  {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
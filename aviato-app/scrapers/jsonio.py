@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+jsonio.py — JSON encode/decode for the scrapers, on the fastest backend
+available.
+
+Scraper output (scrape_output.py) and the flight store go through here
+instead of calling the json module directly. Backends:
+
+  orjson   used when installed (pip install orjson): several times faster at
+           both encoding and decoding, always UTF-8
+  json     the stdlib, always available
+
+AVIATO_JSON_BACKEND=json forces the stdlib (e.g. to compare output).
+
+dumps() is compact by default (no spaces after separators, no indentation),
+which is roughly half the size of indent=2 for flight data; pretty=True
+gives the indent=2 layout. Both backends write non-ASCII characters as-is,
+so their compact output is byte-identical for the data written here
+(strings, ints, floats, lists, dicts with string keys).
+
+Usage:
+    import jsonio
+    line = jsonio.dumps(flight)                  # compact str
+    data = jsonio.loads(text_or_bytes)
+    data = jsonio.load(path)
+    jsonio.dump(data, path, pretty=True, sort_keys=True)
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+BACKEND_ENV = "AVIATO_JSON_BACKEND"
+
+
+class Backend(NamedTuple):
+    name: str
+    dumps: Callable[..., str]      # (obj, pretty, sort_keys) -> str
+    loads: Callable[[str | bytes], Any]
+
+
+def _json_dumps(obj, pretty: bool = False, sort_keys: bool = False) -> str:
+    if pretty:
+        return json.dumps(obj, indent=2, sort_keys=sort_keys, ensure_ascii=False)
+    return json.dumps(obj, separators=(",", ":"), sort_keys=sort_keys, ensure_ascii=False)
+
+
+STDLIB = Backend("json", _json_dumps, json.loads)
+BACKENDS: dict[str, Backend] = {"json": STDLIB}
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+else:
+    def _orjson_dumps(obj, pretty: bool = False, sort_keys: bool = False) -> str:
+        option = (orjson.OPT_INDENT_2 if pretty else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, option=option).decode()
+
+    BACKENDS["orjson"] = Backend("orjson", _orjson_dumps, orjson.loads)
+
+
+def _select() -> Backend:
+    wanted = os.environ.get(BACKEND_ENV)
+    if wanted:
+        if wanted not in BACKENDS:
+            print(f"  [jsonio] {BACKEND_ENV}={wanted} not available — using {STDLIB.name}")
+        return BACKENDS.get(wanted, STDLIB)
+    return BACKENDS.get("orjson", STDLIB)
+
+
+BACKEND = _select()
+
+# orjson.JSONDecodeError subclasses it, so this catches both backends' errors
+JSONDecodeError = json.JSONDecodeError
+
+
+def dumps(obj, pretty: bool = False, sort_keys: bool = False) -> str:
+    return BACKEND.dumps(obj, pretty, sort_keys)
+
+
+def loads(data: str | bytes):
+    return BACKEND.loads(data)
+
+
+def load(path: Path | str):
+    """Parse a whole JSON file (read as bytes; both backends take UTF-8)."""
+    return BACKEND.loads(Path(path).read_bytes())
+
+
+def dump(obj, path: Path | str, pretty: bool = False, sort_keys: bool = False):
+    """Write obj to path (atomically), with a trailing newline."""
+    tmp = Path(f"{path}.tmp")
+    tmp.write_text(dumps(obj, pretty, sort_keys) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
@@ -10,12 +10,15 @@ Usage:
 """
 
 import requests
-import csv
-import json
 import time
 import os
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
+
+import airports
+from http_client import HttpClient, RequestPool
+from http_replay import scrape_today
+from scrape_output import FlightWriter
 
 # ── API config ──────────────────────────────────────────────
 SEARCH_URL = "https://api.jsx.com/api/nsk/v4/availability/search/simple"
@@ -32,23 +35,9 @@ V4_TOKEN = (
 TIME_BUDGET = int(os.environ.get("JSX_TIME_BUDGET", 1200))
 
 # Dynamic date range: today + 90 days (was 150 — reduced for speed)
-START_DATE = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+START_DATE = scrape_today()
 END_DATE = START_DATE + timedelta(days=90)
 
-STATION_NAMES = {
-    "BUR": "Burbank", "LAS": "Las Vegas", "SMO": "Santa Monica",
-    "SNA": "Orange County", "SCF": "Scottsdale", "CCR": "Concord",
-    "OAK": "Oakland", "HPN": "White Plains", "PBI": "West Palm Beach",
-    "OPF": "Miami", "DAL": "Dallas", "DSI": "Destin",
-    "HOU": "Houston", "TRM": "Coachella Valley",
-    "LAX": "Los Angeles", "CSW": "Cabo San Lucas",
-    "APA": "Denver", "RNO": "Reno", "SLC": "Salt Lake City",
-    "CLD": "Carlsbad", "TSM": "Taos", "EDC": "Austin",
-    "SAF": "Santa Fe", "HOB": "Hobbs",
-    "APF": "Naples", "MMU": "Morristown", "TEB": "Teterboro",
-    "BCT": "Boca Raton", "MRY": "Monterey", "APC": "Napa",
-}
-
 ROUTES = [
     # LA area to Las Vegas
     ("BUR", "LAS"), ("LAS", "BUR"),
@@ -118,6 +107,14 @@ ROUTES = [
     ("SCF", "CLD"), ("CLD", "SCF"),
 ]
 
+# Column order of jsx_flights.csv
+CSV_FIELDS = [
+    "airline", "origin_code", "destination_code", "origin_city",
+    "destination_city", "date", "price", "fare_class", "flight_number",
+    "departure_time", "arrival_time", "seats_available",
+    "departure_iso", "arrival_iso", "equipment",
+]
+
 BASE_HEADERS = {
     "Content-Type": "application/json",
     "Accept": "application/json, text/plain, */*",
@@ -126,10 +123,13 @@ BASE_HEADERS = {
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
 }
 
+# Shared client: one keep-alive pool to api.jsx.com for all date requests
+HTTP = HttpClient("JSX", headers={**BASE_HEADERS, "Authorization": V4_TOKEN})
+
 
 # ── v4 search API ──
 
-def search_v4(session, origin, destination, date):
+def search_v4(client, origin, destination, date):
     """Search for flights on a single date using the v4 API."""
     payload = {
         "beginDate": date.strftime("%Y-%m-%d"),
@@ -149,7 +149,7 @@ def search_v4(session, origin, destination, date):
         "ssrCollectionsMode": 1,
     }
     try:
-        resp = session.post(SEARCH_URL, json=payload, timeout=30)
+        resp = client.post(SEARCH_URL, json=payload, timeout=30)
     except requests.exceptions.Timeout:
         return None
     except requests.exceptions.ConnectionError:
@@ -228,8 +228,8 @@ def parse_v4(data, origin_code, dest_code):
                         "airline": "JSX",
                         "origin_code": origin_code,
                         "destination_code": dest_code,
-                        "origin_city": STATION_NAMES.get(origin_code, origin_code),
-                        "destination_city": STATION_NAMES.get(dest_code, dest_code),
+                        "origin_city": airports.city(origin_code),
+                        "destination_city": airports.city(dest_code),
                         "date": dep_dt.strftime("%Y-%m-%d"),
                         "price": round(fare_total, 2),
                         "fare_class": fare_label,
@@ -247,12 +247,9 @@ def parse_v4(data, origin_code, dest_code):
 # ── v4 concurrent helper ──
 
 def _v4_fetch_one(origin, dest, date_str):
-    """Fetch a single date for a route via v4 (for use with ThreadPoolExecutor)."""
-    session = requests.Session()
-    session.headers.update(BASE_HEADERS)
-    session.headers["Authorization"] = V4_TOKEN
+    """Fetch a single date for a route via v4 (for use with RequestPool)."""
     date = datetime.strptime(date_str, "%Y-%m-%d")
-    data = search_v4(session, origin, dest, date)
+    data = search_v4(HTTP, origin, dest, date)
     if data is None or data == "AUTH_FAIL":
         return []
     return parse_v4(data, origin, dest)
@@ -282,7 +279,7 @@ def v4_scrape_route(origin, dest, start, end, max_workers=10):
 
     # Route exists — scrape remaining days in parallel
     remaining = [d for d in days if d not in probe_days]
-    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+    with RequestPool(max_workers=max_workers) as pool:
         futures = {pool.submit(_v4_fetch_one, origin, dest, d): d for d in remaining}
         for future in as_completed(futures):
             try:
@@ -296,74 +293,69 @@ def v4_scrape_route(origin, dest, start, end, max_workers=10):
 
 # ── Main ──
 
-def main():
+def main(deadline=None, concurrency=10):
+    """
+    Scrape all routes. deadline is an absolute time.time() after which no new
+    route is started (defaults to TIME_BUDGET from now); concurrency is the
+    number of parallel date requests per route.
+    """
     script_start = time.time()
+    if deadline is None:
+        deadline = script_start + TIME_BUDGET
+    HTTP.set_deadline(deadline)
+    HTTP.set_pool_size(concurrency)
 
     print("=" * 60)
     print("JSX Flight Scraper (v4 API)")
     print(f"Date range: {START_DATE.strftime('%Y-%m-%d')} to {END_DATE.strftime('%Y-%m-%d')}")
     print(f"Routes: {len(ROUTES)}")
-    print(f"Time budget: {TIME_BUDGET}s")
+    print(f"Time budget: {int(deadline - script_start)}s")
     print("=" * 60)
 
-    all_flights = []
     routes_scraped = 0
     routes_skipped = 0
 
-    for route_idx, (origin, dest) in enumerate(ROUTES, 1):
-        # Check time budget before starting a new route
-        elapsed = time.time() - script_start
-        if elapsed > TIME_BUDGET:
-            routes_skipped = len(ROUTES) - route_idx + 1
-            print(f"\n⏰ Time budget reached ({int(elapsed)}s). Skipping remaining {routes_skipped} routes.")
-            break
-
-        label = f"{STATION_NAMES.get(origin, origin)} ({origin}) -> {STATION_NAMES.get(dest, dest)} ({dest})"
-        print(f"[{route_idx}/{len(ROUTES)}] {label}", end=" ", flush=True)
-
-        try:
-            flights = v4_scrape_route(origin, dest, START_DATE, END_DATE, max_workers=10)
-            all_flights.extend(flights)
-            routes_scraped += 1
-            print(f"-> {len(flights)}")
-        except Exception as e:
-            print(f"-> ERROR: {e}")
-
-    # ── Deduplicate ──
-    seen = set()
-    deduped = []
-    for f in all_flights:
-        key = (f["origin_code"], f["destination_code"], f["date"],
-               f["departure_time"], f["fare_class"])
-        if key not in seen:
-            seen.add(key)
-            deduped.append(f)
-    all_flights = deduped
-
-    # Save JSON
-    with open("jsx_flights.json", "w") as f:
-        json.dump(all_flights, f, indent=2)
-    print(f"\nSaved JSON -> jsx_flights.json")
-
-    # Save CSV
-    csv_file = "jsx_flights.csv"
-    fieldnames = [
-        "airline", "origin_code", "destination_code", "origin_city",
-        "destination_city", "date", "price", "fare_class", "flight_number",
-        "departure_time", "arrival_time", "seats_available",
-        "departure_iso", "arrival_iso", "equipment",
-    ]
-    with open(csv_file, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(all_flights)
+    # Flights are appended to the output as each route finishes
+    out = FlightWriter("jsx_flights", csv_fields=CSV_FIELDS)
+    with out:
+        for route_idx, (origin, dest) in enumerate(ROUTES, 1):
+            # Check time budget before starting a new route
+            elapsed = time.time() - script_start
+            if time.time() > deadline:
+                routes_skipped = len(ROUTES) - route_idx + 1
+                print(f"\n⏰ Time budget reached ({int(elapsed)}s). Skipping remaining {routes_skipped} routes.")
+                break
+
+            label = f"{airports.city(origin)} ({origin}) -> {airports.city(dest)} ({dest})"
+            print(f"[{route_idx}/{len(ROUTES)}] {label}", end=" ", flush=True)
+
+            try:
+                flights = v4_scrape_route(origin, dest, START_DATE, END_DATE, max_workers=concurrency)
+                routes_scraped += 1
+                print(f"-> {len(flights)}")
+            except Exception as e:
+                print(f"-> ERROR: {e}")
+                continue
+
+            # ── Deduplicate ── (per route: the key's route part is the same)
+            seen = set()
+            deduped = []
+            for f in flights:
+                key = (f["date"], f["departure_time"], f["fare_class"])
+                if key not in seen:
+                    seen.add(key)
+                    deduped.append(f)
+            out.extend(deduped)
+
+    print(f"\nSaved JSON -> {out.path}")
 
     elapsed = time.time() - script_start
-    print(f"Saved CSV  -> {csv_file}")
+    print(f"Saved CSV  -> {out.csv_path}")
     print("=" * 60)
-    print(f"DONE in {int(elapsed)}s! {len(all_flights)} flights from {routes_scraped} routes")
+    print(f"DONE in {int(elapsed)}s! {out.count} flights from {routes_scraped} routes")
     if routes_skipped:
         print(f"  ({routes_skipped} routes skipped due to time budget)")
+    HTTP.report()
     print("=" * 60)
 
 
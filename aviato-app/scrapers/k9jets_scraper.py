@@ -27,12 +27,18 @@ Usage:
   python k9jets_scraper.py
 """
 import requests
-import json
-import csv
 import sys
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 from typing import Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
+
+import airports
+import dateparse
+from http_cache import CACHE
+from http_client import HttpClient, RequestPool
+from http_replay import scrape_today
+from scrape_output import FlightWriter
 
 # ─── Configuration ───────────────────────────────────────────────────────────
 
@@ -45,6 +51,8 @@ HEADERS = {
     "Accept": "application/json",
 }
 
+HTTP = HttpClient("K9 Jets", headers=HEADERS, pool_size=4)
+
 # Estimated flight durations (used for display only — not from the API)
 DURATIONS = {
     ("TEB", "LTN"): "7h 00m", ("LTN", "TEB"): "8h 00m",
@@ -78,28 +86,6 @@ DURATIONS = {
     ("YYZ", "DWC"): "12h 00m", ("DWC", "YYZ"): "14h 00m",
 }
 
-# Map city names to IATA codes (fallback if API attributes are missing)
-CITY_TO_IATA = {
-    "New Jersey": "TEB", "Teterboro": "TEB", "New York": "TEB",
-    "London": "LTN", "Luton": "LTN",
-    "Paris": "LBG", "Le Bourget": "LBG",
-    "Lisbon": "LIS",
-    "Los Angeles": "VNY", "Van Nuys": "VNY", "LA": "VNY", "California": "VNY",
-    "Dubai": "DWC", "Al Maktoum": "DWC",
-    "Dublin": "DUB",
-    "Frankfurt": "FRA",
-    "Geneva": "GVA",
-    "Milan": "MXP", "Malpensa": "MXP",
-    "Toronto": "YYZ",
-    "Florida": "FXE", "Fort Lauderdale": "FXE", "Miami": "FXE",
-    "Nice": "NCE",
-    "Madrid": "MAD",
-    "Birmingham": "BHX",
-    "Vancouver": "YVR",
-    "Honolulu": "HNL", "Hawaii": "HNL",
-}
-
-
 # ─── Data Model ──────────────────────────────────────────────────────────────
 
 @dataclass
@@ -132,41 +118,80 @@ def get_attr(product: dict, attr_name: str) -> Optional[str]:
     return None
 
 
-def fetch_all_products() -> list[dict]:
-    """Fetch all products (flights) from the WooCommerce Store API."""
-    all_products = []
+def _fetch_page(page: int) -> Optional[requests.Response]:
+    """Fetch one page of the Store API. None on error (logged)."""
+    url = f"{API_BASE}?per_page={PER_PAGE}&page={page}"
+    try:
+        resp = CACHE.get(url, source="K9 Jets", session=HTTP, timeout=30)
+        resp.raise_for_status()
+    except requests.RequestException as e:
+        print(f"    Fetching page {page}... ERROR: {e}")
+        return None
+    return resp
+
+
+def _log_page(page: int, resp: requests.Response, products: list):
+    total = resp.headers.get("X-WP-Total", "?")
+    total_pages = resp.headers.get("X-WP-TotalPages", "?")
+    cached = " (cached)" if resp.from_cache else ""
+    print(f"    Fetching page {page}... got {len(products)} "
+          f"(total: {total}, page {page}/{total_pages}){cached}")
+
+
+def fetch_all_products(deadline: Optional[float] = None, concurrency: int = 1) -> list[dict]:
+    """
+    Fetch all products (flights) from the WooCommerce Store API.
+    Page 1 tells us the page count; the remaining pages are fetched with up to
+    `concurrency` requests in flight. Pages are never started after deadline.
+    """
+    resp = _fetch_page(1)
+    if resp is None:
+        return []
+    products = resp.json()
+    if not products:
+        print("    Fetching page 1... (empty)")
+        return []
+    _log_page(1, resp, products)
+    all_products = list(products)
+
+    try:
+        total_pages = int(resp.headers.get("X-WP-TotalPages", ""))
+    except (ValueError, TypeError):
+        total_pages = None
+
+    if total_pages is not None:
+        def fetch(page):
+            if deadline is not None and time.time() > deadline:
+                return None
+            return _fetch_page(page)
+
+        pages = range(2, total_pages + 1)
+        with RequestPool(max_workers=max(1, concurrency)) as pool:
+            for page, presp in zip(pages, pool.map(fetch, pages)):
+                if presp is None:
+                    print(f"    Stopping at page {page}")
+                    break
+                products = presp.json()
+                _log_page(page, presp, products)
+                all_products.extend(products)
+        return all_products
+
+    # No page count header — walk pages until a short/empty page
     page = 1
-
-    while True:
-        url = f"{API_BASE}?per_page={PER_PAGE}&page={page}"
-        print(f"    Fetching page {page}...", end="", flush=True)
-
-        try:
-            resp = requests.get(url, headers=HEADERS, timeout=30)
-            resp.raise_for_status()
-        except requests.RequestException as e:
-            print(f" ERROR: {e}")
+    while len(products) >= PER_PAGE:
+        if deadline is not None and time.time() > deadline:
+            print(f"    Deadline reached before page {page + 1}")
+            break
+        page += 1
+        resp = _fetch_page(page)
+        if resp is None:
             break
-
         products = resp.json()
         if not products:
-            print(" (empty)")
+            print(f"    Fetching page {page}... (empty)")
             break
-
+        _log_page(page, resp, products)
         all_products.extend(products)
-        total = resp.headers.get("X-WP-Total", "?")
-        total_pages = resp.headers.get("X-WP-TotalPages", "?")
-        print(f" got {len(products)} (total: {total}, page {page}/{total_pages})")
-
-        # Check if we've reached the last page
-        try:
-            if page >= int(total_pages):
-                break
-        except (ValueError, TypeError):
-            if len(products) < PER_PAGE:
-                break
-
-        page += 1
 
     return all_products
 
@@ -197,8 +222,8 @@ def parse_product(product: dict) -> Optional[Flight]:
             if len(parts) == 2:
                 dep_city = parts[0].strip().split(" (")[0].strip()
                 arr_city = parts[1].strip().split(" (")[0].strip()
-                dep_code = dep_code or CITY_TO_IATA.get(dep_city)
-                arr_code = arr_code or CITY_TO_IATA.get(arr_city)
+                dep_code = dep_code or airports.city_code(dep_city, "K9 Jets")
+                arr_code = arr_code or airports.city_code(arr_city, "K9 Jets")
 
     if not dep_code or not arr_code:
         return None
@@ -215,18 +240,11 @@ def parse_product(product: dict) -> Optional[Flight]:
             pass
 
     # Parse date to ISO format
-    iso_date = None
-    if flight_date:
-        for fmt in ["%m/%d/%Y", "%d/%m/%Y", "%Y-%m-%d", "%B %d, %Y", "%B %d %Y"]:
-            try:
-                iso_date = datetime.strptime(flight_date.strip(), fmt).strftime("%Y-%m-%d")
-                break
-            except ValueError:
-                continue
+    iso_date = dateparse.K9JETS_DATES.iso(flight_date) if flight_date else None
 
     # Skip past flights
     if iso_date:
-        today = datetime.now().strftime("%Y-%m-%d")
+        today = scrape_today().strftime("%Y-%m-%d")
         if iso_date < today:
             return None
 
@@ -269,35 +287,25 @@ def parse_product(product: dict) -> Optional[Flight]:
         aircraft=aircraft or "",
         seats=0 if not available else 9,
         booking_url=permalink,
-        scraped_at=datetime.utcnow().isoformat() + "Z",
+        scraped_at=datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z",
     )
 
 
 # ─── Output ──────────────────────────────────────────────────────────────────
 
-def save_json(flights: list, filename: str = "k9jets_flights.json"):
-    data = {
-        "scraped_at": datetime.utcnow().isoformat() + "Z",
-        "total_flights": len(flights),
-        "source": "k9jets.com (WooCommerce Store API)",
-        "routes": sorted(set(f"{f.origin_code}-{f.destination_code}" for f in flights)),
-        "flights": [asdict(f) for f in flights],
-    }
-    with open(filename, "w") as fp:
-        json.dump(data, fp, indent=2)
-    print(f"\n  Saved JSON → {filename}")
-
-
-def save_csv(flights: list, filename: str = "k9jets_flights.csv"):
-    if not flights:
-        return
-    fieldnames = list(asdict(flights[0]).keys())
-    with open(filename, "w", newline="") as fp:
-        writer = csv.DictWriter(fp, fieldnames=fieldnames)
-        writer.writeheader()
-        for f in flights:
-            writer.writerow(asdict(f))
-    print(f"  Saved CSV  → {filename}")
+def open_output(name: str = "k9jets_flights") -> FlightWriter:
+    """Writer for <name>.jsonl (see scrape_output.py) and <name>.csv."""
+    return FlightWriter(name, csv_fields=[f.name for f in fields(Flight)],
+                        meta={"source": "k9jets.com (WooCommerce Store API)"})
+
+
+def save_output(out: FlightWriter, flights: list):
+    """Write flights through out (opened when the scrape started)."""
+    with out:
+        out.extend(asdict(f) for f in flights)
+    print(f"\n  Saved JSONL → {out.path}")
+    if out.count:
+        print(f"  Saved CSV   → {out.csv_path}")
 
 
 def print_summary(flights: list):
@@ -329,21 +337,25 @@ def print_summary(flights: list):
     print(f"Total: {len(flights)} flights across {len(routes)} routes")
     print(f"  Available: {sum(1 for f in flights if f.available)}")
     print(f"  Sold out:  {sum(1 for f in flights if not f.available)}")
-    print(f"Scraped at: {datetime.utcnow().isoformat()}Z")
+    print(f"Scraped at: {datetime.now(timezone.utc).replace(tzinfo=None).isoformat()}Z")
     print("=" * 90)
 
 
 # ─── Main ────────────────────────────────────────────────────────────────────
 
-def main():
+def main(deadline=None, concurrency=1):
     print("=" * 60)
     print("  K9 Jets Flight Scraper")
     print("  Using WooCommerce Store API (structured JSON)")
     print("=" * 60)
+    HTTP.set_deadline(deadline)
+    HTTP.set_pool_size(concurrency)
+    # Opened now so the output's scraped_at is when this run started
+    out = open_output()
 
     # Fetch all products from the API
     print("\n  Fetching flights from WooCommerce Store API...")
-    products = fetch_all_products()
+    products = fetch_all_products(deadline=deadline, concurrency=concurrency)
     print(f"\n  Fetched {len(products)} total products")
 
     # Parse each product into a Flight
@@ -374,10 +386,11 @@ def main():
         print("  The API may be down or the products may have changed.")
         print("  No fake data will be generated.")
 
-    save_json(unique)
-    save_csv(unique)
+    save_output(out, unique)
     if unique:
         print_summary(unique)
+    CACHE.report()
+    HTTP.report()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,638 @@
+#!/usr/bin/env python3
+"""
+mock_airlines.py — Local stand-in for the airline APIs, for load and scaling tests.
+
+Implements the subset of each airline's API the scrapers actually call, with
+synthetic inventory generated at a configurable scale:
+
+  JSX        POST api.jsx.com  /api/nsk/v4/availability/search/simple
+  Aero       POST membrane.aero.com /api/v2  (GraphQL flightSearch)
+  K9 Jets    GET  www.k9jets.com /wp-json/wc/store/v1/products  (paged, X-WP-* headers)
+  BARK Air   GET  air.bark.co /collections/bookings/products.json + /products/<handle>
+  Tradewind  GET  booking.flytradewind.com /VARS/Public/deeplink.aspx  (302 -> FlightCal HTML)
+  Slate      POST api.app.flyslate.com /getAirportsAndMa, /getCalendarSeatsPrices,
+                  /getPlaneBySeatList
+
+--scale multiplies the network: JSX/Aero/Tradewind routes and Slate
+directions (extra synthetic airports are added), K9 Jets and BARK Air
+products. Inventory is deterministic for a given --seed, so runs compare.
+The server sits behind the same replay hook as http_replay.py: HttpClient
+sends everything to AVIATO_HTTP_REPLAY with the real host in a header.
+
+Network behaviour:
+  --latency-ms / --jitter-ms   delay per response
+  --rate-limit N               per-host token bucket (N req/s); excess gets
+                               429 with Retry-After, like a throttling CDN
+  --error-rate                 fraction of requests answered with 503
+
+Run from the scrapers/ directory:
+    python mock_airlines.py load --scale 10                 # all scrapers at 10x
+    python mock_airlines.py load jsx --scale 3 --rate-limit 50 --concurrency 20
+    python mock_airlines.py serve --scale 10 --port 8798    # standalone server
+"""
+
+import argparse
+import dataclasses
+import importlib
+import json
+import math
+import os
+import random
+import re
+import resource
+import string
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
+
+from http_replay import DATE_ENV, RECORD_ENV, REPLAY_ENV, UPSTREAM_HEADER, scrape_today  # noqa: E402
+
+# Current catalog sizes (scale 1)
+K9_PRODUCTS = 441
+BARK_PRODUCTS = 130
+
+SLATE_AIRPORTS = [
+    {"code": "KTEB", "iata": "TEB", "name": "Teterboro", "city": "Teterboro", "state": "NJ"},
+    {"code": "KHPN", "iata": "HPN", "name": "Westchester County", "city": "White Plains", "state": "NY"},
+    {"code": "KOPF", "iata": "OPF", "name": "Miami-Opa Locka", "city": "Miami", "state": "FL"},
+    {"code": "KFXE", "iata": "FXE", "name": "Fort Lauderdale Executive", "city": "Fort Lauderdale", "state": "FL"},
+    {"code": "KPBI", "iata": "PBI", "name": "Palm Beach", "city": "West Palm Beach", "state": "FL"},
+]
+
+K9_ROUTES = [
+    ("TEB", "LTN"), ("LTN", "TEB"), ("VNY", "LTN"), ("LTN", "VNY"),
+    ("TEB", "LBG"), ("LBG", "TEB"), ("TEB", "LIS"), ("LIS", "TEB"),
+    ("TEB", "FXE"), ("FXE", "TEB"), ("LTN", "DWC"), ("DWC", "LTN"),
+]
+
+
+def _synthetic_code(n: int) -> str:
+    """n-th synthetic 3-letter airport code, starting at QAA."""
+    n += 16 * 26 * 26
+    letters = string.ascii_uppercase
+    return letters[n // 676 % 26] + letters[n // 26 % 26] + letters[n % 26]
+
+
+def _synthetic_pairs(count: int) -> list[tuple[str, str]]:
+    """count directed routes between synthetic airports, both directions of each."""
+    pairs = []
+    for k in range(math.ceil(count / 2)):
+        a, b = _synthetic_code(2 * k), _synthetic_code(2 * k + 1)
+        pairs += [(a, b), (b, a)]
+    return pairs[:count]
+
+
+# ── Synthetic inventory ───────────────────────────────────────────────
+
+class Inventory:
+    """Deterministic synthetic schedules/catalogs for every airline at a given scale."""
+
+    def __init__(self, scale: float = 1.0, seed: int = 0, today: datetime | None = None):
+        self.scale = scale
+        self.seed = seed
+        self.today = today or scrape_today()
+        self._jsx_network = None  # built on first use: importing scrapers creates their HTTP clients
+
+    @property
+    def jsx_network(self) -> set[tuple[str, str]]:
+        if self._jsx_network is None:
+            self._jsx_network = set(self.jsx_routes())
+        return self._jsx_network
+
+    def _rng(self, *key) -> random.Random:
+        return random.Random(":".join(str(k) for k in (self.seed, *key)))
+
+    def _scaled(self, n: int) -> int:
+        return max(1, round(n * self.scale))
+
+    # Route lists patched into the scrapers by the load runner
+
+    def jsx_routes(self) -> list[tuple[str, str]]:
+        base = list(importlib.import_module("jsx_scraper").ROUTES)
+        return base + _synthetic_pairs(self._scaled(len(base)) - len(base))
+
+    def aero_routes(self) -> list[dict]:
+        base = list(importlib.import_module("aero_scraper").ROUTES)
+        extra = _synthetic_pairs(self._scaled(len(base)) - len(base))
+        return base + [{"origin": o, "destination": d, "origin_city": o, "dest_city": d}
+                       for o, d in extra]
+
+    def tradewind_routes(self) -> list[dict]:
+        base = list(importlib.import_module("tradewind_scraper").ROUTES)
+        extra = _synthetic_pairs(self._scaled(len(base)) - len(base))
+        return base + [{"from_code": o, "from_city": o, "to_code": d, "to_city": d}
+                       for o, d in extra]
+
+    def slate_directions(self) -> list[tuple[str, str]]:
+        base = list(importlib.import_module("slate_scraper").DIRECTIONS)
+        extra = self._scaled(len(base)) - len(base)
+        return base + [(str(9000 + i), str(9000 + (i ^ 1))) for i in range(extra)]
+
+    # JSX
+
+    def jsx_search(self, origin: str, dest: str, date: str) -> dict:
+        journeys, fares = [], {}
+        if (origin, dest) in self.jsx_network:
+            rng = self._rng("jsx", origin, dest, date)
+            day = datetime.strptime(date, "%Y-%m-%d")
+            for i in range(rng.randint(1, 4)):
+                dep = day + timedelta(hours=7 + 3 * i, minutes=rng.choice((0, 15, 30, 45)))
+                arr = dep + timedelta(minutes=rng.randint(55, 180))
+                fare_key = f"{origin}{dest}{date}{i}"
+                journeys.append({
+                    "designator": {"departure": dep.isoformat(), "arrival": arr.isoformat()},
+                    "segments": [{
+                        "identifier": {"carrierCode": "XE", "identifier": str(rng.randint(100, 999))},
+                        "legs": [{"legInfo": {"equipmentType": rng.choice(("ER3", "ER4"))}}],
+                    }],
+                    "fares": [{"fareAvailabilityKey": fare_key,
+                               "details": [{"availableCount": rng.randint(1, 12)}]}],
+                })
+                fares[fare_key] = {
+                    "totals": {"fareTotal": float(rng.randint(99, 899))},
+                    "fares": [{"productClass": rng.choice(("HO", "AI"))}],
+                }
+        return {"data": {
+            "results": [{"trips": [{"journeysAvailableByMarket": {f"{origin}|{dest}": journeys}}]}],
+            "faresAvailable": fares,
+        }}
+
+    # Aero
+
+    def aero_search(self, origin: str, dest: str) -> dict:
+        rng = self._rng("aero", origin, dest)
+        flights = []
+        for day in range(90):
+            if rng.random() > 0.4:
+                continue
+            dep = self.today + timedelta(days=day, hours=rng.choice((8, 11, 15, 17)))
+            duration = rng.randint(60, 330)
+            flights.append({
+                "originIata": origin,
+                "destinationIata": dest,
+                "departureAt": dep.strftime("%Y-%m-%d %H:%M:%S"),
+                "arrivalAt": (dep + timedelta(minutes=duration)).strftime("%Y-%m-%d %H:%M:%S"),
+                "price": str(rng.randint(950, 4500)),
+                "currency": "USD",
+                "fare": "standard",
+                "fareBrandName": "Aero",
+                "flightNumber": str(rng.randint(100, 999)),
+                "marketingCarrierCode": "5E",
+                "isSoldOut": rng.random() < 0.1,
+                "duration": duration,
+                "availableAdultSeats": rng.randint(1, 16),
+                "cartKey": f"{origin}{dest}{day}",
+            })
+        return {"data": {"flightSearch": {"departureFlights": flights}}}
+
+    # K9 Jets
+
+    def k9_total(self) -> int:
+        return self._scaled(K9_PRODUCTS)
+
+    def k9_product(self, i: int) -> dict:
+        rng = self._rng("k9", i)
+        dep, arr = K9_ROUTES[i % len(K9_ROUTES)]
+        date = self.today + timedelta(days=1 + (i * 7) % 300)
+        attrs = {
+            "Departure Airport (IATA code)": dep,
+            "Arrival Airport (IATA code)": arr,
+            "Flight date": date.strftime("%m/%d/%Y"),
+            "Departure time": "10:00 AM",
+            "Arrival Time": "6:00 PM",
+            "Aircraft": "Gulfstream G550",
+            "Route": f"{dep} To {arr}",
+        }
+        in_stock = rng.random() > 0.2
+        return {
+            "id": 10000 + i,
+            "permalink": f"https://www.k9jets.com/product/flight-{i}/",
+            "attributes": [{"name": k, "terms": [{"name": v}]} for k, v in attrs.items()],
+            "categories": [{"name": f"{dep} to {arr}"}],
+            "prices": {"price": str(rng.randint(60, 140) * 100_000), "currency_minor_unit": 2},
+            "is_purchasable": in_stock,
+            "is_in_stock": in_stock,
+        }
+
+    # BARK Air
+
+    def bark_total(self) -> int:
+        return self._scaled(BARK_PRODUCTS)
+
+    def _bark_route_date(self, i: int) -> tuple[str, datetime]:
+        routes = importlib.import_module("bark_air_scraper").TARGET_ROUTES
+        return routes[i % len(routes)], self.today + timedelta(days=3 + (i * 5) % 330)
+
+    def bark_product(self, i: int) -> dict:
+        rng = self._rng("bark", i)
+        route, date = self._bark_route_date(i)
+        return {
+            "id": 70000 + i,
+            "handle": f"flight-{i}",
+            "title": f"{route} — {date.strftime('%B %d, %Y')}",
+            "options": [
+                {"name": "Location", "values": [route]},
+                {"name": "Month", "values": [date.strftime("%B %Y")]},
+            ],
+            "variants": [{"id": 90000 + i, "price": f"{rng.randint(6, 16) * 1000}.00",
+                          "available": rng.random() > 0.15}],
+        }
+
+    def bark_page_html(self, i: int) -> str:
+        rng = self._rng("bark-page", i)
+        _, date = self._bark_route_date(i)
+        rows = [("Date", date.strftime("%B %d, %Y")),
+                ("Takeoff", f"{rng.randint(8, 11)}:00 AM"),
+                ("Aircraft", "Gulfstream G-V")]
+        body = "".join(
+            f'<div class="ticket-summary-listrow"><span class="ticket-summary-title">{k}</span>'
+            f'<span class="ticket-summary-details">{v}</span></div>' for k, v in rows)
+        return (f"<html><body><div class='ticket-summary'>{body}</div>"
+                f"<div class='row-right-col'>{rng.randint(1, 15)} tickets left</div></body></html>")
+
+    # Tradewind
+
+    def tradewind_html(self, origin: str, dest: str, date: str) -> str:
+        rng = self._rng("tradewind", origin, dest, date)
+        panels = []
+        for i in range(rng.randint(0, 4)):
+            dep = datetime.strptime(date, "%Y-%m-%d") + timedelta(hours=7 + 2 * i, minutes=30)
+            arr = dep + timedelta(minutes=45)
+            price = "Sold Out" if rng.random() < 0.15 else f"${rng.randint(595, 1295):,}"
+            panels.append(
+                "<div class='flt-panel'>"
+                f"<div class='cal-Depart-time'><div class='time'><span>{dep:%I:%M}</span><span>{dep:%p}</span></div></div>"
+                f"<div class='cal-Arrive-time'><div class='time'><span>{arr:%I:%M}</span><span>{arr:%p}</span></div></div>"
+                f"<div class='fare-price-small'>{price}</div>"
+                f"<div class='flightnumber'>TJ{rng.randint(100, 999)}</div>"
+                "</div>")
+        return f"<html><body>{''.join(panels)}</body></html>"
+
+    # Slate
+
+    def slate_calendar(self, from_ma: str, to_ma: str, start: str, end: str) -> dict:
+        rng = self._rng("slate-cal", from_ma, to_ma)
+        day = datetime.strptime(start, "%Y-%m-%d")
+        last = datetime.strptime(end, "%Y-%m-%d")
+        seats = []
+        while day <= last:
+            if rng.random() < 0.6:
+                seats.append({"date": day.strftime("%Y-%m-%d"), "price": rng.randint(900, 2400)})
+            day += timedelta(days=1)
+        return {"status": True, "seats": seats}
+
+    def slate_flights(self, from_ma: str, to_ma: str, date: str) -> dict:
+        rng = self._rng("slate", from_ma, to_ma, date)
+        north = from_ma != "252"
+        group = []
+        for i in range(rng.randint(1, 3)):
+            src, dst = rng.sample(SLATE_AIRPORTS[:2], 1) + rng.sample(SLATE_AIRPORTS[2:], 1)
+            if north:
+                src, dst = dst, src
+            group.append({
+                "id": f"{from_ma}{to_ma}{date.replace('-', '')}{i}",
+                "from": src["code"],
+                "to": dst["code"],
+                "departureTime": f"{date} {8 + 4 * i:02d}:00",
+                "priceBlock": {"price": rng.randint(900, 2400)},
+                "name": "CRJ-200",
+                "seatsLeft": rng.randint(1, 30),
+            })
+        return {"status": True, "charters": [group]}
+
+
+# ── Server ────────────────────────────────────────────────────────────
+
+class _TokenBucket:
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self) -> float:
+        """0 if a token was available, otherwise seconds until the next one."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+
+class MockAirlineServer:
+    """Threaded HTTP server answering each airline's endpoints from an Inventory."""
+
+    def __init__(self, inventory: Inventory, host="127.0.0.1", port=0,
+                 latency_ms: float = 0, jitter_ms: float = 0,
+                 rate_limit: float | None = None, error_rate: float = 0.0,
+                 seed: int | None = None):
+        self.inventory = inventory
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.stats = {"served": 0, "missing": 0, "throttled": 0, "injected_errors": 0}
+        self._buckets: dict[str, _TokenBucket] = {}
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.httpd.request_queue_size = 128
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockAirlineServer":
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _throttle(self, host: str) -> float:
+        if not self.rate_limit:
+            return 0.0
+        with self._lock:
+            bucket = self._buckets.setdefault(host, _TokenBucket(self.rate_limit))
+        return bucket.take()
+
+    # Routing: (upstream host, method, path, query, body) -> (status, headers, body)
+
+    def route(self, host: str, method: str, path: str, query: dict, body: bytes):
+        inv = self.inventory
+        q = {k: v[0] for k, v in query.items()}
+
+        if host == "api.jsx.com" and path.endswith("/availability/search/simple"):
+            req = json.loads(body or b"{}")
+            return _json(inv.jsx_search(req.get("origin"), req.get("destination"), req.get("beginDate")))
+
+        if host == "membrane.aero.com" and path == "/api/v2":
+            query_text = json.loads(body or b"{}").get("query", "")
+            m = re.search(r'originIata:\s*"(\w+)"\s+destinationIata:\s*"(\w+)"', query_text)
+            if not m:
+                return _json({"errors": [{"message": "bad query"}]})
+            return _json(inv.aero_search(m.group(1), m.group(2)))
+
+        if host == "www.k9jets.com" and path == "/wp-json/wc/store/v1/products":
+            per_page = int(q.get("per_page", 10))
+            page = int(q.get("page", 1))
+            total = inv.k9_total()
+            first = (page - 1) * per_page
+            products = [inv.k9_product(i) for i in range(first, min(first + per_page, total))]
+            return _json(products, {"X-WP-Total": str(total),
+                                    "X-WP-TotalPages": str(math.ceil(total / per_page))})
+
+        if host == "air.bark.co" and path == "/collections/bookings/products.json":
+            limit = int(q.get("limit", 30))
+            first = (int(q.get("page", 1)) - 1) * limit
+            total = inv.bark_total()
+            return _json({"products": [inv.bark_product(i)
+                                       for i in range(first, min(first + limit, total))]})
+
+        if host == "air.bark.co" and path.startswith("/products/flight-"):
+            i = int(path.rsplit("-", 1)[1])
+            if i >= inv.bark_total():
+                return 404, {}, b"not found"
+            return _html(inv.bark_page_html(i))
+
+        if host == "booking.flytradewind.com" and path == "/VARS/Public/deeplink.aspx":
+            location = (f"/VARS/Public/FlightCal.aspx?Origin1={q.get('Origin1')}"
+                        f"&Destination1={q.get('Destination1')}"
+                        f"&DepartureDate1={q.get('DepartureDate1')}")
+            return 302, {"Location": location}, b""
+
+        if host == "booking.flytradewind.com" and path == "/VARS/Public/FlightCal.aspx":
+            return _html(inv.tradewind_html(q.get("Origin1"), q.get("Destination1"),
+                                            q.get("DepartureDate1")))
+
+        if host == "api.app.flyslate.com":
+            req = json.loads(body or b"{}")
+            if path == "/getAirportsAndMa":
+                return _json({"ap": SLATE_AIRPORTS})
+            direction = (req.get("directions") or [{}])[0]
+            if path == "/getCalendarSeatsPrices":
+                window = req.get("visibleDates", {})
+                return _json(inv.slate_calendar(direction.get("from"), direction.get("to"),
+                                                window.get("startDate"), window.get("endDate")))
+            if path == "/getPlaneBySeatList":
+                return _json(inv.slate_flights(direction.get("from"), direction.get("to"),
+                                               req.get("prevSelectedDates", [""])[0]))
+
+        return None
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                host = urlsplit(self.headers.get(UPSTREAM_HEADER, "")).netloc
+                parts = urlsplit(self.path)
+
+                delay = server.latency_ms
+                if server.jitter_ms:
+                    delay += server.rng.uniform(0, server.jitter_ms)
+                if delay:
+                    time.sleep(delay / 1000)
+
+                wait = server._throttle(host)
+                if wait:
+                    server._count("throttled")
+                    return self._send(429, {"Retry-After": str(math.ceil(wait))}, b"slow down")
+                if server.error_rate and server.rng.random() < server.error_rate:
+                    server._count("injected_errors")
+                    return self._send(503, {"Retry-After": "0"}, b"injected error")
+
+                try:
+                    result = server.route(host, self.command, parts.path,
+                                          parse_qs(parts.query), body)
+                except (ValueError, KeyError, TypeError) as e:
+                    result = 400, {"Content-Type": "text/plain"}, str(e).encode()
+                if result is None:
+                    server._count("missing")
+                    result = 404, {"Content-Type": "text/plain"}, b"no mock for this endpoint"
+                else:
+                    server._count("served")
+                self._send(*result)
+
+            def _send(self, status: int, headers: dict, body: bytes):
+                self.send_response(status)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = _handle
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def _json(data, headers: dict | None = None):
+    return 200, {"Content-Type": "application/json", **(headers or {})}, json.dumps(data).encode()
+
+
+def _html(text: str):
+    return 200, {"Content-Type": "text/html; charset=utf-8"}, text.encode()
+
+
+# ── Load runner ───────────────────────────────────────────────────────
+
+def _patch_scaled_routes(adapter, inventory: Inventory):
+    """Point the scraper at the scaled network instead of today's route list."""
+    mod = importlib.import_module(adapter.module)
+    if adapter.key == "jsx":
+        mod.ROUTES = inventory.jsx_routes()
+    elif adapter.key == "aero":
+        mod.ROUTES = inventory.aero_routes()
+    elif adapter.key == "tradewind":
+        mod.ROUTES = inventory.tradewind_routes()
+    elif adapter.key == "slate":
+        mod.DIRECTIONS = inventory.slate_directions()
+
+
+def run_load(args, adapters):
+    from bench_scrapers import bench_adapter
+
+    inventory = Inventory(scale=args.scale, seed=args.seed)
+    server = MockAirlineServer(inventory, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                               rate_limit=args.rate_limit, error_rate=args.error_rate,
+                               seed=args.seed).start()
+    out_dir = tempfile.mkdtemp(prefix="aviato-load-")
+
+    # Must be set before the scraper modules (and their HttpClients) are imported
+    os.environ[REPLAY_ENV] = server.url
+    os.environ.pop(RECORD_ENV, None)
+    os.environ["AVIATO_HTTP_CACHE"] = os.path.join(out_dir, ".http_cache")
+    os.environ.setdefault(DATE_ENV, inventory.today.strftime("%Y-%m-%d"))
+    os.chdir(out_dir)
+
+    print("=" * 60)
+    print(f"Aviato Scraper Load Test (mock airlines, scale {args.scale:g}x)")
+    print(f"Latency: {args.latency_ms:g} ms (+{args.jitter_ms:g} jitter), "
+          f"rate limit: {f'{args.rate_limit:g} req/s/host' if args.rate_limit else 'none'}, "
+          f"error rate: {args.error_rate:.0%}")
+    print("=" * 60, flush=True)
+
+    if args.trace_memory:
+        tracemalloc.start()
+    results = []
+    try:
+        for adapter in adapters:
+            if args.deadline is not None:
+                adapter = dataclasses.replace(adapter, deadline_s=min(adapter.deadline_s, args.deadline))
+            if args.concurrency is not None and adapter.concurrency is not None:
+                adapter = dataclasses.replace(adapter, concurrency=args.concurrency)
+            _patch_scaled_routes(adapter, inventory)
+            if args.trace_memory:
+                tracemalloc.reset_peak()
+
+            r = bench_adapter(adapter, server, out_dir, args.keep_delays, args.verbose)
+            peak = tracemalloc.get_traced_memory()[1] if args.trace_memory else None
+            max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            results.append(r)
+            timed_out = r["elapsed"] >= adapter.deadline_s
+            print(f"  {r['name']:<10} {r['elapsed']:8.2f}s / {adapter.deadline_s}s  "
+                  f"{r['requests']:6d} req  {r['rps']:7.1f} req/s  {r['retries']:4d} retries  "
+                  f"{r['errors']:4d} errors"
+                  + (f"  peak {peak / 1024 / 1024:6.1f} MB" if peak is not None else "")
+                  + f"  maxrss {max_rss_mb:6.1f} MB"
+                  + ("  DEADLINE" if timed_out else "")
+                  + ("" if r["ok"] else f"  FAILED: {r['error']!r}"), flush=True)
+    finally:
+        server.stop()
+        if args.trace_memory:
+            tracemalloc.stop()
+
+    print("-" * 60)
+    print(f"  Server: {server.stats}")
+    print(f"  Output files in {out_dir}")
+    return results
+
+
+def main():
+    from run_scrapers import ADAPTERS
+
+    parser = argparse.ArgumentParser(description="Mock airline APIs for load tests")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    def network_args(p):
+        p.add_argument("--scale", type=float, default=1.0,
+                       help="inventory multiplier (routes, products, directions)")
+        p.add_argument("--seed", type=int, default=0)
+        p.add_argument("--latency-ms", type=float, default=0)
+        p.add_argument("--jitter-ms", type=float, default=0)
+        p.add_argument("--rate-limit", type=float, default=None,
+                       help="per-host requests/second before answering 429")
+        p.add_argument("--error-rate", type=float, default=0.0,
+                       help="fraction of requests answered with 503")
+
+    serve = sub.add_parser("serve", help="run the mock server in the foreground")
+    network_args(serve)
+    serve.add_argument("--port", type=int, default=8798)
+
+    load = sub.add_parser("load", help="run scrapers against the mock server")
+    network_args(load)
+    load.add_argument("airlines", nargs="*", metavar="AIRLINE",
+                      help=f"subset to run: {', '.join(a.key for a in ADAPTERS)} (default: all)")
+    load.add_argument("--concurrency", type=int, default=None,
+                      help="override the adapters' concurrency")
+    load.add_argument("--deadline", type=int, default=None,
+                      help="cap every adapter's deadline at this many seconds")
+    load.add_argument("--keep-delays", action="store_true",
+                      help="keep the scrapers' politeness delays")
+    load.add_argument("--trace-memory", action="store_true",
+                      help="report per-scraper peak Python heap (tracemalloc; slower)")
+    load.add_argument("-v", "--verbose", action="store_true", help="show scraper output")
+    args = parser.parse_args()
+
+    if args.cmd == "serve":
+        server = MockAirlineServer(Inventory(scale=args.scale, seed=args.seed), port=args.port,
+                                   latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                                   rate_limit=args.rate_limit, error_rate=args.error_rate,
+                                   seed=args.seed)
+        print(f"Mock airlines (scale {args.scale:g}x) on {server.url}")
+        print(f"  {REPLAY_ENV}={server.url} python run_scrapers.py")
+        print("  (route lists are only scaled by `mock_airlines.py load`)")
+        try:
+            server.httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            print(f"\n  {server.stats}")
+        return
+
+    by_key = {a.key: a for a in ADAPTERS}
+    unknown = [k for k in args.airlines if k not in by_key]
+    if unknown:
+        parser.error(f"unknown airline(s): {', '.join(unknown)}")
+    run_load(args, [by_key[k] for k in args.airlines] if args.airlines else ADAPTERS)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+price_history.py — Append-only price history of every flight in the store,
+in SQLite (scrapers/price_history.db, WAL mode).
+
+previous_prices.json held one snapshot, yesterday's cheapest price per
+route, and was overwritten every run. The history keeps every price each
+flight has had instead, so it can answer "lowest in the last 30 days" or
+"how has the fare for this date moved". find_drops() is a query comparing
+two recorded days' cheapest price per route, and find_flight_drops()
+sort-merges their full listings to compare every flight.
+
+A flight is (route, flight date, departure time, airline), at the lowest
+price among its entries in the store. Recording the store appends a row
+
+    (route, flight_date, dep, airline, observed) -> price
+
+only for flights whose price changed since the last record, and one with
+price NULL for flights no longer listed, so the file grows with the number
+of fare changes rather than flights x days (a year of daily snapshots of
+every flight would be hundreds of MB). Recording again the same day
+overwrites that day's rows. "current" holds each listed flight's latest
+price, so a record only compares against it, and "recorded" lists the days
+recorded. check_price_drops.py records the store once a day, before
+looking for drops.
+
+The listing on any recorded day is current with the flights changed since
+then rolled back to their row on or before that day:
+
+    primary key   (route, flight_date, dep, airline, observed)   roll back a flight, history()
+    by_observed   (observed)                                     flights changed since a day
+
+WAL mode lets a reader query while an updater writes, and concurrent
+updaters wait for each other (busy timeout) instead of failing. Closing the
+last connection checkpoints the WAL back into the .db file.
+
+The .db is not committed: a binary copy a day would grow the repo by
+megabytes a year. The price alerts workflow, the only one that records,
+restores it from the Actions cache before checking and saves it back after.
+Losing the cache only loses history; the next run starts a new one.
+
+Run from the scrapers/ directory:
+    python price_history.py lowest HPN-ACK --days 30
+    python price_history.py history HPN-ACK 2026-11-02
+    python price_history.py snapshot [2026-10-19]
+    python price_history.py drops [2026-10-19] --min-savings 50 --min-percent 10
+    python price_history.py record                     # the flight store, as of today
+    python price_history.py import previous_prices.json
+"""
+
+import argparse
+import sqlite3
+import sys
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import flight_store
+import jsonio
+import ts_reader
+from ts_reader import FlightPrice
+
+HISTORY_PATH = Path(__file__).parent / "price_history.db"
+
+# Seconds a writer waits for another one to finish
+BUSY_TIMEOUT = 30
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS prices (
+    route       TEXT NOT NULL,
+    flight_date TEXT NOT NULL,      -- '' for entries without a date
+    dep         TEXT NOT NULL,      -- departure time as listed ('7:00 AM'), or ''
+    airline     TEXT NOT NULL,
+    observed    TEXT NOT NULL,      -- YYYY-MM-DD (UTC) the price was recorded
+    price       INTEGER,            -- NULL: no longer listed
+    PRIMARY KEY (route, flight_date, dep, airline, observed)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS by_observed ON prices (observed);
+CREATE TABLE IF NOT EXISTS current (
+    route       TEXT NOT NULL,
+    flight_date TEXT NOT NULL,
+    dep         TEXT NOT NULL,
+    airline     TEXT NOT NULL,
+    price       INTEGER NOT NULL,
+    PRIMARY KEY (route, flight_date, dep, airline)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS recorded (observed TEXT PRIMARY KEY) WITHOUT ROWID;
+"""
+
+# Flights listed at the end of :day, with their price then: current, with
+# every flight that changed after :day rolled back to its last row up to it
+_LISTING = """
+    SELECT route, flight_date, dep, airline, price FROM current c
+    WHERE NOT EXISTS (SELECT 1 FROM prices p
+                      WHERE p.route = c.route AND p.flight_date = c.flight_date AND p.dep = c.dep
+                            AND p.airline = c.airline AND p.observed > :{day})
+    UNION ALL
+    SELECT route, flight_date, dep, airline,
+           (SELECT price FROM prices p
+            WHERE p.route = c.route AND p.flight_date = c.flight_date AND p.dep = c.dep
+                  AND p.airline = c.airline AND p.observed <= :{day}
+            ORDER BY p.observed DESC LIMIT 1)
+    FROM (SELECT DISTINCT route, flight_date, dep, airline FROM prices INDEXED BY by_observed
+          WHERE observed > :{day}) c
+"""
+
+# Cheapest listed price per route at the end of :day (ties go to the airline
+# first in alphabetical order)
+_CHEAPEST = """
+    SELECT route, airline, price FROM (
+        SELECT route, airline, price,
+               ROW_NUMBER() OVER (PARTITION BY route ORDER BY price, airline) AS n
+        FROM ({listing}) WHERE price IS NOT NULL)
+    WHERE n = 1
+"""
+
+
+def today() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+@contextmanager
+def connect(path: Path = HISTORY_PATH) -> Iterator[sqlite3.Connection]:
+    """Open (creating if needed) the history; commits on success."""
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+# ── Recording ─────────────────────────────────────────────────────────
+
+def store_prices(store: dict) -> Iterator[FlightPrice]:
+    """FlightPrice of every stored entry, in file order."""
+    for block in store["flights"]:
+        route = block.get("route")
+        for entry in ts_reader.stored_entries(block.get("entries", ())):
+            row = ts_reader.price_of(entry, route)
+            if row is not None:
+                yield row
+
+
+def record(conn: sqlite3.Connection, rows: Iterable[FlightPrice], observed: str | None = None) -> int:
+    """
+    Record rows, every flight listed on observed (default today): flights
+    missing from rows are recorded as no longer listed. Days are recorded
+    in order; observed may not be before the last recorded day. Returns the
+    number of flights whose price changed.
+    """
+    observed = observed or today()
+    last = last_day(conn)
+    if last is not None and observed < last:
+        raise ValueError(f"price history is already recorded up to {last}, can't record {observed}")
+    lowest: dict[tuple[str, str, str, str], int] = {}
+    for row in rows:
+        key = (row.route, row.date, row.dep, row.airline)
+        if key not in lowest or row.price < lowest[key]:
+            lowest[key] = row.price
+    current = {(route, flight_date, dep, airline): price for route, flight_date, dep, airline, price
+               in conn.execute("SELECT route, flight_date, dep, airline, price FROM current")}
+    changed = [(*key, price) for key, price in lowest.items() if current.get(key) != price]
+    gone = [key for key in current if key not in lowest]
+
+    conn.executemany("""
+        INSERT INTO prices (route, flight_date, dep, airline, observed, price) VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (route, flight_date, dep, airline, observed) DO UPDATE SET price = excluded.price
+    """, [(route, flight_date, dep, airline, observed, price)
+          for route, flight_date, dep, airline, price in changed + [(*key, None) for key in gone]])
+    conn.executemany("INSERT OR REPLACE INTO current VALUES (?, ?, ?, ?, ?)", changed)
+    conn.executemany("DELETE FROM current WHERE route = ? AND flight_date = ? AND dep = ? AND airline = ?",
+                     gone)
+    conn.execute("INSERT OR IGNORE INTO recorded VALUES (?)", (observed,))
+    return len(changed) + len(gone)
+
+
+def record_store(store: dict, observed: str | None = None, path: Path = HISTORY_PATH) -> int:
+    """Record every priced flight in the store (see record)."""
+    with connect(path) as conn:
+        return record(conn, store_prices(store), observed)
+
+
+def import_snapshot(conn: sqlite3.Connection, prices: dict[str, dict]) -> int:
+    """
+    Record a previous_prices.json snapshot ({route: {"price", "airline",
+    "date"}}) as undated flights, without departure times, listed on its date (today if it has none).
+    A snapshot older than every recorded day (the updater usually records
+    today's store first) goes in before them, its flights no longer listed
+    from the first recorded day on.
+    """
+    observed = max((info.get("date") or today() for info in prices.values()), default=today())
+    rows = [FlightPrice(route, info["airline"], int(info["price"]), "") for route, info in prices.items()]
+    first = conn.execute("SELECT MIN(observed) FROM recorded").fetchone()[0]
+    if first is None or observed >= last_day(conn):
+        return record(conn, rows, observed)
+    if observed >= first:
+        raise ValueError(f"price history already has days around {observed}, can't import a snapshot of it")
+    keys = {(row.route, row.airline): row.price for row in rows}
+    conn.executemany("INSERT OR IGNORE INTO prices VALUES (?, '', '', ?, ?, ?)",
+                     [(route, airline, day, price) for (route, airline), price in keys.items()
+                      for day, price in ((observed, price), (first, None))])
+    conn.execute("INSERT OR IGNORE INTO recorded VALUES (?)", (observed,))
+    return len(keys)
+
+
+# ── Queries ───────────────────────────────────────────────────────────
+
+def last_day(conn: sqlite3.Connection) -> str | None:
+    """Last recorded day, or None."""
+    return conn.execute("SELECT MAX(observed) FROM recorded").fetchone()[0]
+
+
+def previous_day(conn: sqlite3.Connection, before: str) -> str | None:
+    """Latest recorded day before the given one, or None."""
+    return conn.execute("SELECT MAX(observed) FROM recorded WHERE observed < ?", (before,)).fetchone()[0]
+
+
+def snapshot(conn: sqlite3.Connection, observed: str) -> dict[str, dict]:
+    """
+    Cheapest price per route listed at the end of observed:
+    { "HPN-ACK": {"price": 795, "airline": "Tradewind"} }
+    """
+    rows = conn.execute(_CHEAPEST.format(listing=_LISTING.format(day="day")), {"day": observed})
+    return {route: {"price": price, "airline": airline} for route, airline, price in rows}
+
+
+def find_drops(conn: sqlite3.Connection, observed: str | None = None) -> list[dict]:
+    """
+    Routes whose cheapest price on observed (default today) is below their
+    cheapest on the previous recorded day, biggest savings first.
+    Each drop: {"route": "HPN-ACK", "airline": "Tradewind",
+                "old_price": 795, "new_price": 695, "savings": 100}
+    """
+    observed = observed or today()
+    previous = previous_day(conn, observed)
+    if previous is None:
+        return []
+    rows = conn.execute(f"""
+        WITH cur AS ({_CHEAPEST.format(listing=_LISTING.format(day="cur"))}),
+             prev AS ({_CHEAPEST.format(listing=_LISTING.format(day="prev"))})
+        SELECT cur.route, cur.airline, prev.price, cur.price
+        FROM cur JOIN prev USING (route)
+        WHERE cur.price < prev.price
+        ORDER BY prev.price - cur.price DESC, cur.route
+    """, {"cur": observed, "prev": previous})
+    return [{"route": route, "airline": airline, "old_price": old, "new_price": new,
+             "savings": old - new} for route, airline, old, new in rows]
+
+
+def listing(conn: sqlite3.Connection, observed: str) -> list[tuple[tuple[str, str, str, str], int]]:
+    """
+    Every flight listed at the end of observed, sorted by flight:
+    [((route, flight_date, dep, airline), price)]
+    """
+    # Sorted by SQLite (byte order of UTF-8, the same as Python's str order);
+    # nothing has changed since the last recorded day, so that one is current
+    if observed >= (last_day(conn) or ""):
+        rows = conn.execute("SELECT route, flight_date, dep, airline, price FROM current "
+                            "ORDER BY route, flight_date, dep, airline")
+    else:
+        rows = conn.execute(f"""
+            SELECT * FROM ({_LISTING.format(day="day")}) WHERE price IS NOT NULL
+            ORDER BY route, flight_date, dep, airline
+        """, {"day": observed})
+    return [((route, flight_date, dep, airline), price) for route, flight_date, dep, airline, price in rows]
+
+
+def merge_drops(current: list, previous: list, min_savings: int = 1, min_percent: float = 0) -> list[dict]:
+    """
+    Flights in both listings (sorted, as listing() returns them) whose price
+    fell by at least min_savings dollars and min_percent percent, biggest
+    savings first. One pass down both lists, so comparing two days costs
+    no more than sorting them.
+    Each drop: {"route": "HPN-ACK", "date": "2026-11-02", "dep": "7:00 AM",
+                "airline": "Tradewind", "old_price": 795, "new_price": 595,
+                "savings": 200, "percent": 25.2}
+    """
+    min_savings = max(min_savings, 1)
+    drops = []
+    i = j = 0
+    while i < len(current) and j < len(previous):
+        key, new = current[i]
+        old_key, old = previous[j]
+        if key == old_key:      # most flights are listed both days
+            savings = old - new
+            if savings >= min_savings and savings * 100 >= min_percent * old:
+                route, flight_date, dep, airline = key
+                drops.append({"route": route, "date": flight_date, "dep": dep, "airline": airline,
+                              "old_price": old, "new_price": new, "savings": savings,
+                              "percent": round(savings * 100 / old, 1)})
+            i += 1
+            j += 1
+        elif key < old_key:
+            i += 1
+        else:
+            j += 1
+    drops.sort(key=lambda d: -d["savings"])
+    return drops
+
+
+def find_flight_drops(conn: sqlite3.Connection, observed: str | None = None,
+                      min_savings: int = 1, min_percent: float = 0) -> list[dict]:
+    """
+    Flights (route, date, departure, airline) whose price on observed
+    (default today) is below their price on the previous recorded day, by
+    at least min_savings dollars and min_percent percent (see merge_drops).
+    Unlike find_drops, a drop shows even when another date on the route is
+    cheaper.
+    """
+    observed = observed or today()
+    previous = previous_day(conn, observed)
+    if previous is None:
+        return []
+    return merge_drops(listing(conn, observed), listing(conn, previous), min_savings, min_percent)
+
+
+def lowest_since(conn: sqlite3.Connection, route: str, since: str) -> dict | None:
+    """
+    Lowest price listed on route from since (YYYY-MM-DD) on, or None:
+    prices recorded since then, and those already in effect on since.
+    """
+    row = conn.execute("""
+        SELECT price, airline, flight_date, dep, observed FROM prices p
+        WHERE route = :route AND price IS NOT NULL
+              AND (observed > :since OR observed = (
+                  SELECT MAX(observed) FROM prices q
+                  WHERE q.route = p.route AND q.flight_date = p.flight_date AND q.dep = p.dep
+                        AND q.airline = p.airline AND q.observed <= :since))
+        ORDER BY price, observed LIMIT 1
+    """, {"route": route, "since": since}).fetchone()
+    if row is None:
+        return None
+    price, airline, flight_date, dep, observed = row
+    return {"price": price, "airline": airline, "date": flight_date, "dep": dep, "observed": observed}
+
+
+def history(conn: sqlite3.Connection, route: str, flight_date: str) -> list[dict]:
+    """
+    Every price change of route's flights on flight_date, oldest first
+    (price None: no longer listed from that day).
+    """
+    rows = conn.execute("""
+        SELECT observed, dep, airline, price FROM prices
+        WHERE route = ? AND flight_date = ? ORDER BY observed, dep, airline
+    """, (route, flight_date))
+    return [{"observed": observed, "dep": dep, "airline": airline, "price": price}
+            for observed, dep, airline, price in rows]
+
+
+# ── CLI ───────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the flight price history")
+    parser.add_argument("--db", type=Path, default=HISTORY_PATH)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("lowest", help="lowest price on a route in the last N days")
+    p.add_argument("route")
+    p.add_argument("--days", type=int, default=30)
+    p = sub.add_parser("history", help="prices seen over time for one flight date")
+    p.add_argument("route")
+    p.add_argument("date")
+    p = sub.add_parser("snapshot", help="cheapest price per route on one observed day")
+    p.add_argument("date", nargs="?")
+    p = sub.add_parser("drops", help="flights whose price dropped since the day before")
+    p.add_argument("date", nargs="?")
+    p.add_argument("--min-savings", type=int, default=1, help="dollars")
+    p.add_argument("--min-percent", type=float, default=0)
+    p = sub.add_parser("record", help="record the flight store as seen today")
+    p = sub.add_parser("import", help="import a previous_prices.json snapshot")
+    p.add_argument("path", type=Path)
+    args = parser.parse_args()
+
+    with connect(args.db) as conn:
+        if args.cmd == "lowest":
+            since = (date.fromisoformat(today()) - timedelta(days=args.days)).isoformat()
+            best = lowest_since(conn, args.route, since)
+            if best is None:
+                sys.exit(f"No prices for {args.route} since {since}")
+            print(f"{args.route}: ${best['price']:,} ({best['airline']}, "
+                  f"flight {best['date'] or 'undated'} {best['dep']}, seen {best['observed']})")
+        elif args.cmd == "history":
+            for row in history(conn, args.route, args.date):
+                price = f"${row['price']:,}" if row["price"] is not None else "no longer listed"
+                print(f"{row['observed']}  {row['dep'] or '-':>8}  {row['airline']:<12} {price}")
+        elif args.cmd == "snapshot":
+            for route, info in sorted(snapshot(conn, args.date or last_day(conn) or "").items()):
+                print(f"{route:<9} ${info['price']:>7,}  {info['airline']}")
+        elif args.cmd == "drops":
+            for d in find_flight_drops(conn, args.date or last_day(conn), args.min_savings, args.min_percent):
+                print(f"{d['route']:<9} {d['date'] or 'undated':<10} {d['dep'] or '-':>8}  {d['airline']:<12} "
+                      f"${d['old_price']:>7,} → ${d['new_price']:>7,}  (-{d['percent']}%)")
+        elif args.cmd == "record":
+            store = flight_store.load_store()
+            if store is None:
+                sys.exit(f"{flight_store.STORE_PATH} not found")
+            print(f"Recorded {record(conn, store_prices(store))} price changes")
+        else:
+            print(f"Imported {import_snapshot(conn, jsonio.load(args.path))} routes")
+
+
+if __name__ == "__main__":
+    main()
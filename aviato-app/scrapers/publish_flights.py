@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+publish_flights.py — Apply scraped flights on top of the latest main and
+push, retrying when another workflow pushed first.
+
+The scraper workflows used to be staggered by cron because each one ran
+update_flights.py on its own checkout, committed flights.ts and the files
+generated with it, and then `git pull --rebase || true`: two runs that
+overlapped conflicted on those files and one update was lost. Now each
+workflow publishes through this script, which loops:
+
+  1. fetch origin/main and reset the data files to it (scraper output is
+     untracked and stays put)
+  2. update_flights.py --only <this workflow's airlines>: only their
+     entries are replaced, so every other airline keeps what main has, and
+     output older than what main already applied for an airline is skipped
+  3. commit the data files and push; if the push is rejected because main
+     moved, wait a little and start again from 1
+
+Every attempt rebuilds from what is on main at that moment, so nothing is
+ever merged textually and no airline's newer data is overwritten.
+
+Run from the scrapers/ directory:
+    python publish_flights.py --only Tradewind --message "Auto-update Tradewind flight data"
+    python publish_flights.py --only JSX Aero "BARK Air" "K9 Jets" --attempts 8
+"""
+
+import argparse
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import flight_partitions
+import flight_store
+import route_index
+import search_payloads
+import update_flights
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+# Everything update_flights.py writes (and the workflows commit)
+DATA_PATHS = [
+    flight_store.FLIGHTS_TS, flight_store.STORE_PATH,
+    route_index.ROUTE_INDEX_TS, route_index.DATE_INDEX_TS,
+    flight_partitions.PARTITIONS_DIR, search_payloads.SEARCH_DIR,
+]
+
+DEFAULT_ATTEMPTS = 5
+BACKOFF_SECONDS = 5
+
+
+def git(*args: str, check: bool = True) -> subprocess.CompletedProcess:
+    return subprocess.run(["git", *args], cwd=REPO_ROOT, check=check,
+                          capture_output=True, text=True)
+
+
+def _data_args() -> list[str]:
+    return [str(Path(p).resolve().relative_to(REPO_ROOT)) for p in DATA_PATHS]
+
+
+def local_changes() -> list[str]:
+    """Modified tracked files outside DATA_PATHS (which a reset would discard)."""
+    data = _data_args()
+    changed = git("status", "--porcelain", "--untracked-files=no").stdout.splitlines()
+    paths = [line[3:] for line in changed]
+    return [p for p in paths if not any(p == d or p.startswith(d + "/") for d in data)]
+
+
+def publish_once(airlines: list[str], message: str, remote: str, branch: str) -> bool | None:
+    """
+    One fetch/update/commit/push round. True if pushed, None if there was
+    nothing to commit, False if the push was rejected.
+    """
+    git("fetch", remote, branch)
+    git("reset", "--hard", f"{remote}/{branch}")
+    cmd = [sys.executable, "update_flights.py"] + (["--only", *airlines] if airlines else [])
+    subprocess.run(cmd, cwd=SCRIPT_DIR, check=True)
+    # /api/search serves the payloads as they are, so they must match flights.ts
+    subprocess.run([sys.executable, "search_payloads.py", "--check"], cwd=SCRIPT_DIR, check=True)
+
+    git("add", "--all", "--", *_data_args())
+    if git("diff", "--cached", "--quiet", check=False).returncode == 0:
+        return None
+    git("commit", "-m", message)
+    push = git("push", remote, f"HEAD:{branch}", check=False)
+    if push.returncode != 0:
+        print(push.stderr.strip())
+    return push.returncode == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Update flight data on the latest main and push")
+    parser.add_argument("--only", nargs="+", metavar="AIRLINE", default=[],
+                        choices=[airline for airline, _, _ in update_flights.SOURCES],
+                        help="airlines to apply (default: every airline with output)")
+    parser.add_argument("--message", default=f"Auto-update flight data {time.strftime('%Y-%m-%d')}")
+    parser.add_argument("--attempts", type=int, default=DEFAULT_ATTEMPTS)
+    parser.add_argument("--remote", default="origin")
+    parser.add_argument("--branch", default="main")
+    args = parser.parse_args()
+
+    blocking = local_changes()
+    if blocking:
+        sys.exit("Refusing to reset: uncommitted changes in " + ", ".join(blocking))
+
+    for attempt in range(1, args.attempts + 1):
+        print(f"\n── Publish attempt {attempt}/{args.attempts} ──")
+        pushed = publish_once(args.only, args.message, args.remote, args.branch)
+        if pushed is None:
+            print("No flight data changes to commit")
+            return
+        if pushed:
+            print(f"Pushed to {args.remote}/{args.branch}")
+            return
+        if attempt < args.attempts:
+            wait = BACKOFF_SECONDS * attempt + random.uniform(0, BACKOFF_SECONDS)
+            print(f"Push rejected ({args.branch} moved) — rebuilding in {wait:.0f}s")
+            time.sleep(wait)
+    sys.exit(f"Gave up after {args.attempts} attempts — will retry next run")
+
+
+if __name__ == "__main__":
+    main()
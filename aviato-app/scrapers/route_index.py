@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+route_index.py — Builds app/data/routeIndex.ts and dateIndex.ts from the
+flight store.
+
+helpers.ts used to derive reachability at runtime: build KNOWN_ROUTES from
+every FLIGHTS key, then scan all of them with startsWith/endsWith for each
+airport of an expanded metro on every call. This module does that once, at
+update time, and emits two lookup tables:
+
+    REACHABLE_FROM['LA']  -> every airport with a flight from LAX/BUR/VNY/SMO
+    REACHABLE_TO['ACK']   -> every airport with a flight to ACK
+
+Keys are airport codes and metro codes (metros taken from locations.ts), so
+getReachableFrom/getReachableTo become a single object lookup. Semantics
+match the old helpers: only route arrays with at least one entry count, and
+for a route key that appears twice the last array wins, as it does in a JS
+object literal.
+
+It also writes app/data/dateIndex.ts. Route arrays are sorted by date (see
+flight_store.sort_routes), so each date's flights are one contiguous slice:
+
+    ROUTE_DATE_INDEX['BUR-LAS']['2026-10-19'] -> [12, 15]
+    FLIGHTS['BUR-LAS'].slice(12, 15)           // that day's flights
+
+Offsets count array elements, i.e. flights, not comment lines; flights
+without a date are under 'undated'. Kept in its own module so pages that only
+need reachability don't bundle it.
+
+update_flights.py regenerates both files after every update; each is only
+rewritten when its content changes. helpers.ts imports routeIndex.ts, so
+`npm run build` also runs this first (package.json "prebuild"): a checkout
+that no update has run on yet still builds, indexed from flights.ts when
+there is no store.
+
+Run from the scrapers/ directory:
+    python route_index.py      # regenerate from app/data/flights_store.json (or flights.ts)
+"""
+
+import os
+import re
+import sys
+from pathlib import Path
+
+import flight_store
+
+LOCATIONS_TS = flight_store.DATA_DIR / "locations.ts"
+ROUTE_INDEX_TS = flight_store.DATA_DIR / "routeIndex.ts"
+DATE_INDEX_TS = flight_store.DATA_DIR / "dateIndex.ts"
+UNDATED = "undated"
+
+# { code: 'LA', type: 'metro', ... airports: ['LAX','BUR','VNY','SMO'] }
+_METRO_RE = re.compile(r"code:\s*'([A-Z]+)',\s*type:\s*'metro'[^}]*?airports:\s*\[([^\]]*)\]")
+_CODE_RE = re.compile(r"'([A-Z]+)'")
+
+
+def load_metros(path: Path = LOCATIONS_TS) -> dict[str, list[str]]:
+    """{metro_code: [airport, ...]} from the LOCATIONS list in locations.ts."""
+    try:
+        content = Path(path).read_text()
+    except FileNotFoundError:
+        print(f"  [route index] {path} not found — airport-level index only")
+        return {}
+    return {m.group(1): _CODE_RE.findall(m.group(2)) for m in _METRO_RE.finditer(content)}
+
+
+def known_routes(store: dict) -> set[tuple[str, str]]:
+    """(origin, destination) of every route array that has flights."""
+    last: dict[str, int] = {}
+    for block in store["flights"]:
+        if "route" in block:
+            last[block["route"]] = len(block["entries"])
+    return {tuple(rk.split("-")) for rk, n in last.items() if n > 0}
+
+
+def build_index(store: dict, metros: dict[str, list[str]]) -> tuple[dict, dict]:
+    """(reachable_from, reachable_to), each {code: sorted [airport, ...]}."""
+    dests: dict[str, set[str]] = {}
+    origins: dict[str, set[str]] = {}
+    for dc, ac in known_routes(store):
+        dests.setdefault(dc, set()).add(ac)
+        origins.setdefault(ac, set()).add(dc)
+
+    # A metro code expands to its airports (and only them), like expandCode()
+    for metro, airports in metros.items():
+        from_metro = set().union(*(dests.get(a, ()) for a in airports))
+        to_metro = set().union(*(origins.get(a, ()) for a in airports))
+        dests.pop(metro, None)
+        origins.pop(metro, None)
+        if from_metro:
+            dests[metro] = from_metro
+        if to_metro:
+            origins[metro] = to_metro
+
+    return ({k: sorted(v) for k, v in dests.items()},
+            {k: sorted(v) for k, v in origins.items()})
+
+
+def _ts_table(name: str, table: dict[str, list[str]]) -> list[str]:
+    lines = [f"export const {name}: Record<string, string[]> = {{"]
+    for code in sorted(table):
+        codes = ",".join(f"'{c}'" for c in table[code])
+        lines.append(f"  '{code}': [{codes}],")
+    lines.append("};")
+    return lines
+
+
+def render_index(reachable_from: dict, reachable_to: dict) -> str:
+    lines = [
+        "// Generated by scrapers/route_index.py from flights_store.json — do not edit.",
+        "// Airport and metro code -> airports reachable in one flight.",
+        "",
+        *_ts_table("REACHABLE_FROM", reachable_from),
+        "",
+        *_ts_table("REACHABLE_TO", reachable_to),
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def _write_if_changed(path: Path, content: str) -> bool:
+    try:
+        if Path(path).read_text() == content:
+            return False
+    except FileNotFoundError:
+        pass
+    tmp = Path(f"{path}.tmp")
+    tmp.write_text(content)
+    os.replace(tmp, path)
+    return True
+
+
+def write_route_index(store: dict, path: Path = ROUTE_INDEX_TS,
+                      locations_ts: Path = LOCATIONS_TS) -> bool:
+    """Regenerate routeIndex.ts; returns False if it was already up to date."""
+    return _write_if_changed(path, render_index(*build_index(store, load_metros(locations_ts))))
+
+
+# ── Date offsets ──────────────────────────────────────────────────────
+
+def build_date_index(store: dict) -> dict[str, dict[str, list[int]]]:
+    """
+    {route_key: {date: [start, end]}} over each route's flights (the last
+    array of a route, as in the object literal). Raises ValueError if an
+    array isn't sorted by date, since its slices would be wrong.
+    """
+    last: dict[str, list[dict]] = {}
+    for block in store["flights"]:
+        if "route" in block:
+            last[block["route"]] = block["entries"]
+
+    index: dict[str, dict[str, list[int]]] = {}
+    for route_key, entries in last.items():
+        dates: dict[str, list[int]] = {}
+        prev = ""
+        pos = 0
+        for e in entries:
+            n = len(flight_store.entry_airlines(e))
+            if not n:
+                continue  # comment line, not an array element
+            date = flight_store.entry_date(e)
+            if date < prev:
+                raise ValueError(f"{route_key} is not sorted by date ({prev} before {date})")
+            prev = date
+            span = dates.setdefault(date or UNDATED, [pos, pos])
+            span[1] = pos + n
+            pos += n
+        if dates:
+            index[route_key] = dates
+    return index
+
+
+def render_date_index(index: dict[str, dict[str, list[int]]]) -> str:
+    lines = [
+        "// Generated by scrapers/route_index.py from flights_store.json — do not edit.",
+        "// Route -> date -> [start, end) offsets into FLIGHTS[route] (sorted by date).",
+        "",
+        "export const ROUTE_DATE_INDEX: Record<string, Record<string, [number, number]>> = {",
+    ]
+    for route_key in sorted(index):
+        spans = ",".join(f"'{d}':[{a},{b}]" for d, (a, b) in index[route_key].items())
+        lines.append(f"  '{route_key}': {{{spans}}},")
+    lines += ["};", ""]
+    return "\n".join(lines)
+
+
+def write_date_index(store: dict, path: Path = DATE_INDEX_TS) -> bool:
+    """Regenerate dateIndex.ts; returns False if it was already up to date."""
+    return _write_if_changed(path, render_date_index(build_date_index(store)))
+
+
+def main():
+    store = flight_store.load_store()
+    if store is None:
+        # Before the first update there is no store yet; read flights.ts as is
+        if not flight_store.FLIGHTS_TS.exists():
+            sys.exit(f"Neither {flight_store.STORE_PATH} nor {flight_store.FLIGHTS_TS} found")
+        print(f"{flight_store.STORE_PATH.name} not found — indexing {flight_store.FLIGHTS_TS.name}")
+        store = flight_store.bootstrap(flight_store.FLIGHTS_TS.read_text())
+    for path, write in ((ROUTE_INDEX_TS, write_route_index), (DATE_INDEX_TS, write_date_index)):
+        print(f"Wrote {path}" if write(store) else f"{path} is up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+run_scrapers.py — Runs the airline scrapers concurrently in one process.
+
+Each scraper is loaded as an adapter (module + entry point + limits) and run
+on a shared asyncio event loop. The scrapers themselves are blocking
+(requests), so every adapter gets its own worker thread; because each airline
+talks to a different host, total wall-clock time is roughly that of the
+slowest airline instead of the sum of all of them.
+
+Per-airline limits:
+  - concurrency: passed to the scraper as its number of parallel requests
+    (only for scrapers that support it; Tradewind and Slate stay sequential
+    to remain polite to a single host).
+  - deadline: seconds from start. Passed to the scraper, which stops
+    starting new requests once it has passed and saves what it has. The
+    orchestrator waits a short grace period after that and then gives up on
+    the adapter.
+
+Output from each scraper, including from its request pool (a
+http_client.RequestPool, whose workers inherit the scraper thread's
+contextvars), is buffered and printed as one block when it finishes, so
+the CI log stays readable. The buffer is found through a ContextVar, so no
+other thread in the process is touched.
+
+Tradewind and Slate have adapters, but CI runs them as their own jobs
+(scrape-tradewind.yml, scrape-slate.yml), started at the same time as this
+one, so they already run concurrently with it. They take up to 80 and 50
+minutes; in the shared job they would hold back the other airlines' publish
+until they finished and push its timeout from 45 to 90 minutes. Each job
+publishes through publish_flights.py, which merges safely.
+
+Run from the scrapers/ directory:
+    python run_scrapers.py                     # all airlines
+    python run_scrapers.py jsx aero bark k9jets
+    python run_scrapers.py --deadline 1500     # cap every adapter at 25 min
+"""
+
+import argparse
+import asyncio
+import contextvars
+import importlib
+import io
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Grace period after an adapter's deadline before we stop waiting for it
+DEADLINE_GRACE_S = 60
+
+
+@dataclass
+class Adapter:
+    key: str                        # CLI name
+    name: str                       # display name
+    module: str                     # scraper module to import
+    entry: str = "main"             # entry point: fn(deadline=..., [concurrency=...])
+    concurrency: int | None = None  # None -> scraper doesn't take the argument
+    deadline_s: int = 600
+
+
+ADAPTERS = [
+    Adapter("jsx", "JSX", "jsx_scraper", concurrency=10, deadline_s=1200),
+    Adapter("aero", "Aero", "aero_scraper", concurrency=4, deadline_s=600),
+    Adapter("bark", "BARK Air", "bark_air_scraper", concurrency=2, deadline_s=600),
+    Adapter("k9jets", "K9 Jets", "k9jets_scraper", concurrency=4, deadline_s=300),
+    Adapter("tradewind", "Tradewind", "tradewind_scraper", deadline_s=4800),
+    Adapter("slate", "Slate", "slate_scraper", entry="scrape_all_flights", deadline_s=3000),
+]
+
+
+# ── Per-adapter output capture ────────────────────────────────────────
+
+# Buffer of the adapter whose context is running; None outside any adapter
+_SINK: contextvars.ContextVar[io.StringIO | None] = contextvars.ContextVar("scraper_output", default=None)
+
+
+class _ThreadRouter(io.TextIOBase):
+    """
+    sys.stdout replacement that sends writes made in an adapter's context
+    (its thread, and RequestPool workers started from it) to that adapter's
+    buffer. Writes from anywhere else go straight through.
+    """
+
+    def __init__(self, passthrough):
+        self.passthrough = passthrough
+
+    def write(self, s):
+        buf = _SINK.get()
+        if buf is not None:
+            return buf.write(s)
+        return self.passthrough.write(s)
+
+    def flush(self):
+        self.passthrough.flush()
+
+    def install(self):
+        sys.stdout = self
+
+    def uninstall(self):
+        sys.stdout = self.passthrough
+
+
+def _run_adapter_thread(adapter: Adapter, deadline: float,
+                        loop: asyncio.AbstractEventLoop, fut: asyncio.Future):
+    """Thread body: import the scraper, run its entry point, resolve fut."""
+    buf = io.StringIO()
+    # A new thread starts in an empty context, so this stays with the adapter
+    _SINK.set(buf)
+    started = time.time()
+    error = None
+    try:
+        mod = importlib.import_module(adapter.module)
+        kwargs = {"deadline": deadline}
+        if adapter.concurrency is not None:
+            kwargs["concurrency"] = adapter.concurrency
+        getattr(mod, adapter.entry)(**kwargs)
+    except BaseException as e:  # SystemExit from a scraper is a failure too
+        error = e
+    result = (buf.getvalue(), error, time.time() - started)
+    loop.call_soon_threadsafe(lambda: fut.done() or fut.set_result(result))
+
+
+async def run_adapter(adapter: Adapter, run_start: float, run_deadline_s: int | None) -> dict:
+    loop = asyncio.get_running_loop()
+    budget = adapter.deadline_s
+    if run_deadline_s is not None:
+        budget = min(budget, run_deadline_s)
+    deadline = run_start + budget
+
+    fut = loop.create_future()
+    # Daemon thread: an adapter that ignores its deadline can't keep the process alive
+    threading.Thread(
+        target=_run_adapter_thread,
+        args=(adapter, deadline, loop, fut),
+        name=f"scraper-{adapter.key}",
+        daemon=True,
+    ).start()
+
+    try:
+        output, error, elapsed = await asyncio.wait_for(
+            fut, timeout=budget + DEADLINE_GRACE_S)
+    except asyncio.TimeoutError:
+        output, error, elapsed = "", TimeoutError("did not finish within deadline"), time.time() - run_start
+
+    header = f"{'─' * 20} {adapter.name} ({elapsed:.0f}s) {'─' * 20}"
+    print(f"\n{header}\n{output.rstrip()}", flush=True)
+    if error is not None:
+        print(f"  [{adapter.name}] FAILED: {error!r}", flush=True)
+    return {"name": adapter.name, "ok": error is None, "elapsed": elapsed}
+
+
+async def run_all(adapters: list[Adapter], run_deadline_s: int | None) -> list[dict]:
+    run_start = time.time()
+    router = _ThreadRouter(sys.stdout)
+    router.install()
+    try:
+        return await asyncio.gather(*(
+            run_adapter(a, run_start, run_deadline_s) for a in adapters
+        ))
+    finally:
+        router.uninstall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run airline scrapers concurrently")
+    parser.add_argument("airlines", nargs="*", metavar="AIRLINE",
+                        help=f"subset to run: {', '.join(a.key for a in ADAPTERS)} (default: all)")
+    parser.add_argument("--deadline", type=int, default=None,
+                        help="cap every adapter's deadline at this many seconds")
+    args = parser.parse_args()
+
+    by_key = {a.key: a for a in ADAPTERS}
+    unknown = [k for k in args.airlines if k not in by_key]
+    if unknown:
+        parser.error(f"unknown airline(s): {', '.join(unknown)}")
+    adapters = [by_key[k] for k in args.airlines] if args.airlines else ADAPTERS
+
+    # Scrapers write their output files relative to the working directory
+    os.chdir(SCRIPT_DIR)
+    if SCRIPT_DIR not in sys.path:
+        sys.path.insert(0, SCRIPT_DIR)
+
+    print("=" * 60)
+    print("Aviato Scrape Orchestrator")
+    print(f"Airlines: {', '.join(a.name for a in adapters)}")
+    print("=" * 60, flush=True)
+
+    start = time.time()
+    results = asyncio.run(run_all(adapters, args.deadline))
+    elapsed = time.time() - start
+
+    print("\n" + "=" * 60)
+    for r in results:
+        status = "ok" if r["ok"] else "FAILED"
+        print(f"  {r['name']:<10} {status:<7} {r['elapsed']:6.0f}s")
+    print(f"  Total wall-clock: {elapsed:.0f}s "
+          f"(sum of airlines: {sum(r['elapsed'] for r in results):.0f}s)")
+    print("=" * 60)
+
+    if not any(r["ok"] for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+scrape_output.py — Line-delimited scraper output, written as it is scraped
+and read back lazily.
+
+Scrapers used to keep every flight in memory and json.dump the whole list
+(indent=2) at the end, and update_flights.py then json.load-ed the whole file
+back. Now each scraper appends flights to <name>.jsonl as routes/days finish:
+
+    {"_meta": {"scraped_at": "2026-10-19T06:00:00.123456Z", "source": "..."}}
+    {"airline": "JSX", "origin_code": "BUR", "destination_code": "LAS", ...}
+    {"airline": "JSX", "origin_code": "BUR", "destination_code": "LAS", ...}
+
+and iter_flights() yields them one at a time, so neither side holds the raw
+output in memory. The file is written to <name>.jsonl.tmp and moved into
+place only when the scraper finishes without raising; a crashed run leaves
+the previous output untouched, as before. Lines are compact JSON encoded
+by jsonio (orjson when installed). A CSV twin (<name>.csv) can be
+written alongside, row by row.
+
+The _meta line always carries scraped_at (when the scraper started, UTC);
+update_flights.py uses it to refuse to apply output older than what the
+flight store already has for that airline. read_meta() returns it.
+
+iter_flights() still reads the old <name>.json files (a flat list, or a dict
+with a "flights" list) when there is no .jsonl, loading them whole.
+
+Usage (from a scraper):
+    from scrape_output import FlightWriter
+    with FlightWriter("jsx_flights", csv_fields=FIELDS) as out:
+        for route in ROUTES:
+            out.extend(scrape_route(route))
+    print(f"Saved {out.count} flights -> {out.path}")
+"""
+
+import csv
+import os
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import jsonio
+
+META_KEY = "_meta"
+
+
+class FlightWriter:
+    """Appends flight dicts to <name>.jsonl (and optionally <name>.csv)."""
+
+    def __init__(self, name: str, meta: dict | None = None,
+                 csv_fields: list[str] | None = None):
+        self.path = Path(f"{name}.jsonl")
+        self.csv_path = Path(f"{name}.csv") if csv_fields else None
+        self.csv_fields = csv_fields
+        # scraped_at is stamped on every output (scrapers may pass their own)
+        scraped_at = datetime.now(timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+        self.meta = {"scraped_at": scraped_at, **(meta or {})}
+        self.count = 0
+        self.route_counts: Counter = Counter()   # "BUR-LAS" -> flights written
+        self._fp = None
+        self._csv_fp = None
+        self._csv = None
+
+    def __enter__(self) -> "FlightWriter":
+        self._fp = open(f"{self.path}.tmp", "w", encoding="utf-8")
+        self._fp.write(jsonio.dumps({META_KEY: self.meta}) + "\n")
+        return self
+
+    def write(self, flight: dict):
+        self._fp.write(jsonio.dumps(flight) + "\n")
+        if self.csv_path is not None:
+            if self._csv is None:
+                # Created on the first row: a run with no flights keeps the old CSV
+                self._csv_fp = open(f"{self.csv_path}.tmp", "w", newline="", encoding="utf-8")
+                self._csv = csv.DictWriter(self._csv_fp, fieldnames=self.csv_fields,
+                                           extrasaction="ignore")
+                self._csv.writeheader()
+            self._csv.writerow(flight)
+        self.count += 1
+        self.route_counts[f"{flight.get('origin_code', '')}-{flight.get('destination_code', '')}"] += 1
+
+    def extend(self, flights: Iterable[dict]):
+        for flight in flights:
+            self.write(flight)
+        self._fp.flush()
+
+    def __exit__(self, exc_type, exc, tb):
+        self._fp.close()
+        if self._csv_fp is not None:
+            self._csv_fp.close()
+        pairs = [(self.path, self._fp)] + ([(self.csv_path, self._csv_fp)] if self._csv_fp else [])
+        for path, fp in pairs:
+            if exc_type is None:
+                os.replace(fp.name, path)
+            else:
+                os.remove(fp.name)
+        return False
+
+
+def output_path(name: str) -> Path | None:
+    """<name>.jsonl, else the legacy <name>.json, else None."""
+    for suffix in (".jsonl", ".json"):
+        path = Path(f"{name}{suffix}")
+        if path.exists():
+            return path
+    return None
+
+
+def read_meta(name: str) -> dict:
+    """The _meta header of <name>.jsonl; {} without one (or for a legacy .json)."""
+    path = output_path(name)
+    if path is None or path.suffix == ".json":
+        return {}
+    with open(path, "rb") as f:
+        first = f.readline()
+    record = jsonio.loads(first) if first.strip() else {}
+    return record.get(META_KEY, {})
+
+
+def iter_flights(name: str) -> Iterator[dict]:
+    """Flight dicts from <name>.jsonl (streamed) or a legacy <name>.json."""
+    path = output_path(name)
+    if path is None:
+        return
+    if path.suffix == ".json":
+        data = jsonio.load(path)
+        yield from data.get("flights", []) if isinstance(data, dict) else data
+        return
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                flight = jsonio.loads(line)
+                if META_KEY not in flight:
+                    yield flight
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+search_payloads.py — Precomputes /api/search responses for every reachable
+airport/metro pair.
+
+/api/search answers from=X&to=Y by expanding metros (NYC, LA, SFL, ...) into
+their airports and collecting the flights of every airport pair. The set of
+codes and routes only changes when the flight data does, so this step does
+that work once per update and writes the finished response body:
+
+    app/data/search/NYC-ACK.json.gz
+        {"from":"NYC","to":"ACK","flights":[...],"count":42}
+
+Flights are sorted by date, departure time, then price. Files are gzipped
+deterministically (mtime 0), so unchanged pairs produce identical bytes and
+are not rewritten; pairs that no longer have flights are removed. The route
+serves a file as-is when the client accepts gzip, and falls back to the
+partitions (flight_partitions.py) for date searches and unknown pairs.
+
+update_flights.py runs this after every update. --check compares every
+payload with what getMetroAreaFlights returns for the pair, reading
+flights.ts itself (hand-formatted entries included) rather than the store;
+publish_flights.py runs it before committing.
+
+Run from the scrapers/ directory:
+    python search_payloads.py            # regenerate from app/data/flights_store.json
+    python search_payloads.py --check    # compare the payloads with flights.ts
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+from pathlib import Path
+
+import flight_partitions
+import flight_store
+import route_index
+import ts_reader
+
+SEARCH_DIR = flight_store.DATA_DIR / "search"
+SUFFIX = ".json.gz"
+
+
+def _sort_key(e: dict):
+    return (e.get("date") or "", flight_store.dep_minutes(e.get("dep", "")), e.get("price", 0))
+
+
+def route_flights(store: dict) -> dict[tuple[str, str], list[dict]]:
+    """{(origin, destination): [entry, ...]} with partition semantics (last array wins)."""
+    routes = flight_partitions.partition_store(store)
+    return {tuple(rk.split("-")): [e for month in sorted(parts) for e in parts[month]]
+            for rk, parts in routes.items()}
+
+
+def build_payloads(store: dict, metros: dict[str, list[str]]) -> dict[tuple[str, str], bytes]:
+    """{(from, to): gzipped response body} for every code pair with flights."""
+    by_route = route_flights(store)
+    airports = {a for pair in by_route for a in pair}
+    members = {code: [code] for code in airports}
+    members.update(metros)  # a metro code only ever means its airports
+
+    by_origin: dict[str, list[str]] = {}
+    for dc, ac in by_route:
+        by_origin.setdefault(dc, []).append(ac)
+
+    payloads: dict[tuple[str, str], bytes] = {}
+    for frm, from_airports in members.items():
+        reachable = {ac for dc in from_airports for ac in by_origin.get(dc, ())}
+        if not reachable:
+            continue
+        for to, to_airports in members.items():
+            if reachable.isdisjoint(to_airports):
+                continue
+            flights = [e for dc in from_airports for ac in to_airports
+                       for e in by_route.get((dc, ac), ())]
+            if not flights:
+                continue
+            flights.sort(key=_sort_key)
+            body = json.dumps({"from": frm, "to": to, "flights": flights, "count": len(flights)},
+                              ensure_ascii=False, separators=(",", ":"))
+            payloads[(frm, to)] = gzip.compress(body.encode(), mtime=0)
+    return payloads
+
+
+def write_search_payloads(store: dict, out_dir: Path = SEARCH_DIR,
+                          locations_ts: Path = route_index.LOCATIONS_TS) -> tuple[int, int]:
+    """Bring out_dir in line with the store; returns (written, removed)."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    payloads = build_payloads(store, route_index.load_metros(locations_ts))
+
+    written = removed = 0
+    wanted = set()
+    for (frm, to), data in payloads.items():
+        path = out_dir / f"{frm}-{to}{SUFFIX}"
+        wanted.add(path.name)
+        try:
+            if path.read_bytes() == data:
+                continue
+        except FileNotFoundError:
+            pass
+        tmp = Path(f"{path}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        written += 1
+
+    for path in out_dir.glob(f"*{SUFFIX}"):
+        if path.name not in wanted:
+            path.unlink()
+            removed += 1
+    return written, removed
+
+
+def ts_flights(lines) -> dict[tuple[str, str], list[dict]]:
+    """
+    {(origin, destination): [entry, ...]} of the FLIGHTS object in flights.ts,
+    read with ts_reader rather than from the store: what getMetroAreaFlights
+    sees for an airport pair. A route key that appears twice is taken from its
+    last array (an empty one isn't seen by the reader).
+    """
+    routes: dict[str, list[dict]] = {}
+    previous = None
+    for route_key, entry in ts_reader.iter_entries(lines):
+        if route_key != previous:
+            routes[route_key] = []
+            previous = route_key
+        routes[route_key].append(entry)
+    return {tuple(rk.split("-")): entries for rk, entries in routes.items()}
+
+
+def check_payloads(store: dict, flights_ts: Path = flight_store.FLIGHTS_TS, out_dir: Path = SEARCH_DIR,
+                   locations_ts: Path = route_index.LOCATIONS_TS) -> list[str]:
+    """
+    Compare every payload in out_dir with getMetroAreaFlights(from, to) as
+    flights.ts defines it (metros expanded, same sort). Routes with a raw
+    (hand-formatted) entry in the store must have a payload too. Returns the
+    problems found, [] if none.
+    """
+    metros = route_index.load_metros(locations_ts)
+    with open(flights_ts, encoding="utf-8") as f:
+        by_route = ts_flights(f)
+
+    problems = []
+    checked = set()
+    for path in sorted(Path(out_dir).glob(f"*{SUFFIX}")):
+        frm, to = path.name[:-len(SUFFIX)].split("-")
+        expected = [e for dc in metros.get(frm, [frm]) for ac in metros.get(to, [to])
+                    for e in by_route.get((dc, ac), ())]
+        expected.sort(key=_sort_key)
+        payload = json.loads(gzip.decompress(path.read_bytes()))
+        if payload["flights"] != expected or payload["count"] != len(expected):
+            problems.append(f"{path.name}: {payload['count']} flights, flights.ts has {len(expected)}")
+        checked.add((frm, to))
+
+    for block in store["flights"]:
+        route_key = block.get("route")
+        if route_key and any("raw" in e for e in block["entries"]):
+            pair = tuple(route_key.split("-"))
+            if pair not in checked and by_route.get(pair):
+                problems.append(f"{route_key}: has hand-formatted flights but no payload")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute /api/search responses")
+    parser.add_argument("--check", action="store_true",
+                        help="compare the written payloads with flights.ts instead of writing them")
+    args = parser.parse_args()
+
+    store = flight_store.load_store()
+    if store is None:
+        sys.exit(f"{flight_store.STORE_PATH} not found — run update_flights.py first")
+    if args.check:
+        problems = check_payloads(store)
+        for problem in problems:
+            print(f"  MISMATCH {problem}")
+        if problems:
+            sys.exit(f"{len(problems)} search payload(s) differ from flights.ts")
+        print(f"{SEARCH_DIR}: every payload matches flights.ts")
+        return
+    written, removed = write_search_payloads(store)
+    print(f"{SEARCH_DIR}: {written} payloads written, {removed} removed")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,15 +7,18 @@ Strategy:
   2. POST /getCalendarSeatsPrices    -> all dates with available flights
   3. POST /getPlaneBySeatList        -> actual flights per date (times, prices, airports)
 
-Output: slate_flights.json (flat list of flight dicts for Aviato)
+Output: slate_flights.jsonl (one flight dict per line for Aviato)
 """
 
-import requests
-import json
 import time
 import os
 from datetime import datetime, timedelta
 
+from http_cache import CACHE
+from http_client import HttpClient
+from http_replay import scrape_today
+from scrape_output import FlightWriter
+
 BASE_URL = "https://app.flyslate.com"
 API_URL = "https://api.app.flyslate.com"
 
@@ -27,6 +30,8 @@ HEADERS = {
     "referer": f"{BASE_URL}/",
 }
 
+HTTP = HttpClient("Slate", headers=HEADERS, pool_size=1)
+
 CURRENCY = "USD"
 LANG = "en-US"
 
@@ -36,37 +41,34 @@ DIRECTIONS = [
     ("218", "252"),  # South Florida -> New York
 ]
 
-START_DATE = datetime.today().strftime("%Y-%m-%d")
-END_DATE = (datetime.today() + timedelta(days=270)).strftime("%Y-%m-%d")
+START_DATE = scrape_today().strftime("%Y-%m-%d")
+END_DATE = (scrape_today() + timedelta(days=270)).strftime("%Y-%m-%d")
 
 DELAY = 0.3
 FLIGHT_DURATION = 180  # NY <-> SFL: ~3h
 
+OUTPUT_NAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), "slate_flights")  # .jsonl
 
-def _api_post(endpoint, payload, timeout=30, retries=3):
-    """POST to Slate API with retries on timeout/connection errors."""
-    for attempt in range(retries):
-        try:
-            resp = requests.post(
-                f"{API_URL}/{endpoint}",
-                headers=HEADERS,
-                json=payload,
-                timeout=timeout,
-            )
-            resp.raise_for_status()
-            return resp.json()
-        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
-            if attempt < retries - 1:
-                wait = 2 ** attempt
-                print(f"  {endpoint} timeout, retry {attempt+1}...")
-                time.sleep(wait)
-            else:
-                raise
+
+def _api_post(endpoint, payload, timeout=30, retries=3, cached=False):
+    """
+    POST to Slate API; the shared client retries timeouts/connection errors
+    and 5xx with backoff. cached=True revalidates against the on-disk HTTP
+    cache (reference data only).
+    """
+    url = f"{API_URL}/{endpoint}"
+    if cached:
+        resp = CACHE.post(url, source="Slate", session=HTTP, json=payload,
+                          timeout=timeout, retries=retries - 1)
+    else:
+        resp = HTTP.post(url, json=payload, timeout=timeout, retries=retries - 1)
+    resp.raise_for_status()
+    return resp.json()
 
 
 def get_airport_map():
     """Fetch airport data and return {ICAO_code: {name, city, state, iata}}."""
-    data = _api_post("getAirportsAndMa", {})
+    data = _api_post("getAirportsAndMa", {}, cached=True)
     ap_map = {}
     for ap in data.get("ap", []):
         code = ap["code"]
@@ -116,18 +118,31 @@ def get_flights_for_date(date_str, from_ma, to_ma):
     return [flight for group in data.get("charters", []) for flight in group]
 
 
-def scrape_all_flights():
-    """Main scraper - pulls all flights from all directions."""
+def scrape_all_flights(deadline=None):
+    """
+    Main scraper - pulls all flights from all directions.
+    Stops requesting new dates once time.time() passes deadline.
+    """
     print("=" * 60)
     print("Slate Aviation Flight Scraper")
     print("=" * 60)
+    HTTP.set_deadline(deadline)
 
     print("\n[1/3] Loading airport data...")
     ap_map = get_airport_map()
     print(f"  {len(ap_map)} airports loaded")
 
-    all_flights = []
+    # Each date's flights are appended to the output as they arrive; only
+    # dates and prices are kept for the summary
+    out = FlightWriter(OUTPUT_NAME)
+    dates = set()
+    prices = []
+    with out:
+        _scrape_directions(out, ap_map, dates, prices, deadline)
+    _summarize(out, dates, prices)
+
 
+def _scrape_directions(out, ap_map, dates, prices, deadline):
     for from_ma, to_ma in DIRECTIONS:
         print(f"\n[2/3] Route {from_ma} -> {to_ma}")
         print("  Loading calendar...")
@@ -145,6 +160,9 @@ def scrape_all_flights():
 
         for idx, day in enumerate(calendar):
             date_str = day["date"]
+            if deadline is not None and time.time() > deadline:
+                print(f"  Deadline reached — skipping {len(calendar) - idx} remaining dates")
+                break
             print(f"  [{idx+1}/{len(calendar)}] {date_str}...", end=" ")
 
             try:
@@ -156,6 +174,7 @@ def scrape_all_flights():
 
             print(f"{len(flights)} flight(s)")
 
+            records = []
             for flight in flights:
                 flight_id = flight["id"]
                 dep_code = flight["from"]
@@ -182,7 +201,7 @@ def scrape_all_flights():
                     f"/dates/{date_compact}/ft/1/c/{CURRENCY}/sr/{flight_id}/"
                 )
 
-                all_flights.append({
+                records.append({
                     "airline": "Slate",
                     "origin_code": dep_iata,
                     "destination_code": arr_iata,
@@ -197,38 +216,31 @@ def scrape_all_flights():
                     "deeplink": deeplink,
                 })
 
-            time.sleep(DELAY)
-
-    all_flights.sort(key=lambda f: (f["date"], f["departure_time"]))
-    _save_and_summarize(all_flights)
+            out.extend(records)
+            if records:
+                dates.add(date_str)
+                prices.extend(r["price"] for r in records if r["price"])
 
+            time.sleep(DELAY)
 
-def _save_and_summarize(all_flights):
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    json_path = os.path.join(script_dir, "slate_flights.json")
 
-    with open(json_path, "w") as f:
-        json.dump(all_flights, f, indent=2)
-    print(f"\nSaved {len(all_flights)} flights to {json_path}")
+def _summarize(out, dates, prices):
+    print(f"\nSaved {out.count} flights to {out.path}")
 
     print("\n" + "=" * 60)
     print("SUMMARY")
-    print(f"  Total flights: {len(all_flights)}")
-    if all_flights:
-        prices = [fl["price"] for fl in all_flights if fl["price"]]
+    print(f"  Total flights: {out.count}")
+    if out.count:
         if prices:
             print(f"  Price range:   ${min(prices):,} - ${max(prices):,}")
-        dates = sorted(set(fl["date"] for fl in all_flights))
+        dates = sorted(dates)
         print(f"  Date range:    {dates[0]} to {dates[-1]}")
         print(f"  Unique dates:  {len(dates)}")
-        route_counts = {}
-        for fl in all_flights:
-            key = f"{fl['origin_code']}-{fl['destination_code']}"
-            route_counts[key] = route_counts.get(key, 0) + 1
         print("  Route breakdown:")
-        for route, count in sorted(route_counts.items(), key=lambda x: -x[1]):
+        for route, count in sorted(out.route_counts.items(), key=lambda x: -x[1]):
             print(f"    {route}: {count} flights")
-    print("=" * 60)
+    CACHE.report()
+    HTTP.report()
 
 
 if __name__ == "__main__":
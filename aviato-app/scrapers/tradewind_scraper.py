@@ -20,17 +20,20 @@ Usage:
     python3 tradewind_scraper.py
 
 Outputs:
-  - tradewind_flights.json  (consumed by update_flights.py)
+  - tradewind_flights.jsonl  (consumed by update_flights.py)
 """
 
-import json
 import re
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
-import requests
 from bs4 import BeautifulSoup
 
+import dateparse
+from http_client import HttpClient
+from http_replay import scrape_today
+from scrape_output import FlightWriter
+
 
 # ── Configuration ──────────────────────────────────────────────────────────
 
@@ -57,7 +60,18 @@ ROUTE_DURATIONS = {
 
 DAYS_TO_SCRAPE = 120
 BETWEEN_REQUESTS_S = 0.8   # polite delay between requests
-OUTPUT_JSON = "tradewind_flights.json"
+OUTPUT_NAME = "tradewind_flights"   # -> tradewind_flights.jsonl
+
+# Stateless: each deeplink must start a fresh VARS session, so no cookies carry over
+HTTP = HttpClient(
+    "Tradewind",
+    headers={
+        "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+                      "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    },
+    pool_size=1,
+    stateless=True,
+)
 
 
 # ── Fetch one day via deeplink.aspx ──────────────────────────────────────
@@ -83,13 +97,9 @@ def fetch_day(origin, destination, date):
     }
 
     try:
-        resp = requests.get(
+        resp = HTTP.get(
             DEEPLINK_URL,
             params=params,
-            headers={
-                "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
-                              "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            },
             allow_redirects=True,
             timeout=30,
         )
@@ -110,8 +120,7 @@ def fetch_day(origin, destination, date):
 
 def clean_time(t):
     """Normalize time string to '7:30 AM' format."""
-    m = re.match(r"(\d{1,2}:\d{2})\s*(AM|PM|am|pm)", t.replace(" ", ""), re.I)
-    return f"{m.group(1)} {m.group(2).upper()}" if m else t
+    return dateparse.clock(t)
 
 
 def parse_price(text):
@@ -200,8 +209,11 @@ def date_range(start, end):
 
 # ── Scrape One Route ─────────────────────────────────────────────────────
 
-def scrape_route(route, start, end):
-    """Scrape flights for a single route, one deeplink request per day."""
+def scrape_route(route, start, end, deadline=None):
+    """
+    Scrape flights for a single route, one deeplink request per day.
+    Stops early (keeping what it has) once time.time() passes deadline.
+    """
     all_flights = []
     errors = 0
 
@@ -212,6 +224,9 @@ def scrape_route(route, start, end):
 
     for day in date_range(start, end):
         day_label = day.strftime("%Y-%m-%d")
+        if deadline is not None and time.time() > deadline:
+            print(f"  [WARN] Deadline reached at {day_label} — skipping rest of route")
+            break
 
         html = fetch_day(route["from_code"], route["to_code"], day)
         if html is None:
@@ -240,8 +255,8 @@ def scrape_route(route, start, end):
 
 # ── Main ─────────────────────────────────────────────────────────────────
 
-def main():
-    start_date = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
+def main(deadline=None):
+    start_date = scrape_today()
     end_date = start_date + timedelta(days=DAYS_TO_SCRAPE)
 
     print("=" * 60)
@@ -252,36 +267,30 @@ def main():
           f"(~{DAYS_TO_SCRAPE * len(ROUTES) * BETWEEN_REQUESTS_S / 60:.0f} min)")
     print("=" * 60)
 
-    all_flights = []
-    for route in ROUTES:
-        try:
-            flights = scrape_route(route, start_date, end_date)
-            all_flights.extend(flights)
-        except Exception as e:
-            print(f"  [ERROR] {route['from_code']}->{route['to_code']}: {e}")
-            import traceback
-            traceback.print_exc()
+    HTTP.set_deadline(deadline)
+    # Each route's flights are appended to the output as soon as it finishes
+    out = FlightWriter(OUTPUT_NAME)
+    with out:
+        for route in ROUTES:
+            try:
+                out.extend(scrape_route(route, start_date, end_date, deadline))
+            except Exception as e:
+                print(f"  [ERROR] {route['from_code']}->{route['to_code']}: {e}")
+                import traceback
+                traceback.print_exc()
 
     print(f"\n{'=' * 60}")
-    print(f"  Total flights collected: {len(all_flights)}")
-
-    # Save JSON for update_flights.py
-    with open(OUTPUT_JSON, "w", encoding="utf-8") as f:
-        json.dump(all_flights, f, indent=2, ensure_ascii=False)
-    print(f"  Saved -> {OUTPUT_JSON}")
+    print(f"  Total flights collected: {out.count}")
+    print(f"  Saved -> {out.path}")
 
     # Summary
     print("\n  Summary by route:")
     for route in ROUTES:
         key = f"{route['from_code']}-{route['to_code']}"
-        count = sum(
-            1 for fl in all_flights
-            if fl["origin_code"] == route["from_code"]
-            and fl["destination_code"] == route["to_code"]
-        )
-        print(f"    {key}: {count} flights")
+        print(f"    {key}: {out.route_counts[key]} flights")
 
-    print(f"\n  Scraped at: {datetime.utcnow().isoformat()}Z")
+    HTTP.report()
+    print(f"\n  Scraped at: {datetime.now(timezone.utc).replace(tzinfo=None).isoformat()}Z")
     print("=" * 60)
 
 
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+ts_reader.py — Streaming reader for the FLIGHTS object in flights.ts.
+
+check_price_drops.py used to pull (airline, dc, ac, price) out of flights.ts
+with one re.DOTALL pattern whose lazy `.*?` spans could run past the end of
+an entry: an entry without dc/ac or price borrowed the next entry's, and
+fields in any other order were missed. This reads the file a line at a time
+instead, tokenizes it (strings, numbers, keys, brackets, comments) and
+builds each entry object of the FLIGHTS route arrays as a dict, so:
+
+  - fields are matched by name, in any order, and never across entries
+  - one pass over the file, holding only the entry being read
+  - comments, trailing commas and multi-line entries are fine; anything the
+    reader doesn't understand (spreads, type casts) is skipped, and only
+    unbalanced brackets raise ValueError
+
+Price reads match lines written by flight_store.render_entry with one
+anchored pattern, built from the same field layout (ENTRY_LAYOUT), and
+tokenize only the rest, which keeps them within a few times the old
+pattern's speed.
+
+Usage:
+    import ts_reader
+    with open(FLIGHTS_TS) as f:
+        for row in ts_reader.iter_prices(f):    # FlightPrice(route, airline, price, date, dep)
+            ...
+    ts_reader.parse_fragment("{ id:'x', airline:'JSX', price:199 },")   # [{...}]
+    ts_reader.stored_entries(block["entries"])     # a flight store array, raw lines parsed
+
+bench_ts_reader.py times it against the old pattern.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+import flight_store
+
+_STR = r"'[^'\\\n]*(?:\\.[^'\\\n]*)*'|\"[^\"\\\n]*(?:\\.[^\"\\\n]*)*\""
+_IDENT = r"[A-Za-z_$][\w$]*"
+_NUMBER = r"-?\.?\d[\w.]*"
+_PLAIN = r"[^\[\]{}'\"/]*"
+_ARRAY = rf"\[{_PLAIN}(?:(?:{_STR}){_PLAIN})*\]"     # of scalars
+
+# One token per match; whitespace and commas between tokens are skipped. The
+# groups are (flat object, unterminated /*, key, value, opening bracket,
+# closing bracket); comments and any other character match with every group
+# empty. A flat object (no nested objects or comments, which is every entry
+# update_flights.py renders) is one token and is split into fields by
+# _FIELD_RE; anything else is built up bracket by bracket.
+_TOKEN_RE = re.compile(
+    rf"(\{{{_PLAIN}(?:(?:{_STR}|{_ARRAY}){_PLAIN})*\}})"
+    r"|//.*|/\*.*?\*/"
+    r"|(/\*)"
+    rf"|({_IDENT}|{_STR})\s*:"
+    rf"|({_STR}|{_NUMBER}|{_IDENT})"
+    r"|([{\[])"
+    r"|([}\]])"
+    r"|[^\s,]"
+)
+# (key, value) of each field of a flat object; strings outside a field match
+# as ("", "") so nothing inside them is read as a field
+_FIELD_RE = re.compile(rf"['\"]?({_IDENT})['\"]?\s*:\s*({_STR}|{_NUMBER}|{_ARRAY}|{_IDENT})|{_STR}")
+_ITEM_RE = re.compile(rf"{_STR}|{_NUMBER}|{_IDENT}")
+_ESCAPE_RE = re.compile(r"\\(.)")
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r"}
+_WORDS = {"true": True, "false": False, "null": None, "undefined": None}
+# All price_of reads (and all _RENDERED_RE captures)
+_PRICE_FIELDS = frozenset(("airline", "price", "dc", "ac", "date", "dep"))
+# An entry line exactly as flight_store.render_entry writes it, which is
+# nearly every line of a generated flights.ts: price reads match it in one
+# go instead of tokenizing it. Built from flight_store.ENTRY_LAYOUT, the
+# layout render_entry writes, so the two can't drift apart.
+_RENDERED_RE = re.compile(flight_store.entry_pattern(_PRICE_FIELDS))
+
+
+@dataclass(frozen=True, slots=True)
+class FlightPrice:
+    route: str
+    airline: str
+    price: int
+    date: str
+    dep: str = ""
+
+
+def _unescape(body: str) -> str:
+    if "\\" not in body:
+        return body
+    return _ESCAPE_RE.sub(lambda m: _ESCAPES.get(m.group(1), m.group(1)), body)
+
+
+def _string(token: str) -> str:
+    return _unescape(token[1:-1])
+
+
+def _rendered(m: re.Match) -> dict:
+    entry = {key: _unescape(value) for key, value in m.groupdict().items() if value is not None}
+    entry["price"] = _literal(m.group("price"))
+    return entry
+
+
+def _literal(token: str):
+    if token[0] in "'\"":
+        return _string(token)
+    try:
+        return int(token)
+    except ValueError:
+        pass
+    try:
+        return float(token)
+    except ValueError:
+        return _WORDS.get(token, token)
+
+
+def _flat(text: str, fields: frozenset | None) -> dict:
+    """A flat object token -> dict (only fields, if given)."""
+    pairs = dict(_FIELD_RE.findall(text))
+    pairs.pop("", None)
+    if fields is None:
+        return {key: _value(token) for key, token in pairs.items()}
+    return {key: _value(pairs[key]) for key in fields if key in pairs}
+
+
+def _value(token: str):
+    if token[0] == "[":
+        return [_literal(item) for item in _ITEM_RE.findall(token[1:-1])]
+    return _literal(token)
+
+
+def _attach(frame: list, value):
+    container, key = frame
+    if isinstance(container, list):
+        container.append(value)
+    elif key is not None:
+        container[key] = value
+        frame[1] = None
+
+
+def _read(lines: Iterable[str], fragment: bool,
+          fields: frozenset | None = None) -> Iterator[tuple[str | None, dict]]:
+    """
+    (route key, entry) for every object directly inside a FLIGHTS route
+    array. A fragment is read as if it were already inside a route array.
+
+    The stack holds [container, pending key] frames: 0 is the FLIGHTS
+    object, 1 a route array, 2 an entry. Only entries and what they contain
+    are built; an entry is handed out as soon as it closes.
+    """
+    stack: list[list] = [[{}, None], [[], None]] if fragment else []
+    floor = len(stack)
+    rendered = fields is not None and fields <= _PRICE_FIELDS
+    found = False       # seen the FLIGHTS name, waiting for its "{"
+    in_comment = False
+    lineno = 0
+    for lineno, line in enumerate(lines, 1):
+        if in_comment:
+            end = line.find("*/")
+            if end < 0:
+                continue
+            line, in_comment = line[end + 2:], False
+        elif rendered and len(stack) == 2:
+            m = _RENDERED_RE.match(line)
+            if m:
+                yield stack[0][1], _rendered(m)
+                continue
+        for flat, comment, key, value, opener, closer in _TOKEN_RE.findall(line):
+            depth = len(stack)
+            if flat:
+                if depth == 2:
+                    yield stack[0][1], _flat(flat, fields)
+                elif depth > 2:
+                    _attach(stack[-1], _flat(flat, None))
+                elif found and not depth:
+                    return      # FLIGHTS = {} or with empty route arrays only
+            elif comment:
+                in_comment = True
+                break
+            elif not depth:
+                if opener == "{" and found:
+                    stack.append([{}, None])
+                elif key == "FLIGHTS" or value == "FLIGHTS":
+                    found = True
+            elif key:
+                stack[-1][1] = _string(key) if key[0] in "'\"" else key
+            elif value:
+                if depth > 2:
+                    _attach(stack[-1], _literal(value))
+            elif opener:
+                stack.append([{} if opener == "{" else [], None])
+            elif closer:
+                if depth <= floor:
+                    continue
+                container = stack.pop()[0]
+                if (closer == "}") != isinstance(container, dict):
+                    raise ValueError(f"flights.ts line {lineno}: unexpected '{closer}'")
+                if depth > 3:
+                    _attach(stack[-1], container)
+                elif depth == 3:
+                    if isinstance(container, dict):
+                        yield stack[0][1], container
+                elif depth == 2:
+                    stack[0][1] = None
+                else:
+                    return
+    if not fragment:
+        if not found:
+            raise ValueError("flights.ts has no 'export const FLIGHTS' object")
+        raise ValueError(f"FLIGHTS object in flights.ts is never closed (line {lineno})")
+
+
+def iter_entries(lines: Iterable[str]) -> Iterator[tuple[str, dict]]:
+    """(route key, entry dict) for every entry of FLIGHTS, in file order."""
+    return _read(lines, fragment=False)
+
+
+def parse_fragment(text: str) -> list[dict]:
+    """Entry objects in a piece of a route array (e.g. a raw store line)."""
+    return [entry for _, entry in _read(text.split("\n"), fragment=True)]
+
+
+def stored_entries(entries: Iterable[dict]) -> Iterator[dict]:
+    """
+    A stored route array's entries as flights.ts defines them: structured
+    entries as they are, raw (hand-formatted) lines parsed. Consecutive raw
+    lines are read together, so an entry spread over several parses whole.
+    """
+    raw: list[str] = []
+    for e in entries:
+        if "raw" in e:
+            raw.append(e["raw"])
+            continue
+        if raw:
+            yield from parse_fragment("\n".join(raw))
+            raw = []
+        yield e
+    if raw:
+        yield from parse_fragment("\n".join(raw))
+
+
+def price_of(entry: dict, route: str | None = None) -> FlightPrice | None:
+    """
+    FlightPrice of an entry (stored or read), or None without an airline or
+    numeric price. route is dc-ac, or the array's route key without them.
+    """
+    airline, price = entry.get("airline"), entry.get("price")
+    if type(airline) is not str or type(price) not in (int, float):
+        return None
+    dc, ac = entry.get("dc"), entry.get("ac")
+    if isinstance(dc, str) and isinstance(ac, str):
+        route = f"{dc}-{ac}"
+    if not route:
+        return None
+    date, dep = entry.get("date"), entry.get("dep")
+    return FlightPrice(route, airline, int(price), date if isinstance(date, str) else "",
+                       dep if isinstance(dep, str) else "")
+
+
+def iter_prices(lines: Iterable[str]) -> Iterator[FlightPrice]:
+    """FlightPrice of every priced entry of FLIGHTS."""
+    for route, entry in _read(lines, fragment=False, fields=_PRICE_FIELDS):
+        row = price_of(entry, route)
+        if row is not None:
+            yield row
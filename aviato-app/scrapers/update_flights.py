@@ -5,36 +5,50 @@ then updates app/data/flights.ts with fresh flight entries.
 
 Strategy: For each airline's routes, REPLACE all existing entries in the
 route arrays with fresh scraped data. Preserves entries from other airlines
-in shared route arrays.
+in shared route arrays; each array is then kept sorted by date and departure
+time across airlines.
+
+The edit happens in the canonical flight store (app/data/flights_store.json,
+see flight_store.py); flights.ts is then rendered from the store, and
+routeIndex.ts/dateIndex.ts (route_index.py), the per-route/month partitions
+(flight_partitions.py) and the precomputed search responses
+(search_payloads.py) are regenerated from it.
+
+Each scraper's output is normalized into FlightRecords by that airline's adapter
+in flight_record.py (which also holds the aircraft/amenity/link config) and
+converted to store entries by one shared converter; this module keeps the
+route lists each airline owns.
+
+Routes whose scraped entries are unchanged since the last run are left
+alone, and when no route changed nothing is written at all.
+
+Updaters can run at the same time (e.g. one per scraper workflow, each with
+--only): the store is read, edited and written back under a lock, each run
+replaces only its own airlines' entries, and output scraped before what the
+store already has for an airline is skipped. publish_flights.py wraps this
+with a fetch/rebuild/push retry loop for CI.
 
 Run from the scrapers/ directory:
     python update_flights.py
+    python update_flights.py --diff     # list changed routes, write nothing
+    python update_flights.py --only Slate   # apply just Slate's output
 """
 
-import json
-import re
+import argparse
 import os
 import sys
-from datetime import datetime, timedelta
-from pathlib import Path
-
-
-def _parse_date_to_iso(date_str: str) -> str:
-    """Convert various date formats to ISO YYYY-MM-DD."""
-    if not date_str:
-        return ""
-    # Already ISO?
-    if re.match(r"^\d{4}-\d{2}-\d{2}$", date_str.strip()):
-        return date_str.strip()
-    # Try common formats: "April 06, 2026", "Apr 06, 2026", "06 Apr 2026", etc.
-    for fmt in ["%B %d, %Y", "%b %d, %Y", "%d %B %Y", "%d %b %Y", "%m/%d/%Y"]:
-        try:
-            return datetime.strptime(date_str.strip(), fmt).strftime("%Y-%m-%d")
-        except ValueError:
-            continue
-    return date_str.strip()
-
-FLIGHTS_TS = Path(__file__).parent.parent / "app" / "data" / "flights.ts"
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import flight_partitions
+import flight_record
+import flight_store
+import route_index
+import scrape_output
+import search_payloads
+from flight_record import FlightRecord
+
+FLIGHTS_TS = flight_store.FLIGHTS_TS
+STORE_PATH = flight_store.STORE_PATH
 
 # ── JSX config ────────────────────────────────────────────────────────
 JSX_ROUTES = [
@@ -78,17 +92,9 @@ JSX_ROUTES = [
     # Scottsdale hub
     "SCF-APA", "APA-SCF", "SCF-SLC", "SLC-SCF", "SCF-CLD", "CLD-SCF",
 ]
-JSX_CRAFT = "ERJ-135"
-JSX_SEATS_DEFAULT = 2
-JSX_AMEN = "['WiFi','Snacks']"
-JSX_LINK = "jsx.com"
 
 # ── Tradewind config ──────────────────────────────────────────────────
 TRADEWIND_ROUTES = ["ACK-HPN", "HPN-ACK", "HPN-MVY", "MVY-HPN"]
-TRADEWIND_CRAFT = "Pilatus PC-12"
-TRADEWIND_SEATS = 6
-TRADEWIND_AMEN = "['WiFi','Snacks']"
-TRADEWIND_LINK = "flytradewind.com"
 
 # ── Aero config ──────────────────────────────────────────────────────
 AERO_ROUTES = [
@@ -98,9 +104,6 @@ AERO_ROUTES = [
     "VNY-HCR", "HCR-VNY", "VNY-SLC", "SLC-VNY",
     "ASE-TEB", "TEB-ASE",
 ]
-AERO_CRAFT = "ERJ-135"
-AERO_AMEN = "['WiFi','Gourmet Catering','Champagne']"
-AERO_LINK = "aero.com"
 
 # ── Slate config ─────────────────────────────────────────────────────
 SLATE_ROUTES = [
@@ -113,9 +116,6 @@ SLATE_ROUTES = [
     "FRG-FLL", "FLL-FRG", "FRG-PBI", "PBI-FRG",
     "TEB-ACK", "ACK-TEB", "HPN-ACK", "ACK-HPN",
 ]
-SLATE_CRAFT = "CRJ-200"
-SLATE_AMEN = "['WiFi','Catering','Champagne']"
-SLATE_LINK = "flyslate.com"
 
 # ── BARK Air config ───────────────────────────────────────────────────
 BARK_ROUTES = [
@@ -130,9 +130,6 @@ BARK_ROUTES = [
     # Asia
     "VNY-NRT", "NRT-VNY",
 ]
-BARK_CRAFT = "Bombardier Challenger 601"
-BARK_AMEN = "['WiFi','Gourmet Catering','Champagne','Calming Treats','Vet Tech On Board']"
-BARK_LINK = "air.bark.co"
 
 # ── K9 Jets config ────────────────────────────────────────────────────
 K9JETS_ROUTES = [
@@ -181,783 +178,273 @@ K9JETS_ROUTES = [
     # Goose Bay (YYR) — refueling stop used in some routes
     "YYR-LTN", "LTN-YYR",         # Goose Bay ↔ London
 ]
-K9JETS_CRAFT = "Gulfstream G-IV"
-K9JETS_AMEN = "['WiFi','Gourmet Catering','Champagne','Pet Amenities','Vet Tech On Board']"
-K9JETS_LINK = "k9jets.com"
-
-K9JETS_DURATIONS = {
-    # US Domestic
-    "TEB-VNY": "5h 30m", "VNY-TEB": "5h 00m",
-    "TEB-FXE": "2h 45m", "FXE-TEB": "2h 50m",
-    # US to UK
-    "TEB-LTN": "7h 00m", "LTN-TEB": "8h 00m",
-    "VNY-LTN": "10h 00m", "LTN-VNY": "11h 00m",
-    # US to France
-    "TEB-LBG": "7h 15m", "LBG-TEB": "8h 15m",
-    "TEB-NCE": "8h 00m", "NCE-TEB": "9h 00m",
-    # US to Iberia
-    "TEB-LIS": "7h 00m", "LIS-TEB": "8h 00m",
-    "TEB-MAD": "7h 30m", "MAD-TEB": "8h 30m",
-    "TEB-AGP": "7h 45m", "AGP-TEB": "8h 45m",
-    # US to Ireland/Germany
-    "TEB-DUB": "6h 30m", "DUB-TEB": "7h 30m",
-    "TEB-FRA": "7h 30m", "FRA-TEB": "8h 30m",
-    # US to Switzerland/Italy
-    "TEB-GVA": "7h 45m", "GVA-TEB": "8h 45m",
-    "TEB-MXP": "8h 00m", "MXP-TEB": "9h 00m",
-    # US to Dubai
-    "TEB-DWC": "12h 30m", "DWC-TEB": "14h 00m",
-    # Dubai to Europe
-    "DWC-GVA": "6h 30m", "GVA-DWC": "5h 45m",
-    "DWC-MXP": "6h 00m", "MXP-DWC": "5h 30m",
-    "DWC-LTN": "7h 00m", "LTN-DWC": "6h 00m",
-    # UK/Canada
-    "LTN-YYZ": "7h 30m", "YYZ-LTN": "6h 30m",
-    "TEB-YYZ": "1h 30m", "YYZ-TEB": "1h 30m",
-    # UK to Florida
-    "LTN-FXE": "9h 00m", "FXE-LTN": "8h 00m",
-    # US to Hawaii
-    "VNY-HNL": "5h 30m", "HNL-VNY": "5h 00m",
-    # US to Mexico (Los Cabos)
-    "VNY-SJD": "2h 30m", "SJD-VNY": "2h 45m",
-    "TEB-SJD": "5h 00m", "SJD-TEB": "5h 15m",
-    # UK to Birmingham
-    "TEB-BHX": "7h 15m", "BHX-TEB": "8h 15m",
-    # Florida to Europe
-    "FXE-LBG": "8h 45m", "LBG-FXE": "9h 45m",
-    "FXE-LIS": "7h 30m", "LIS-FXE": "8h 30m",
-    "FXE-DUB": "7h 45m", "DUB-FXE": "8h 45m",
-    "FXE-MAD": "8h 00m", "MAD-FXE": "9h 00m",
-    # London intra-Europe
-    "LTN-DUB": "1h 15m", "DUB-LTN": "1h 20m",
-    "LTN-LBG": "1h 00m", "LBG-LTN": "1h 05m",
-    # Frankfurt to Dubai
-    "FRA-DWC": "6h 30m", "DWC-FRA": "7h 00m",
-    # Via routes (LA to Europe)
-    "VNY-LBG": "12h 00m", "LBG-VNY": "13h 00m",
-    "VNY-LIS": "12h 00m", "LIS-VNY": "13h 00m",
-    "VNY-FRA": "12h 00m", "FRA-VNY": "13h 00m",
-    "VNY-GVA": "12h 00m", "GVA-VNY": "13h 00m",
-    "VNY-LIN": "12h 00m", "LIN-VNY": "13h 00m",
-    "VNY-MAD": "12h 00m", "MAD-VNY": "13h 00m",
-    # Toronto to Florida / Dubai / Paris
-    "YYZ-FXE": "3h 00m", "FXE-YYZ": "3h 10m",
-    "YYZ-DWC": "12h 00m", "DWC-YYZ": "14h 00m",
-    "YYZ-LBG": "7h 30m", "LBG-YYZ": "8h 00m",
-    # Milan Linate (LIN) routes
-    "TEB-LIN": "8h 00m", "LIN-TEB": "9h 00m",
-    "DWC-LIN": "6h 00m", "LIN-DWC": "5h 30m",
-    # Madrid routes
-    "TEB-MAD": "7h 30m", "MAD-TEB": "8h 30m",
-    "DWC-MAD": "7h 30m", "MAD-DWC": "7h 00m",
-    # London Stansted (STN) routes
-    "STN-DWC": "7h 00m", "DWC-STN": "6h 00m",
-    "STN-AGP": "2h 30m", "AGP-STN": "2h 30m",
-    "STN-NCE": "2h 00m", "NCE-STN": "2h 00m",
-    # London to Vancouver
-    "LTN-YVR": "9h 30m", "YVR-LTN": "9h 00m",
-    # London to Miami Opa-locka
-    "LTN-OPF": "9h 00m", "OPF-LTN": "8h 00m",
-    # Goose Bay
-    "YYR-LTN": "5h 30m", "LTN-YYR": "6h 00m",
-}
-
-BARK_DURATIONS = {
-    "HPN-VNY": "5h 30m", "VNY-HPN": "5h 30m",
-    "HPN-SJC": "5h 45m", "SJC-HPN": "5h 45m",
-    "VNY-KOA": "5h 30m", "KOA-VNY": "5h 30m",
-    "SEA-HPN": "5h 15m", "HPN-SEA": "5h 45m",
-    "HPN-LTN": "7h 30m", "LTN-HPN": "8h 00m",
-    "HPN-LBG": "7h 45m", "LBG-HPN": "8h 15m",
-    "HPN-MAD": "8h 00m", "MAD-HPN": "8h 30m",
-    "HPN-LIS": "7h 30m", "LIS-HPN": "8h 00m",
-    "HPN-BER": "8h 30m", "BER-HPN": "9h 00m",
-    "HPN-DUB": "7h 00m", "DUB-HPN": "7h 30m",
-    "HPN-ATH": "10h 00m", "ATH-HPN": "10h 30m",
-    "HPN-ARN": "8h 30m", "ARN-HPN": "9h 00m",
-    "VNY-NRT": "11h 30m", "NRT-VNY": "10h 00m",
-}
-
-
-def load_tradewind_flights(json_path: str) -> dict[str, list[dict]]:
-    """Load Tradewind JSON and group by route key."""
-    if not os.path.exists(json_path):
-        print(f"  [skip] {json_path} not found")
-        return {}
-
-    with open(json_path) as f:
-        data = json.load(f)
-
-    # The Tradewind JSON is a flat list of flight dicts
-    flights = data if isinstance(data, list) else data.get("flights", data)
-
-    routes: dict[str, list[dict]] = {}
-    for fl in flights:
-        origin = fl.get("origin_code", "")
-        dest = fl.get("destination_code", "")
-        key = f"{origin}-{dest}"
-        if key in TRADEWIND_ROUTES:
-            routes.setdefault(key, []).append(fl)
-
-    # Sort each route by date then time
-    for key in routes:
-        routes[key].sort(key=lambda f: (f.get("date_iso") or "", f.get("departure_time") or ""))
-
-    return routes
-
-
-def load_bark_flights(json_path: str) -> dict[str, list[dict]]:
-    """Load BARK Air JSON and group by route key."""
-    if not os.path.exists(json_path):
-        print(f"  [skip] {json_path} not found")
-        return {}
-
-    with open(json_path) as f:
-        data = json.load(f)
-
-    flights = data.get("flights", []) if isinstance(data, dict) else data
-
-    routes: dict[str, list[dict]] = {}
-    for fl in flights:
-        if not fl.get("available", True):
-            continue
-        origin = fl.get("origin_code", "")
-        dest = fl.get("destination_code", "")
-        key = f"{origin}-{dest}"
-        if key in BARK_ROUTES:
-            routes.setdefault(key, []).append(fl)
-
-    # Sort each route by date
-    for key in routes:
-        routes[key].sort(key=lambda f: (f.get("date") or "", f.get("takeoff") or ""))
-
-    return routes
-
-
-def load_jsx_flights(json_path: str) -> dict[str, list[dict]]:
-    """Load JSX JSON and group by route key. Deduplicate to cheapest fare per flight."""
-    if not os.path.exists(json_path):
-        print(f"  [skip] {json_path} not found")
-        return {}
-
-    with open(json_path) as f:
-        data = json.load(f)
-
-    flights = data if isinstance(data, list) else data.get("flights", data)
-
-    # Group all fares by route
-    routes_raw: dict[str, list[dict]] = {}
-    for fl in flights:
-        origin = fl.get("origin_code", "")
-        dest = fl.get("destination_code", "")
-        key = f"{origin}-{dest}"
-        if key in JSX_ROUTES:
-            routes_raw.setdefault(key, []).append(fl)
-
-    # Deduplicate: keep only cheapest fare per (date, departure_time) combo
-    routes: dict[str, list[dict]] = {}
-    for key, fares in routes_raw.items():
-        best: dict[str, dict] = {}
-        for fl in fares:
-            combo = f"{fl.get('date', '')}|{fl.get('departure_time', '')}"
-            if combo not in best or fl.get("price", 9999) < best[combo].get("price", 9999):
-                best[combo] = fl
-        routes[key] = sorted(best.values(), key=lambda f: (f.get("date", ""), f.get("departure_time", "")))
-
-    return routes
-
 
-def jsx_to_ts(route_key: str, flights: list[dict]) -> list[str]:
-    """Convert JSX flight dicts to TypeScript entry lines."""
-    fr, to = route_key.split("-")
-    prefix = f"jsx-{fr.lower()}-{to.lower()}"
-    lines = []
-
-    for i, fl in enumerate(flights, 1):
-        dep = fl.get("departure_time", "")
-        arr = fl.get("arrival_time", "")
-        date = fl.get("date", "")
-        price = fl.get("price", 0)
-        seats = fl.get("seats_available", JSX_SEATS_DEFAULT) or JSX_SEATS_DEFAULT
-
-        # Calculate duration from ISO times if available
-        dur = _calc_duration(fl.get("departure_iso", ""), fl.get("arrival_iso", ""))
-
-        price_str = str(round(price))
-
-        line = (
-            f"    {{ id:'{prefix}-{i}', airline:'JSX', "
-            f"dep:'{dep}', arr:'{arr}', dc:'{fr}', ac:'{to}', "
-            f"dur:'{dur}', price:{price_str}, craft:'{JSX_CRAFT}', "
-            f"seats:{seats}, amen:{JSX_AMEN}, "
-            f"link:'{JSX_LINK}', date:'{date}' }},"
-        )
-        lines.append(line)
-
-    return lines
-
-
-def _calc_duration(dep_iso: str, arr_iso: str) -> str:
-    """Calculate duration string from ISO departure and arrival times."""
-    if not dep_iso or not arr_iso:
-        return "1h 30m"
-    try:
-        dep_dt = datetime.fromisoformat(dep_iso)
-        arr_dt = datetime.fromisoformat(arr_iso)
-        diff = arr_dt - dep_dt
-        total_min = int(diff.total_seconds() / 60)
-        if total_min <= 0:
-            return "1h 30m"
-        hours = total_min // 60
-        mins = total_min % 60
-        return f"{hours}h {mins:02d}m"
-    except (ValueError, TypeError):
-        return "1h 30m"
-
-
-def load_aero_flights(json_path: str) -> dict[str, list[dict]]:
-    """Load Aero JSON and group by route key."""
-    if not os.path.exists(json_path):
-        print(f"  [skip] {json_path} not found")
-        return {}
+# (airline, scraper output name (see scrape_output.py), routes it owns; None accepts any route the
+# scraper found — Slate may add new routes)
+SOURCES = [
+    ("JSX", "jsx_flights", JSX_ROUTES),
+    ("Aero", "aero_flights", AERO_ROUTES),
+    ("Tradewind", "tradewind_flights", TRADEWIND_ROUTES),
+    ("BARK Air", "bark_air_flights", BARK_ROUTES),
+    ("Slate", "slate_flights", None),
+    ("K9 Jets", "k9jets_flights", K9JETS_ROUTES),
+]
 
-    with open(json_path) as f:
-        data = json.load(f)
+# Worker processes for loading/converting airlines (one per SOURCES entry at most)
+DEFAULT_WORKERS = min(len(SOURCES), os.cpu_count() or 1)
 
-    flights = data if isinstance(data, list) else data.get("flights", data)
+# (route_key, airline, flight store entries)
+Replacement = tuple[str, str, list[dict]]
 
-    routes: dict[str, list[dict]] = {}
-    for fl in flights:
-        origin = fl.get("origin_code", "")
-        dest = fl.get("destination_code", "")
-        key = f"{origin}-{dest}"
-        if key in AERO_ROUTES:
-            routes.setdefault(key, []).append(fl)
 
-    for key in routes:
-        routes[key].sort(key=lambda f: (f.get("date") or "", f.get("departure_time") or ""))
+@dataclass
+class AirlineUpdate:
+    """One airline's scraped flights, ready to apply to the store."""
+    airline: str
+    counts: dict[str, int]                  # route_key -> flights scraped
+    replacements: list[Replacement]
+    hashes: dict[str, dict[str, str]]       # flight_store.replacement_hashes
+    scraped_at: str | None = None           # from the output's _meta line
 
-    return routes
 
+# ── Loading scraped data ──────────────────────────────────────────────
 
-def aero_to_ts(route_key: str, flights: list[dict]) -> list[str]:
-    """Convert Aero flight dicts to TypeScript entry lines."""
-    fr, to = route_key.split("-")
-    prefix = f"aero-{fr.lower()}-{to.lower()}"
-    lines = []
-
-    for i, fl in enumerate(flights, 1):
-        dep = fl.get("departure_time", "")
-        arr = fl.get("arrival_time", "")
-        date = fl.get("date", "")
-        price = fl.get("price", 0)
-        seats = fl.get("available_seats", 4) or 4
-        dur_min = fl.get("duration_minutes", 0)
-
-        # Format duration
-        if dur_min and dur_min > 0:
-            dur = f"{dur_min // 60}h {dur_min % 60:02d}m"
-        else:
-            dur = "1h 30m"
-
-        price_str = str(int(price)) if isinstance(price, float) and price == int(price) else str(round(price))
-
-        line = (
-            f"    {{ id:'{prefix}-{i}', airline:'Aero', "
-            f"dep:'{dep}', arr:'{arr}', dc:'{fr}', ac:'{to}', "
-            f"dur:'{dur}', price:{price_str}, craft:'{AERO_CRAFT}', "
-            f"seats:{seats}, amen:{AERO_AMEN}, "
-            f"link:'{AERO_LINK}', date:'{date}' }},"
-        )
-        lines.append(line)
-
-    return lines
-
-
-def tradewind_to_ts(route_key: str, flights: list[dict]) -> list[str]:
-    """Convert Tradewind flight dicts to TypeScript entry lines."""
-    fr, to = route_key.split("-")
-    prefix = f"tw-{fr.lower()}-{to.lower()}"
-    lines = []
-
-    for i, fl in enumerate(flights, 1):
-        dep = fl.get("departure_time", "")
-        arr = fl.get("arrival_time", "")
-        dur = fl.get("duration", "1h 05m")
-        price = fl.get("price_numeric", 0)
-        date = fl.get("date_iso", "")
-        price_str = str(int(price)) if price == int(price) else str(price)
-
-        line = (
-            f"    {{ id:'{prefix}-{i}', airline:'Tradewind', "
-            f"dep:'{dep}', arr:'{arr}', dc:'{fr}', ac:'{to}', "
-            f"dur:'{dur}', price:{price_str}, craft:'{TRADEWIND_CRAFT}', "
-            f"seats:{TRADEWIND_SEATS}, amen:{TRADEWIND_AMEN}, "
-            f"link:'{TRADEWIND_LINK}', date:'{date}' }},"
-        )
-        lines.append(line)
-
-    return lines
-
-
-def bark_to_ts(route_key: str, flights: list[dict]) -> list[str]:
-    """Convert BARK Air flight dicts to TypeScript entry lines."""
-    fr, to = route_key.split("-")
-    prefix = f"bark-{fr.lower()}-{to.lower()}"
-    dur = BARK_DURATIONS.get(route_key, "5h 00m")
-    lines = []
-
-    for i, fl in enumerate(flights, 1):
-        takeoff = fl.get("takeoff", "9:00 AM")
-        # Calculate arrival from takeoff + duration
-        arr = _calc_arrival(takeoff, dur, fr, to)
-        price_raw = fl.get("price", "$6725")
-        price = int(float(str(price_raw).replace("$", "").replace(",", "")))
-        raw_date = fl.get("date", "")
-        date = _parse_date_to_iso(raw_date)  # Convert to ISO format
-        seats = fl.get("tickets_remaining", 5) or 5
-
-        line = (
-            f"    {{ id:'{prefix}-{i}', airline:'BARK Air', "
-            f"dep:'{takeoff}', arr:'{arr}', dc:'{fr}', ac:'{to}', "
-            f"dur:'{dur}', price:{price}, craft:'{BARK_CRAFT}', "
-            f"seats:{seats}, amen:{BARK_AMEN}, "
-            f"link:'{BARK_LINK}', date:'{date}' }},"
-        )
-        lines.append(line)
-
-    return lines
-
-
-def _calc_arrival(takeoff: str, dur: str, origin: str, dest: str) -> str:
-    """Calculate arrival time from takeoff + duration + timezone offset."""
-    import re as _re
-    # Parse takeoff time
-    m = _re.match(r'(\d{1,2}):(\d{2})\s*(AM|PM)', takeoff, _re.IGNORECASE)
-    if not m:
-        return takeoff
-    h, mn, ampm = int(m.group(1)), int(m.group(2)), m.group(3).upper()
-    if ampm == 'PM' and h != 12:
-        h += 12
-    if ampm == 'AM' and h == 12:
-        h = 0
-
-    # Parse duration
-    dm = _re.match(r'(\d+)h\s*(\d+)m', dur)
-    if not dm:
-        return takeoff
-    dh, dmn = int(dm.group(1)), int(dm.group(2))
-
-    # Timezone offsets (relative to ET)
-    tz = {
-        'HPN': 0, 'FXE': 0, 'TEB': 0,
-        'VNY': -3, 'SJC': -3, 'KOA': -5, 'SEA': -3,
-        'HNL': -5, 'SJD': -2,
-        # Europe (ahead of ET)
-        'LTN': 5, 'LBG': 6, 'MAD': 6, 'LIS': 5,
-        'BER': 6, 'DUB': 5, 'ATH': 7, 'ARN': 6,
-        'NCE': 6, 'AGP': 6, 'FRA': 6, 'GVA': 6, 'MXP': 6, 'BHX': 5,
-        # Middle East
-        'DWC': 9,
-        # Canada
-        'YYZ': 0,
-        # Asia
-        'NRT': 14,
-    }
-    offset = tz.get(dest, 0) - tz.get(origin, 0)
-
-    total_min = h * 60 + mn + dh * 60 + dmn + offset * 60
-    arr_h = (total_min // 60) % 24
-    arr_m = total_min % 60
-    arr_ampm = 'AM' if arr_h < 12 else 'PM'
-    arr_h12 = arr_h % 12 or 12
-    return f"{arr_h12}:{arr_m:02d} {arr_ampm}"
-
-
-def load_slate_flights(json_path: str) -> dict[str, list[dict]]:
-    """Load Slate JSON and group by route key."""
-    if not os.path.exists(json_path):
-        print(f"  [skip] {json_path} not found")
-        return {}
+def read_records(name: str, airline: str) -> list[FlightRecord] | None:
+    """
+    One scraper's output normalized by the airline's adapter; None if there
+    is none. Flights are streamed from <name>.jsonl (or a legacy <name>.json)
+    straight into the adapter, so only the records are held in memory.
+    """
+    if scrape_output.output_path(name) is None:
+        print(f"  [skip] {name}.jsonl not found")
+        return None
+    return flight_record.ADAPTERS[airline].normalize(scrape_output.iter_flights(name))
 
-    with open(json_path) as f:
-        data = json.load(f)
 
-    flights = data if isinstance(data, list) else data.get("flights", data)
+def group_records(records: list[FlightRecord],
+                  route_keys: list[str] | None) -> dict[str, list[FlightRecord]]:
+    """
+    Group records by route key (only route_keys, or every route if None),
+    each route sorted by date then departure time.
+    """
+    allowed = set(route_keys) if route_keys is not None else None
 
-    routes: dict[str, list[dict]] = {}
-    for fl in flights:
-        origin = fl.get("origin_code", "")
-        dest = fl.get("destination_code", "")
-        key = f"{origin}-{dest}"
-        # Accept any route the scraper found (Slate may add new routes)
-        routes.setdefault(key, []).append(fl)
+    routes: dict[str, list[FlightRecord]] = {}
+    for rec in records:
+        key = rec.route_key
+        if allowed is None or key in allowed:
+            routes.setdefault(key, []).append(rec)
 
     for key in routes:
-        routes[key].sort(key=lambda f: (f.get("date") or "", f.get("departure_time") or ""))
+        routes[key].sort(key=lambda r: (r.date, r.dep))
 
     return routes
 
 
-def slate_to_ts(route_key: str, flights: list[dict]) -> list[str]:
-    """Convert Slate flight dicts to TypeScript entry lines."""
-    fr, to = route_key.split("-")
-    prefix = f"slate-{fr.lower()}{to.lower()}"
-    lines = []
-
-    for i, fl in enumerate(flights, 1):
-        dep = fl.get("departure_time", "")
-        arr = fl.get("arrival_time", "")
-        date = fl.get("date", "")
-        price = fl.get("price", 0)
-        seats = fl.get("available_seats", 10) or 10
-        dur_min = fl.get("duration_minutes", 0)
-
-        # Format duration
-        if dur_min and dur_min > 0:
-            dur = f"{dur_min // 60}h {dur_min % 60:02d}m"
-        else:
-            dur = "3h 00m"
-
-        price_str = str(int(price)) if isinstance(price, float) and price == int(price) else str(round(price))
-
-        line = (
-            f"    {{ id:'{prefix}-{i}', airline:'Slate', "
-            f"dep:'{dep}', arr:'{arr}', dc:'{fr}', ac:'{to}', "
-            f"dur:'{dur}', price:{price_str}, craft:'{SLATE_CRAFT}', "
-            f"seats:{seats}, amen:{SLATE_AMEN}, "
-            f"link:'{SLATE_LINK}', date:'{date}' }},"
-        )
-        lines.append(line)
-
-    return lines
-
-
-def load_k9jets_flights(json_path: str) -> dict[str, list[dict]]:
-    """Load K9 Jets JSON and group by route key."""
-    if not os.path.exists(json_path):
-        print(f"  [skip] {json_path} not found")
-        return {}
-
-    with open(json_path) as f:
-        data = json.load(f)
-
-    flights = data.get("flights", []) if isinstance(data, dict) else data
-
-    routes: dict[str, list[dict]] = {}
-    for fl in flights:
-        if not fl.get("available", True):
-            continue
-        origin = fl.get("origin_code", "")
-        dest = fl.get("destination_code", "")
-        key = f"{origin}-{dest}"
-        if key in K9JETS_ROUTES:
-            routes.setdefault(key, []).append(fl)
-
-    for key in routes:
-        routes[key].sort(key=lambda f: (f.get("date") or "", f.get("departure_time") or ""))
-
-    return routes
-
-
-def k9jets_to_ts(route_key: str, flights: list[dict]) -> list[str]:
-    """Convert K9 Jets flight dicts to TypeScript entry lines."""
-    fr, to = route_key.split("-")
-    prefix = f"k9jets-{fr.lower()}-{to.lower()}"
-    dur = K9JETS_DURATIONS.get(route_key, "7h 00m")
-    lines = []
-
-    for i, fl in enumerate(flights, 1):
-        dep = fl.get("departure_time", "9:00 PM")
-        arr = fl.get("arrival_time", "")
-        if not arr:
-            arr = _calc_arrival(dep, dur, fr, to)
-        price = fl.get("price", 8950)
-        if isinstance(price, str):
-            price = int(float(str(price).replace("$", "").replace(",", "")))
-        date = fl.get("date", "")
-        if date and not re.match(r"^\d{4}-\d{2}-\d{2}$", date):
-            date = _parse_date_to_iso(date)
-        seats = fl.get("seats", 10) or 10
-        # Use actual aircraft from API if available, otherwise fallback
-        craft = fl.get("aircraft", "").strip()
-        if not craft:
-            craft = K9JETS_CRAFT
-        # Escape any single quotes in aircraft name
-        craft = craft.replace("'", "\\'")
-
-        # Use per-flight booking URL if available, otherwise fallback
-        booking_url = fl.get("booking_url", "").strip()
-        link = booking_url if booking_url else f"https://www.{K9JETS_LINK}/routes/"
-        # Escape single quotes in URL
-        link = link.replace("'", "\\'")
-
-        line = (
-            f"    {{ id:'{prefix}-{i}', airline:'K9 Jets', "
-            f"dep:'{dep}', arr:'{arr}', dc:'{fr}', ac:'{to}', "
-            f"dur:'{dur}', price:{price}, craft:'{craft}', "
-            f"seats:{seats}, amen:{K9JETS_AMEN}, "
-            f"link:'{link}', date:'{date}' }},"
-        )
-        lines.append(line)
-
-    return lines
-
-
-def _build_new_route_arrays(
-    replacements: list[tuple[str, str, list[str]]],
-    placed_routes: set[str],
-) -> list[str]:
-    """Build new route array blocks for routes that don't exist in flights.ts yet."""
-    # Group unplaced replacements by route key
-    unplaced: dict[str, list[str]] = {}
-    for route_key, airline, ts_lines in replacements:
-        if route_key not in placed_routes:
-            unplaced.setdefault(route_key, []).extend(ts_lines)
-
-    if not unplaced:
-        return []
-
-    lines = []
-    for route_key in sorted(unplaced.keys()):
-        entries = unplaced[route_key]
-        print(f"  [NEW] Creating route array '{route_key}' with {len(entries)} flights")
-        lines.append(f"  '{route_key}': [")
-        for entry in entries:
-            lines.append(entry)
-        lines.append("  ],")
-
-    return lines
+def to_replacements(airline: str,
+                    routes: dict[str, list[FlightRecord]]) -> list[Replacement]:
+    """(route_key, airline, store entries) for every route that has flights."""
+    replacements = []
+    for route_key, records in routes.items():
+        entries = flight_record.to_entries(route_key, records)
+        if entries:
+            replacements.append((route_key, airline, entries))
+    return replacements
+
+
+def prepare_airline(airline: str, name: str,
+                    route_keys: list[str] | None) -> AirlineUpdate | None:
+    """
+    Load, normalize, group and convert one airline's scraper output; None if
+    there is none. Runs in a worker process, so it returns store entries and
+    their hashes (not FlightRecords) and leaves the logging to the caller.
+    """
+    if scrape_output.output_path(name) is None:
+        return None
+    routes = group_records(flight_record.ADAPTERS[airline].normalize(
+        scrape_output.iter_flights(name)), route_keys)
+    replacements = to_replacements(airline, routes)
+    return AirlineUpdate(
+        airline=airline,
+        counts={route: len(records) for route, records in routes.items()},
+        replacements=replacements,
+        hashes=flight_store.replacement_hashes(replacements),
+        scraped_at=scrape_output.read_meta(name).get("scraped_at"),
+    )
+
+
+def sources(airlines: list[str] | None = None) -> list[tuple[str, str, list[str] | None]]:
+    """SOURCES, or only the entries for airlines (in SOURCES order)."""
+    return [s for s in SOURCES if airlines is None or s[0] in airlines]
+
+
+def prepare_all(script_dir: str, workers: int = DEFAULT_WORKERS,
+                airlines: list[str] | None = None) -> list[AirlineUpdate | None]:
+    """
+    prepare_airline for every SOURCES airline (or only airlines), one worker
+    process per airline (up to workers; 1 runs them in this process).
+    Results come back in SOURCES order however the workers finish, so the
+    rewrite is the same.
+    """
+    jobs = [(airline, os.path.join(script_dir, name), route_keys)
+            for airline, name, route_keys in sources(airlines)]
+    if workers <= 1:
+        return [prepare_airline(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        return list(pool.map(prepare_airline, *zip(*jobs)))
+
+
+def write_derived(store: dict):
+    """Regenerate the artifacts derived from the store (each only if it changed)."""
+    if route_index.write_route_index(store):
+        print(f"  Wrote {route_index.ROUTE_INDEX_TS.name}")
+    if route_index.write_date_index(store):
+        print(f"  Wrote {route_index.DATE_INDEX_TS.name}")
+    written, removed = flight_partitions.write_partitions(store)
+    if written or removed:
+        print(f"  Partitions: {written} written, {removed} removed")
+    written, removed = search_payloads.write_search_payloads(store)
+    if written or removed:
+        print(f"  Search payloads: {written} written, {removed} removed")
 
 
 def update_flights_ts(
-    jsx_routes: dict[str, list[dict]],
-    aero_routes: dict[str, list[dict]],
-    tradewind_routes: dict[str, list[dict]],
-    bark_routes: dict[str, list[dict]],
-    slate_routes: dict[str, list[dict]] | None = None,
-    k9jets_routes: dict[str, list[dict]] | None = None,
-):
-    """Read flights.ts, replace airline entries in route arrays, write back."""
-    if slate_routes is None:
-        slate_routes = {}
-    if k9jets_routes is None:
-        k9jets_routes = {}
-
-    with open(FLIGHTS_TS, "r") as f:
-        content = f.read()
-
-    # Build replacement map: route_key -> (airline_marker, new_lines)
-    replacements: list[tuple[str, str, list[str]]] = []
-
-    for route_key, flights in jsx_routes.items():
-        ts_lines = jsx_to_ts(route_key, flights)
-        if ts_lines:
-            replacements.append((route_key, "JSX", ts_lines))
-
-    for route_key, flights in aero_routes.items():
-        ts_lines = aero_to_ts(route_key, flights)
-        if ts_lines:
-            replacements.append((route_key, "Aero", ts_lines))
-
-    for route_key, flights in tradewind_routes.items():
-        ts_lines = tradewind_to_ts(route_key, flights)
-        if ts_lines:
-            replacements.append((route_key, "Tradewind", ts_lines))
-
-    for route_key, flights in bark_routes.items():
-        ts_lines = bark_to_ts(route_key, flights)
-        if ts_lines:
-            replacements.append((route_key, "BARK Air", ts_lines))
-
-    for route_key, flights in slate_routes.items():
-        ts_lines = slate_to_ts(route_key, flights)
-        if ts_lines:
-            replacements.append((route_key, "Slate", ts_lines))
-
-    for route_key, flights in k9jets_routes.items():
-        ts_lines = k9jets_to_ts(route_key, flights)
-        if ts_lines:
-            replacements.append((route_key, "K9 Jets", ts_lines))
-
+    replacements: list[Replacement],
+    diff_only: bool = False,
+    new_hashes: dict[str, dict[str, str]] | None = None,
+    scraped_at: dict[str, str | None] | None = None,
+) -> dict[str, list[str]]:
+    """
+    Replace airline entries in the flight store, then render flights.ts from
+    it. replacements are (route_key, airline, entries) as built by
+    to_replacements; new_hashes is their flight_store.replacement_hashes, if
+    already computed. Only routes whose scraped entries changed since the
+    last update are touched; if none did, nothing is written. With
+    diff_only, the changed routes are printed and nothing is written either.
+
+    Only the airlines in replacements are touched, so one airline's output
+    can be applied on its own. scraped_at ({airline: ISO timestamp}) is
+    when each airline's output was scraped: output older than what the
+    store last applied for that airline is skipped. The whole
+    read-modify-write runs under flight_store.store_lock, so concurrent
+    updaters each see the other's result.
+
+    Returns {route_key: [airline, ...]} for the changed routes.
+    """
     if not replacements:
         print("  No replacements to make.")
-        return
-
-    # Track which route keys have been placed into existing arrays
-    placed_routes: set[str] = set()
-
-    # Process the file line by line
-    # IMPORTANT: Only process inside the FLIGHTS object, stop at '};'
-    # This avoids touching SEASONAL_DATES which has duplicate route keys
-    lines = content.split("\n")
-    new_lines = []
-    i = 0
-    inside_flights = False
-
-    while i < len(lines):
-        line = lines[i]
-
-        # Track when we enter/exit the FLIGHTS object
-        if "export const FLIGHTS" in line:
-            inside_flights = True
-        elif inside_flights and re.match(r"^\};", line):
-            # Before closing the FLIGHTS object, insert any NEW route arrays
-            # that didn't have existing arrays in the file
-            new_route_lines = _build_new_route_arrays(replacements, placed_routes)
-            if new_route_lines:
-                for nrl in new_route_lines:
-                    new_lines.append(nrl)
-            inside_flights = False
-
-        # Only process route arrays inside the FLIGHTS object
-        route_match = re.match(r"^\s+'([A-Z]+-[A-Z]+)':\s*\[", line) if inside_flights else None
-        if route_match:
-            route_key = route_match.group(1)
-
-            # If we've already placed this route, skip the duplicate array entirely
-            if route_key in placed_routes:
-                # Skip over the entire duplicate array
-                i += 1
-                bracket_depth = 1
-                while i < len(lines) and bracket_depth > 0:
-                    bracket_depth += lines[i].count("[") - lines[i].count("]")
-                    i += 1
-                continue
-
-            # Check if we have replacements for this route
-            route_replacements = [
-                (airline, ts_lines)
-                for rk, airline, ts_lines in replacements
-                if rk == route_key
-            ]
-
-            if not route_replacements:
-                new_lines.append(line)
-                i += 1
-                continue
-
-            # Mark these routes as placed
-            for rk, airline, ts_lines in replacements:
-                if rk == route_key:
-                    placed_routes.add(rk)
-
-            # We need to process this route array
-            # Collect all lines until the closing '],'
-            array_lines = [line]  # The opening line
-            i += 1
-            bracket_depth = 1
-
-            while i < len(lines) and bracket_depth > 0:
-                l = lines[i]
-                # Count brackets (simple approach for our known format)
-                bracket_depth += l.count("[") - l.count("]")
-                array_lines.append(l)
-                i += 1
-
-            # Now we have the full array. Separate entries by airline.
-            # Keep entries NOT belonging to replaced airlines, add new ones.
-            airlines_to_replace = {a for a, _ in route_replacements}
-
-            # Parse: first line is opening, last line is closing
-            opening = array_lines[0]
-            closing = array_lines[-1]
-            existing_entries = array_lines[1:-1]
-
-            # Filter out entries from airlines we're replacing
-            kept_entries = []
-            for entry in existing_entries:
-                skip = False
-                for airline in airlines_to_replace:
-                    if f"airline:'{airline}'" in entry:
-                        skip = True
-                        break
-                if not skip:
-                    kept_entries.append(entry)
-
-            # Build new array
-            new_lines.append(opening)
-
-            # Add kept entries first (other airlines)
-            for entry in kept_entries:
-                new_lines.append(entry)
-
-            # Add new entries for each replaced airline
-            for airline, ts_lines in route_replacements:
-                for ts_line in ts_lines:
-                    new_lines.append(ts_line)
-
-            new_lines.append(closing)
-            continue
-
-        new_lines.append(line)
-        i += 1
-
-    # Write back
-    with open(FLIGHTS_TS, "w") as f:
-        f.write("\n".join(new_lines))
-
-    # Now update SEASONAL_DATES for Bark Air and Tradewind routes
-    # Bark Air and Tradewind routes all run year-round — no SEASONAL_DATES needed.
-    # The calendar allows picking any date; flights are filtered by date match.
+        return {}
+    with flight_store.store_lock(STORE_PATH):
+        return _update_store(replacements, diff_only, new_hashes, scraped_at or {})
+
+
+def _update_store(replacements: list[Replacement], diff_only: bool,
+                  new_hashes: dict[str, dict[str, str]] | None,
+                  scraped_at: dict[str, str | None]) -> dict[str, list[str]]:
+    previous = flight_store.load_or_bootstrap(STORE_PATH, FLIGHTS_TS)
+    if new_hashes is None:
+        new_hashes = flight_store.replacement_hashes(replacements)
+    stale = flight_store.stale_airlines(previous, scraped_at)
+    for airline in stale:
+        print(f"  [STALE] {airline}: output scraped {scraped_at[airline]}, "
+              f"store has {previous['scraped_at'][airline]} — skipped")
+    if stale:
+        replacements = [r for r in replacements if r[1] not in stale]
+        new_hashes = {route_key: kept for route_key, airlines in new_hashes.items()
+                      if (kept := {a: h for a, h in airlines.items() if a not in stale})}
+    changed = flight_store.changed_routes(previous, new_hashes)
+
+    for route_key in sorted(changed):
+        print(f"  [CHANGED] {route_key}: {', '.join(changed[route_key])}")
+    if diff_only:
+        print(f"  {len(changed)} of {len(new_hashes)} routes changed (--diff, nothing written)")
+        return changed
+    # Arrays from before date sorting (or hand edits) get sorted once
+    unsorted = flight_store.unsorted_routes(previous)
+    if not changed and not unsorted:
+        print("  No route changed since the last update — leaving flights.ts as is.")
+        write_derived(previous)
+        return changed
+    if unsorted:
+        print(f"  Sorting {len(unsorted)} route arrays by date")
+
+    # Every airline of a changed route is re-applied, then each array is
+    # merged into one date/time-ordered sequence across airlines
+    applied = [r for r in replacements if r[0] in changed]
+    store = flight_store.apply_replacements(previous, applied)
+    store = flight_store.sort_routes(store)
+    # Merged per airline: a partial (--only) run keeps the other airlines' hashes
+    hashes = {route_key: dict(airlines) for route_key, airlines in previous.get("hashes", {}).items()}
+    for route_key, airlines in new_hashes.items():
+        hashes.setdefault(route_key, {}).update(airlines)
+    store["hashes"] = hashes
+    applied_at = {airline: scraped_at[airline] for _, airline, _ in applied if scraped_at.get(airline)}
+    if applied_at or "scraped_at" in previous:
+        store["scraped_at"] = {**previous.get("scraped_at", {}), **applied_at}
+    store["body_sha"] = flight_store.render_flights_ts(store, FLIGHTS_TS, previous)
+    flight_store.save_store(store, STORE_PATH)
+    print(f"  Rewrote {len(changed)} of {len(new_hashes)} routes")
+    write_derived(store)
+    return changed
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Update flights.ts from scraped JSON")
+    parser.add_argument("--diff", action="store_true",
+                        help="print which routes changed without writing anything")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"processes loading airlines in parallel (default {DEFAULT_WORKERS}; "
+                             "1 loads them one after another)")
+    parser.add_argument("--only", nargs="+", metavar="AIRLINE",
+                        choices=[airline for airline, _, _ in SOURCES],
+                        help="apply only these airlines' output; every other airline's "
+                             "flights stay as the store has them")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Aviato Flight Data Updater")
     print("=" * 60)
 
     # Load scraped data
     script_dir = os.path.dirname(__file__)
-    jsx_json = os.path.join(script_dir, "jsx_flights.json")
-    aero_json = os.path.join(script_dir, "aero_flights.json")
-    tw_json = os.path.join(script_dir, "tradewind_flights.json")
-    bark_json = os.path.join(script_dir, "bark_air_flights.json")
-    slate_json = os.path.join(script_dir, "slate_flights.json")
-    k9jets_json = os.path.join(script_dir, "k9jets_flights.json")
-
-    print("\nLoading JSX data...")
-    jsx_routes = load_jsx_flights(jsx_json)
-    for route, flights in sorted(jsx_routes.items()):
-        print(f"  {route}: {len(flights)} flights")
-
-    print("\nLoading Aero data...")
-    aero_routes = load_aero_flights(aero_json)
-    for route, flights in sorted(aero_routes.items()):
-        print(f"  {route}: {len(flights)} flights")
-
-    print("\nLoading Tradewind data...")
-    tw_routes = load_tradewind_flights(tw_json)
-    for route, flights in sorted(tw_routes.items()):
-        print(f"  {route}: {len(flights)} flights")
-
-    print("\nLoading BARK Air data...")
-    bark_routes = load_bark_flights(bark_json)
-    for route, flights in sorted(bark_routes.items()):
-        print(f"  {route}: {len(flights)} flights")
-
-    print("\nLoading Slate data...")
-    slate_routes = load_slate_flights(slate_json)
-    for route, flights in sorted(slate_routes.items()):
-        print(f"  {route}: {len(flights)} flights")
-
-    print("\nLoading K9 Jets data...")
-    k9jets_routes = load_k9jets_flights(k9jets_json)
-    for route, flights in sorted(k9jets_routes.items()):
-        print(f"  {route}: {len(flights)} flights")
-
-    if not jsx_routes and not aero_routes and not tw_routes and not bark_routes and not slate_routes and not k9jets_routes:
+    replacements: list[Replacement] = []
+    new_hashes: dict[str, dict[str, str]] = {}
+    scraped_at: dict[str, str | None] = {}
+    counts: dict[str, dict[str, int]] = {}
+    selected = sources(args.only)
+    workers = max(1, args.workers)
+    print(f"\nLoading {len(selected)} airlines ({workers} worker{'s' if workers > 1 else ''})...")
+    for (airline, filename, _), update in zip(selected, prepare_all(script_dir, workers, args.only)):
+        print(f"\n{airline}:")
+        if update is None:
+            print(f"  [skip] {filename}.jsonl not found")
+            continue
+        for route, n in sorted(update.counts.items()):
+            print(f"  {route}: {n} flights")
+        replacements += update.replacements
+        for route_key, hashes in update.hashes.items():
+            new_hashes.setdefault(route_key, {}).update(hashes)
+        counts[airline] = update.counts
+        scraped_at[airline] = update.scraped_at
+
+    if not any(counts.values()):
         print("\nNo data to update. Exiting.")
         sys.exit(0)
 
-    print(f"\nUpdating {FLIGHTS_TS}...")
-    update_flights_ts(jsx_routes, aero_routes, tw_routes, bark_routes, slate_routes, k9jets_routes)
+    if args.diff:
+        print(f"\nComparing against {STORE_PATH}...")
+        update_flights_ts(replacements, diff_only=True, new_hashes=new_hashes, scraped_at=scraped_at)
+        return
+
+    print(f"\nUpdating {STORE_PATH} and {FLIGHTS_TS}...")
+    changed = update_flights_ts(replacements, new_hashes=new_hashes, scraped_at=scraped_at)
+    if not changed:
+        print("\nDone! No scraped flight data changed.")
+        return
 
-    # Count total entries written
-    all_routes = [jsx_routes, aero_routes, tw_routes, bark_routes, slate_routes, k9jets_routes]
-    total = sum(len(f) for r in all_routes for f in r.values())
-    n_routes = sum(len(r) for r in all_routes)
-    print(f"\nDone! Replaced {total} flight entries across {n_routes} routes.")
+    # Entries written: every airline's flights on the routes that changed
+    total = sum(len(entries) for route_key, _, entries in replacements if route_key in changed)
+    print(f"\nDone! Replaced {total} flight entries across {len(changed)} routes.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+watchlists.py — Per-subscriber route watchlists for price alerts, and the
+digests of each day's drops that match them.
+
+A watch is a route (airport or metro code on each side, as on the site:
+NYC-ACK covers HPN/TEB/FRG/MMU to ACK), optionally a range of flight dates
+and a maximum price. Watchlists are kept in scrapers/watchlists.json
+(AVIATO_WATCHLISTS to use another file), which holds subscriber emails and
+so is never committed (.gitignore: scrapers/*.json):
+
+    {"a@example.com": [{"route": "NYC-ACK", "from": "2026-11-01",
+                        "to": "2026-11-30", "max_price": 900}]}
+
+build_index() expands every watch to the airport routes it covers and
+inverts them, {"HPN-ACK": [Watch, ...]}, so matching a day's drops is one
+dict lookup per drop rather than every drop against every watch. digests()
+makes that one pass over the route and flight drops and collects each
+subscriber's matches; check_price_drops.py sends each digest as its own
+email (see mailer.py).
+
+A flight drop matches a watch on its route when its date is in the watch's
+range and its new price is at most the watch's maximum. A route drop (the
+route's cheapest price, which has no single date) only matches watches
+without a date range.
+
+Run from the scrapers/ directory:
+    python watchlists.py add a@example.com NYC-ACK --from 2026-11-01 --to 2026-11-30 --max-price 900
+    python watchlists.py remove a@example.com NYC-ACK
+    python watchlists.py list
+"""
+
+import argparse
+import os
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import jsonio
+import route_index
+
+WATCHLISTS_PATH = Path(os.environ.get("AVIATO_WATCHLISTS", Path(__file__).parent / "watchlists.json"))
+
+
+@dataclass(frozen=True, slots=True)
+class Watch:
+    email: str
+    route: str              # "NYC-ACK": airport or metro codes
+    start: str = ""         # flight dates, YYYY-MM-DD, inclusive; "" for open
+    end: str = ""
+    max_price: int | None = None
+
+    def matches(self, flight_date: str, price: int) -> bool:
+        if self.max_price is not None and price > self.max_price:
+            return False
+        if not (self.start or self.end):
+            return True
+        return bool(flight_date) and self.start <= flight_date and (not self.end or flight_date <= self.end)
+
+
+@dataclass(slots=True)
+class Digest:
+    email: str
+    drops: list[dict] = field(default_factory=list)           # find_drops
+    flight_drops: list[dict] = field(default_factory=list)    # find_flight_drops
+
+
+# ── Storage ───────────────────────────────────────────────────────────
+
+def load(path: Path = WATCHLISTS_PATH) -> list[Watch]:
+    """Every watch in the file, or [] without one."""
+    if not Path(path).exists():
+        return []
+    return [Watch(email, w["route"], w.get("from", ""), w.get("to", ""), w.get("max_price"))
+            for email, watches in jsonio.load(path).items() for w in watches]
+
+
+def save(watches: list[Watch], path: Path = WATCHLISTS_PATH):
+    data: dict[str, list[dict]] = {}
+    for w in sorted(watches, key=lambda w: (w.email, w.route, w.start, w.end)):
+        entry = {"route": w.route}
+        if w.start:
+            entry["from"] = w.start
+        if w.end:
+            entry["to"] = w.end
+        if w.max_price is not None:
+            entry["max_price"] = w.max_price
+        data.setdefault(w.email, []).append(entry)
+    jsonio.dump(data, path, pretty=True)
+
+
+# ── Matching ──────────────────────────────────────────────────────────
+
+def build_index(watches: list[Watch], metros: dict[str, list[str]]) -> dict[str, list[Watch]]:
+    """{"HPN-ACK": [every Watch covering HPN-ACK]}; metro codes expand to their airports."""
+    index: dict[str, list[Watch]] = {}
+    for w in watches:
+        origin, _, dest = w.route.partition("-")
+        for dc in metros.get(origin, [origin]):
+            for ac in metros.get(dest, [dest]):
+                index.setdefault(f"{dc}-{ac}", []).append(w)
+    return index
+
+
+def digests(index: dict[str, list[Watch]], drops: list[dict],
+            flight_drops: list[dict]) -> dict[str, Digest]:
+    """
+    {email: Digest} of the drops matching each subscriber's watches, in the
+    order given (biggest savings first). A drop matching several of one
+    subscriber's watches is listed once.
+    """
+    found: dict[str, Digest] = {}
+
+    def digest(email: str) -> Digest:
+        if email not in found:
+            found[email] = Digest(email)
+        return found[email]
+
+    # Route drops have no date, so only watches without a range match them
+    for d in drops:
+        for email in {w.email for w in index.get(d["route"], ()) if w.matches("", d["new_price"])}:
+            digest(email).drops.append(d)
+    for d in flight_drops:
+        for email in {w.email for w in index.get(d["route"], ()) if w.matches(d["date"], d["new_price"])}:
+            digest(email).flight_drops.append(d)
+    return found
+
+
+# ── CLI ───────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage price alert watchlists")
+    parser.add_argument("--path", type=Path, default=WATCHLISTS_PATH)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("add", help="watch a route (or metro pair)")
+    p.add_argument("email")
+    p.add_argument("route", help="e.g. HPN-ACK or NYC-ACK")
+    p.add_argument("--from", dest="start", default="", help="first flight date (YYYY-MM-DD)")
+    p.add_argument("--to", dest="end", default="", help="last flight date (YYYY-MM-DD)")
+    p.add_argument("--max-price", type=int)
+    p = sub.add_parser("remove", help="stop watching a route (every date range)")
+    p.add_argument("email")
+    p.add_argument("route")
+    sub.add_parser("list", help="every watch, and the airport routes it covers")
+    args = parser.parse_args()
+
+    watches = load(args.path)
+    if args.cmd == "add":
+        route = args.route.upper()
+        if route.count("-") != 1:
+            sys.exit(f"Route should be ORIGIN-DEST, got {args.route}")
+        watches.append(Watch(args.email.lower(), route, args.start, args.end, args.max_price))
+        save(watches, args.path)
+        print(f"{args.email} watches {route}")
+    elif args.cmd == "remove":
+        kept = [w for w in watches if (w.email, w.route) != (args.email.lower(), args.route.upper())]
+        if len(kept) == len(watches):
+            sys.exit(f"{args.email} doesn't watch {args.route}")
+        save(kept, args.path)
+        print(f"Removed {len(watches) - len(kept)} watch(es)")
+    else:
+        index = build_index(watches, route_index.load_metros())
+        covers: dict[Watch, int] = {}
+        for ws in index.values():
+            for w in ws:
+                covers[w] = covers.get(w, 0) + 1
+        for w in watches:
+            dates = f"{w.start or '…'} to {w.end or '…'}" if w.start or w.end else "any date"
+            price = f"≤ ${w.max_price:,}" if w.max_price is not None else "any price"
+            print(f"{w.email:<30} {w.route:<10} {dates:<26} {price:<12} ({covers.get(w, 0)} airport routes)")
+        print(f"{len({w.email for w in watches})} subscriber(s), {len(watches)} watch(es), "
+              f"{len(index)} airport routes watched")
+
+
+if __name__ == "__main__":
+    main()